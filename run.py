@@ -11,20 +11,43 @@ project_root = os.path.dirname(os.path.abspath(__file__))
 src_path = os.path.join(project_root, 'src')
 sys.path.insert(0, src_path)
 
+# Prefer uvloop + httptools (uvicorn[standard]); fall back where unavailable (e.g. Windows)
+from src.utils.runtime import LOOP, HTTP
+
+# Worker processes. Only one is supported: jobs, pending approvals and live-update
+# subscribers are held in process memory, and every worker would manage the same
+# Puppeteer/CDP ports
+WORKERS = max(1, int(os.getenv("WORKERS", "1")))
+
 # Import and run server
 if __name__ == "__main__":
-    from server.live_browser_server import app
     import uvicorn
     
+    if WORKERS > 1:
+        sys.exit(
+            f"❌ WORKERS={WORKERS} is not supported - run a single worker.\n"
+            "   Jobs, approvals and event streams live in one process's memory: an approval or\n"
+            "   stream routed to another worker would 404 or never see updates, and every\n"
+            "   worker would start its Puppeteer server on the same ports (3000/9222)."
+        )
+    
     print("🚀 Starting Live Browser Agent Server...")
     print("📱 Dashboard: http://localhost:8002/dashboard")
     print("🔧 Health Check: http://localhost:8002/health")
+    print(f"⚡ Event loop: {LOOP}, HTTP parser: {HTTP}")
     print()
     
+    from server.live_browser_server import app
+    
     uvicorn.run(
         app,
         host="127.0.0.1",
         port=8002,
         reload=False,
-        log_level="info"
-    )
\ No newline at end of file
+        loop=LOOP,
+        http=HTTP,
+        ws="websockets",
+        access_log=False,  # Screenshot polling would otherwise flood the logger
+        ws_per_message_deflate=False,  # broadcasts send the same frame to every client - skip per-client deflate
+        log_level="warning"
+    )
@@ -4,45 +4,250 @@ Puppeteer browser agent that uses browser-use with Chrome DevTools Protocol (CDP
 """
 
 import asyncio
+import logging
 import os
-import base64
-import json
-from datetime import datetime
+import time
+import zlib
+from contextlib import AsyncExitStack
 from typing import Dict, Any, Optional, Callable, List
 from browser_use import Agent, Browser
 from browser_use.browser.browser import BrowserConfig
 from browser_use.llm import ChatGoogle
 from dotenv import load_dotenv
-import aiohttp
-from ..utils.puppeteer_server_manager import PuppeteerServerManager
+from ..utils.http_session import get_session, close_session
+from ..utils.browser_pool import get_browser_pool
+from ..utils.encoding import OFFLOAD_ENCODE_BYTES, b64decode, b64encode_ascii
+from ..utils.progress import ProgressReporter
+from ..utils.timestamps import iso_now
 
-# Load environment variables
-load_dotenv()
+# Load environment variables (resolved once at import; .env is skipped when already set)
+if not os.environ.get("GOOGLE_API_KEY"):
+    load_dotenv()
+DEFAULT_API_KEY = os.environ.get("GOOGLE_API_KEY", "")
+DEFAULT_CDP_URL = "http://localhost:9222"
 
+logger = logging.getLogger(__name__)
 
-class PuppeteerBrowserAgent:
+# Elements that indicate a fillable form has rendered
+FORM_READY_SELECTOR = "form, input, textarea"
+
+# Name of the page binding the DOM watcher below calls
+PAGE_MUTATED_BINDING = "__pageMutated"
+
+# Reports in-page DOM changes (field fills, validation messages, re-renders) that
+# fire no navigation/load event - at most one call per 250ms burst
+DOM_WATCH_SCRIPT = """
+(() => {
+    if (window.__pageMutationWatch) return;
+    let pending = false;
+    const notify = () => {
+        if (pending) return;
+        pending = true;
+        setTimeout(() => {
+            pending = false;
+            if (window.%(binding)s) window.%(binding)s();
+        }, 250);
+    };
+    window.__pageMutationWatch = new MutationObserver(notify);
+    const start = () => window.__pageMutationWatch.observe(document.documentElement, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+    if (document.documentElement) start();
+    else document.addEventListener('DOMContentLoaded', start);
+    // Typing changes input values, which no mutation record reports
+    document.addEventListener('input', notify, true);
+})();
+""" % {"binding": PAGE_MUTATED_BINDING}
+
+
+def viewport_clip(layout_metrics: Dict[str, Any], scale: float) -> Dict[str, float]:
+    """Page.captureScreenshot clip of what is currently visible, from Page.getLayoutMetrics
+    
+    Clips are in document coordinates, so the visual viewport's scroll offset is
+    part of it - a clip at (0, 0) would show the top of a scrolled page instead.
+    """
+    visual = layout_metrics["cssVisualViewport"]
+    return {
+        "x": visual["pageX"],
+        "y": visual["pageY"],
+        "width": visual["clientWidth"],
+        "height": visual["clientHeight"],
+        "scale": scale
+    }
+
+
+# Contact info keys and the form field labels they are described with in the task
+CONTACT_FIELD_LABELS = (
+    ("name", "Name/Full Name"),
+    ("email", "Email"),
+    ("phone", "Phone"),
+    ("company", "Company/Organization"),
+    ("job_title", "Job Title/Role"),
+)
+
+# Form filling task for the AI agent (filled in with str.format)
+FORM_FILLING_TASK_TEMPLATE = """
+            You are filling out a {form_type} form on {platform}. Please:
+            
+            1. Look for form fields and fill in the following information:
+{contact_fields}
+               - Subject/Title: {subject}
+               - Message/Description: {description}
+               - Priority/Urgency: {priority}
+            
+            2. If there are reference URL fields, add: {reference_urls}
+            3. If there's an additional comments field, add: {additional_comments}
+{file_upload_step}            4. DO NOT submit the form yet - just fill it out completely
+            5. Take a screenshot when all fields are filled
+            
+            Focus on filling all available fields accurately. Stop before clicking submit.
+            """
+
+
+# Extra step for the form filling task when files must be attached
+FILE_UPLOAD_STEP_TEMPLATE = """            3b. Look for file upload fields and upload the following files,
+                using the file upload controller to detect the file input fields:
+{file_list}
+"""
+
+# Final task that submits the filled-in form
+SUBMIT_TASK = """
+            Now submit the form by clicking the submit, send, or save button.
+            Look for buttons with text like 'Submit', 'Send', 'Save', 'Post', 'Contact Us', etc.
+            After clicking, wait for any confirmation and take a final screenshot.
+            """
+
+# Gemini model used for form filling (Flash: lower latency and higher rate limits than Pro;
+# set GEMINI_MODEL=gemini-1.5-pro or pass model= to opt into Pro)
+DEFAULT_LLM_MODEL = os.environ.get("GEMINI_MODEL", "gemini-1.5-flash")
+
+# LLM clients keyed by (api_key, model), reused by every agent in the process
+_LLM_CLIENTS: Dict[tuple, ChatGoogle] = {}
+
+
+# Agent runs allowed to talk to Gemini at once (process-wide), and retries on 429s
+LLM_CONCURRENCY = max(1, int(os.environ.get("LLM_CONCURRENCY", "2")))
+LLM_MAX_RETRIES = 3
+_LLM_SLOTS = asyncio.Semaphore(LLM_CONCURRENCY)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Check whether an LLM error is a quota/rate-limit rejection"""
+    text = f"{type(error).__name__} {error}"
+    return "429" in text or "ResourceExhausted" in text or "RESOURCE_EXHAUSTED" in text
+
+
+def get_llm(api_key: str, model: str = DEFAULT_LLM_MODEL) -> ChatGoogle:
+    """Get a shared Gemini client, creating it on first use"""
+    llm = _LLM_CLIENTS.get((api_key, model))
+    if llm is None:
+        llm = _LLM_CLIENTS[(api_key, model)] = ChatGoogle(
+            api_key=api_key,
+            model=model,
+            temperature=0.1
+        )
+    return llm
+
+
+# Chromium flags for screenshot-heavy sessions: keep the renderer and its timers
+# running at full speed while in the background and cap the V8 heap
+SCREENSHOT_CHROMIUM_ARGS = (
+    '--disable-gpu-vsync',
+    '--disable-background-timer-throttling',
+    '--disable-renderer-backgrounding',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-background-networking',
+    '--disable-features=TranslateUI',
+    '--disable-sync',
+    '--disable-extensions',
+    '--mute-audio',
+    '--no-first-run',
+    '--hide-scrollbars',
+    '--js-flags=--max-old-space-size=512',
+)
+
+# Collect page garbage every this many monitoring captures
+GC_EVERY_CAPTURES = 50
+
+
+def create_launch_browser(headless: bool = False, debugging_port: int = 9222) -> Browser:
+    """Create a browser that launches its own Chrome with CDP enabled"""
+    return Browser(config=BrowserConfig(
+        headless=headless,
+        chrome_instance_path=None,
+        disable_security=True,
+        extra_chromium_args=[
+            f'--remote-debugging-port={debugging_port}',
+            '--disable-blink-features=AutomationControlled',
+            '--disable-dev-shm-usage',
+            '--no-sandbox',
+            *SCREENSHOT_CHROMIUM_ARGS
+        ]
+    ))
+
+
+class PuppeteerBrowserAgent(ProgressReporter):
     """Browser agent using browser-use with CDP connection"""
     
-    def __init__(self, headless: bool = False, cdp_url: str = None, api_key: str = None, 
-                 manage_server: bool = True, server_path: str = None):
+    # Fixed attribute set - no per-instance __dict__
+    __slots__ = (
+        "headless", "cdp_url", "api_key", "model",
+        "browser", "_pool_checkout", "agent",
+        "approval_callback", "screenshot_callback",
+        "last_screenshot", "_last_screenshot_hash",
+        "_capture_lock", "_last_capture_time", "screenshot_cache_ttl",
+        "continuous_monitoring", "monitoring_task",
+        "screenshot_interval", "screenshot_safety_interval",
+        "_page_changed", "_monitored_page", "_cdp_session", "_cdp_page",
+        "screenshot_flush_window", "_pending_screenshot", "_screenshot_flusher",
+        "manage_server", "server_manager", "_server_lease",
+        "_llm", "_init_lock", "_initialized",
+        "monitor_scale", "_screencasting",
+    )
+    
+    def __init__(self, headless: bool = False, cdp_url: Optional[str] = None, api_key: Optional[str] = None,
+                 manage_server: bool = True, server_path: Optional[str] = None,
+                 model: Optional[str] = None):
         self.headless = headless
-        self.cdp_url = cdp_url or "http://localhost:9222"
-        self.api_key = api_key or os.getenv("GOOGLE_API_KEY", "")
+        self.cdp_url = cdp_url or DEFAULT_CDP_URL
+        self.api_key = api_key or DEFAULT_API_KEY
+        self.model = model or DEFAULT_LLM_MODEL
         self.browser = None
+        self._pool_checkout: Optional[AsyncExitStack] = None  # open pool.browser() while pooled
         self.agent = None
-        self.progress_callback = None
+        self._init_progress()
         self.approval_callback = None
         self.screenshot_callback = None
-        self.last_screenshot = None
+        self.last_screenshot = None  # raw image bytes
+        self._last_screenshot_hash = None
+        self._capture_lock = asyncio.Lock()  # one capture of the page at a time
+        self._last_capture_time = 0.0  # monotonic time of the last completed viewport capture
+        self.screenshot_cache_ttl = 0.25  # seconds a capture is reused by overlapping requests
         self.continuous_monitoring = False
         self.monitoring_task = None
-        self.screenshot_interval = 2  # seconds
+        self.screenshot_interval = 2  # seconds (minimum spacing between captures)
+        self.screenshot_safety_interval = 10  # seconds (refresh when no page events arrive)
+        self._page_changed = asyncio.Event()
+        self._monitored_page = None
+        self._cdp_session = None
+        self._cdp_page = None
+        self.screenshot_flush_window = 0.05  # seconds
+        self.monitor_scale = 0.5  # viewport captures are rendered at this scale (full-page stays native)
+        self._screencasting = False
+        self._pending_screenshot = None
+        self._screenshot_flusher = None
         self.manage_server = manage_server
         self.server_manager = None
+        self._server_lease = None
+        self._llm = None
+        self._init_lock = asyncio.Lock()
+        self._initialized = False
         
-        # Initialize server manager if needed
+        # Initialize server manager only if needed - shared, so every agent leases the
+        # same server and browser instead of starting (and stopping) one per job
         if self.manage_server:
-            self.server_manager = PuppeteerServerManager(
+            from ..utils.puppeteer_server_manager import get_server_manager
+            self.server_manager = get_server_manager(
                 server_path=server_path,
                 server_port=3000,
                 cdp_port=9222
@@ -54,52 +259,50 @@ class PuppeteerBrowserAgent:
             await self.send_progress("Initializing browser-use with CDP", 5)
             
             # Start Puppeteer server if managed
+            managed_ws = None
             if self.manage_server and self.server_manager:
                 await self.send_progress("Starting managed Puppeteer server", 3)
-                start_result = await self.server_manager.start_server(headless=self.headless)
+                start_result = await self.server_manager.acquire(headless=self.headless)
                 
                 if not start_result['success']:
                     await self.send_progress(f"Failed to start Puppeteer server: {start_result.get('error')}", 0)
                     return False
                 
+                self._server_lease = start_result['lease']
                 await self.send_progress("Puppeteer server started successfully", 7)
                 
                 # Update CDP URL if provided by server
                 if start_result.get('cdp_url'):
                     self.cdp_url = start_result['cdp_url']
+                managed_ws = start_result.get('ws_endpoint')
             
-            # Check if CDP endpoint is available
+            # Check if CDP endpoint is available - probe the Puppeteer server and
+            # standard CDP concurrently, preferring the Puppeteer server
             cdp_available = False
             existing_browser_url = None
             puppeteer_server = False
             
-            try:
-                async with aiohttp.ClientSession() as session:
-                    # First check if it's a Puppeteer server
-                    try:
-                        server_url = self.cdp_url.replace(':9222', ':3000')
-                        async with session.get(f"{server_url}/status") as resp:
-                            if resp.status == 200:
-                                status = await resp.json()
-                                if status.get('status') == 'running':
-                                    existing_browser_url = status.get('wsEndpoint')
-                                    cdp_available = True
-                                    puppeteer_server = True
-                                    await self.send_progress("Connected to Puppeteer server", 8)
-                    except:
-                        pass
-                    
-                    # If not Puppeteer server, check standard CDP
-                    if not puppeteer_server:
-                        async with session.get(f"{self.cdp_url}/json/version") as resp:
-                            if resp.status == 200:
-                                browser_info = await resp.json()
-                                ws_endpoint = browser_info.get('webSocketDebuggerUrl')
-                                if ws_endpoint:
-                                    existing_browser_url = ws_endpoint
-                                    cdp_available = True
-                                    await self.send_progress("Found existing Chrome instance via CDP", 8)
-            except:
+            if managed_ws:
+                # The managed server already reported its browser - nothing to discover
+                puppeteer_ws, cdp_ws = managed_ws, None
+            else:
+                session = await get_session()
+                puppeteer_ws, cdp_ws = await asyncio.gather(
+                    self._probe_puppeteer_server(session),
+                    self._probe_cdp(session),
+                    return_exceptions=True
+                )
+            
+            if isinstance(puppeteer_ws, str):
+                existing_browser_url = puppeteer_ws
+                cdp_available = True
+                puppeteer_server = True
+                await self.send_progress("Connected to Puppeteer server", 8)
+            elif isinstance(cdp_ws, str):
+                existing_browser_url = cdp_ws
+                cdp_available = True
+                await self.send_progress("Found existing Chrome instance via CDP", 8)
+            else:
                 await self.send_progress("No existing Chrome instance found, will launch new one", 8)
             
             # Configure browser
@@ -112,38 +315,29 @@ class PuppeteerBrowserAgent:
                     extra_chromium_args=[]
                 )
                 await self.send_progress(f"Using existing browser via {'Puppeteer server' if puppeteer_server else 'CDP'}", 10)
+                self.browser = Browser(config=browser_config)
             else:
-                # Launch new browser with CDP enabled
-                browser_config = BrowserConfig(
-                    headless=self.headless,
-                    chrome_instance_path=None,
-                    disable_security=True,
-                    extra_chromium_args=[
-                        '--remote-debugging-port=9222',
-                        '--disable-blink-features=AutomationControlled',
-                        '--disable-dev-shm-usage',
-                        '--no-sandbox'
-                    ]
-                )
-            
-            # Create browser instance
-            self.browser = Browser(config=browser_config)
-            
-            # Configure LLM
-            llm_config = None
-            if self.api_key:
-                llm_config = ChatGoogle(
-                    api_key=self.api_key,
-                    model="gemini-1.5-flash",
-                    temperature=0.1
-                )
+                browser_pool = get_browser_pool()
+                if browser_pool and browser_pool.headless == self.headless:
+                    # Take a pre-launched browser from the pool, held until cleanup
+                    self._pool_checkout = AsyncExitStack()
+                    self.browser = await self._pool_checkout.enter_async_context(browser_pool.browser())
+                    await self.send_progress("Using pre-launched browser from pool", 10)
+                else:
+                    # Launch new browser with CDP enabled
+                    self.browser = create_launch_browser(self.headless)
+            
+            # Configure LLM (shared across agent instances using the same key)
+            if self._llm is None and self.api_key:
+                self._llm = get_llm(self.api_key, self.model)
             
             # Initialize agent with browser
             self.agent = Agent(
                 task="",  # Will be set per task
-                llm=llm_config,
+                llm=self._llm,
                 browser=self.browser,
-                save_conversation_path=None
+                save_conversation_path=None,
+                register_new_step_callback=self._on_agent_step
             )
             
             await self.send_progress("Browser-use with CDP initialized successfully", 15)
@@ -153,55 +347,170 @@ class PuppeteerBrowserAgent:
             await self.send_progress(f"Failed to initialize browser-use with CDP: {str(e)}", 0)
             return False
     
-    async def send_progress(self, message: str, percentage: int):
-        """Send progress update"""
-        if self.progress_callback:
-            await self.progress_callback({
-                "message": message,
-                "progress_percentage": percentage,
-                "timestamp": datetime.now().isoformat()
-            })
-        else:
-            print(f"[{percentage}%] {message}")
+    async def _probe_puppeteer_server(self, session, timeout: float = 2) -> Optional[str]:
+        """Return the browser WebSocket endpoint if a Puppeteer server is running"""
+        server_url = self.cdp_url.replace(':9222', ':3000')
+        async with asyncio.timeout(timeout):
+            async with session.get(f"{server_url}/status") as resp:
+                if resp.status == 200:
+                    status = await resp.json()
+                    if status.get('status') == 'running':
+                        return status.get('wsEndpoint')
+        return None
+    
+    async def _probe_cdp(self, session, timeout: float = 2) -> Optional[str]:
+        """Return the browser WebSocket endpoint if a standard CDP endpoint is available"""
+        async with asyncio.timeout(timeout):
+            async with session.get(f"{self.cdp_url}/json/version") as resp:
+                if resp.status == 200:
+                    browser_info = await resp.json()
+                    return browser_info.get('webSocketDebuggerUrl')
+        return None
     
-    async def take_screenshot(self):
-        """Take browser screenshot and send to callback"""
+    async def _on_agent_step(self, browser_state, model_output, step_number: int):
+        """Report each agent step as soon as the LLM has planned it"""
+        current_state = getattr(model_output, "current_state", None)
+        goal = getattr(current_state, "next_goal", None) or "working on the form"
+        self._page_changed.set()  # the agent is acting on the page
+        await self.send_progress(f"Agent step {step_number}: {goal}", self._progress_percentage)
+    
+    async def take_screenshot(self, full_page: bool = False, max_age: Optional[float] = None):
+        """Take browser screenshot and send to callback (returns raw image bytes)
+        
+        Regular captures are viewport JPEGs; full_page=True takes a full-page PNG
+        (used for the final form state). Captures are single-flight, and a viewport
+        capture newer than max_age (default screenshot_cache_ttl) seconds is reused
+        instead of taking another; max_age=0 always captures afresh.
+        """
         if self.browser:
+            if max_age is None:
+                max_age = self.screenshot_cache_ttl
+            async with self._capture_lock:
+                if (not full_page and self.last_screenshot is not None
+                        and time.monotonic() - self._last_capture_time < max_age):
+                    return self.last_screenshot
+                try:
+                    # Get current page from browser-use
+                    current_page = await self.browser.get_current_page()
+                    if current_page:
+                        if full_page:
+                            screenshot_bytes = await current_page.screenshot(full_page=True)
+                            image_format = "png"
+                        else:
+                            screenshot_bytes = await self._capture_viewport(current_page)
+                            image_format = "jpeg"
+                            self._last_capture_time = time.monotonic()
+                        
+                        # Skip identical consecutive frames (agent thinking, idle page)
+                        screenshot_hash = zlib.crc32(screenshot_bytes)
+                        if screenshot_hash == self._last_screenshot_hash and self.last_screenshot is not None:
+                            return self.last_screenshot
+                        self._last_screenshot_hash = screenshot_hash
+                        self.last_screenshot = screenshot_bytes
+                        
+                        # Send via callback if available
+                        if self.screenshot_callback:
+                            self._queue_screenshot(screenshot_bytes, image_format)
+                        
+                        return screenshot_bytes
+                except Exception as e:
+                    logger.warning("Screenshot error: %s", e)
+                    return None
+        return None
+    
+    async def _ensure_cdp_session(self, page):
+        """Get the CDP session for a page, opening it once per page
+        
+        Calling Page.captureScreenshot on a reused session skips the per-shot
+        target activation / layout metrics / device metrics round-trips that a
+        generic page.screenshot() performs ("burst mode").
+        """
+        if self._cdp_page is not page:
+            self._cdp_session = await page.context.new_cdp_session(page)
+            self._cdp_page = page
+        return self._cdp_session
+    
+    async def _capture_viewport(self, page) -> bytes:
+        """Capture the viewport as JPEG via CDP with optimizeForSpeed, falling back to Playwright"""
+        try:
+            cdp_session = await self._ensure_cdp_session(page)
+            params = {
+                "format": "jpeg",
+                "quality": 60,
+                "optimizeForSpeed": True
+            }
+            # Let the renderer produce a downscaled frame instead of shipping native-DPR pixels
+            if self.monitor_scale < 1:
+                metrics = await cdp_session.send("Page.getLayoutMetrics")
+                params["clip"] = viewport_clip(metrics, self.monitor_scale)
+            result = await cdp_session.send("Page.captureScreenshot", params)
+            return b64decode(result["data"])
+        except Exception as e:
+            logger.debug("CDP screenshot unavailable, using page.screenshot: %s", e)
+            self._cdp_session = None
+            self._cdp_page = None
+            return await page.screenshot(full_page=False, type="jpeg", quality=60)
+    
+    def _queue_screenshot(self, screenshot_bytes: bytes, image_format: str = "jpeg",
+                          screenshot_b64: Optional[str] = None):
+        """Coalesce screenshot deliveries - only the newest frame of each window is sent"""
+        self._pending_screenshot = (screenshot_bytes, iso_now(), image_format, screenshot_b64)
+        if self._screenshot_flusher is None or self._screenshot_flusher.done():
+            self._screenshot_flusher = asyncio.create_task(self._flush_screenshot())
+    
+    async def _flush_screenshot(self):
+        """Deliver the pending screenshot once the coalescing window closes"""
+        await asyncio.sleep(self.screenshot_flush_window)
+        pending, self._pending_screenshot = self._pending_screenshot, None
+        if pending and self.screenshot_callback:
+            screenshot_bytes, timestamp, image_format, screenshot_b64 = pending
             try:
-                # Get current page from browser-use
-                current_page = await self.browser.get_current_page()
-                if current_page:
-                    # Take screenshot
-                    screenshot_bytes = await current_page.screenshot(full_page=True)
-                    
-                    # Convert to base64
-                    screenshot_b64 = base64.b64encode(screenshot_bytes).decode('utf-8')
-                    self.last_screenshot = screenshot_b64
-                    
-                    # Send via callback if available
-                    if self.screenshot_callback:
-                        await self.screenshot_callback({
-                            "screenshot": screenshot_b64,
-                            "timestamp": datetime.now().isoformat(),
-                            "format": "png"
-                        })
-                    
-                    return screenshot_b64
+                # base64 only for frames that are actually delivered; large frames
+                # (full-page PNGs) are encoded in a worker thread to keep the loop free
+                if screenshot_b64 is not None:
+                    pass  # screencast frames arrive base64-encoded already
+                elif len(screenshot_bytes) >= OFFLOAD_ENCODE_BYTES:
+                    screenshot_b64 = await asyncio.to_thread(b64encode_ascii, screenshot_bytes)
+                else:
+                    screenshot_b64 = b64encode_ascii(screenshot_bytes)
+                await self.screenshot_callback({
+                    "screenshot": screenshot_b64,
+                    "raw_bytes": screenshot_bytes,  # for transports that can send binary frames
+                    "timestamp": timestamp,
+                    "format": image_format
+                })
             except Exception as e:
-                print(f"Screenshot error: {e}")
-                return None
-        return None
+                logger.warning("Screenshot callback error: %s", e)
+    
+    async def _wait_for_page_ready(self):
+        """Wait for the current page to finish loading instead of sleeping a fixed time"""
+        try:
+            current_page = await self.browser.get_current_page()
+            await current_page.wait_for_load_state("domcontentloaded", timeout=5000)
+        except Exception as e:
+            logger.debug("Page load wait error: %s", e)
+            return
+        try:
+            await current_page.wait_for_selector(FORM_READY_SELECTOR, timeout=5000)
+        except Exception:
+            pass  # No form controls yet - the agent will look for them itself
+        try:
+            await current_page.wait_for_load_state("networkidle", timeout=3000)
+        except Exception:
+            pass  # Pages with long polling/analytics may never go idle
     
     async def request_approval(self, form_data: Dict[str, Any]) -> bool:
         """Request human approval before submission"""
+        # Make sure the reviewer sees all progress leading up to the approval request
+        await self.flush_progress()
         if self.approval_callback:
             return await self.approval_callback(form_data)
         else:
-            print(f"\n🔔 APPROVAL REQUIRED")
-            print(f"Form data to be submitted:")
+            logger.info("🔔 APPROVAL REQUIRED")
+            logger.info("Form data to be submitted:")
             for key, value in form_data.items():
-                print(f"  {key}: {value}")
-            print("Auto-approving in 3 seconds...")
+                logger.info("  %s: %s", key, value)
+            logger.info("Auto-approving in 3 seconds...")
             await asyncio.sleep(3)
             return True
     
@@ -222,14 +531,14 @@ class PuppeteerBrowserAgent:
         try:
             await self.send_progress("Starting browser-use automation with CDP", 10)
             
-            if not await self.initialize():
+            if not await self._ensure_initialized():
                 return {"success": False, "error": "Failed to initialize browser-use with CDP"}
             
             await self.send_progress("Navigating to target URL", 20)
             
             # Navigate to the target URL
             await self.browser.navigate(target_url)
-            await asyncio.sleep(3)
+            await self._wait_for_page_ready()
             
             # Take initial screenshot
             await self.take_screenshot()
@@ -237,86 +546,56 @@ class PuppeteerBrowserAgent:
             await self.send_progress("Analyzing page structure", 30)
             
             # Build form filling task
-            contact_fields = []
-            if contact_info.get('name'):
-                contact_fields.append(f"   - Name/Full Name: {contact_info['name']}")
-            if contact_info.get('email'):
-                contact_fields.append(f"   - Email: {contact_info['email']}")
-            if contact_info.get('phone'):
-                contact_fields.append(f"   - Phone: {contact_info['phone']}")
-            if contact_info.get('company'):
-                contact_fields.append(f"   - Company/Organization: {contact_info['company']}")
-            if contact_info.get('job_title'):
-                contact_fields.append(f"   - Job Title/Role: {contact_info['job_title']}")
-            
-            task_description = f"""
-            You are filling out a {form_type} form on {platform}. Please:
-            
-            1. Look for form fields and fill in the following information:
-{chr(10).join(contact_fields)}
-               - Subject/Title: {subject}
-               - Message/Description: {description}
-               - Priority/Urgency: {priority}
-            
-            2. If there are reference URL fields, add: {', '.join(reference_urls or [])}
-            3. If there's an additional comments field, add: {additional_comments}
-            4. DO NOT submit the form yet - just fill it out completely
-            5. Take a screenshot when all fields are filled
-            
-            Focus on filling all available fields accurately. Stop before clicking submit.
-            """
-            
-            self.agent.task = task_description
-            
-            await self.send_progress("AI agent filling form fields", 40)
-            
-            # Let the agent work on filling the form
-            try:
-                result = await asyncio.wait_for(self.agent.run(max_steps=12), timeout=90)
-                await self.send_progress("Form fields filled successfully", 60)
-            except asyncio.TimeoutError:
-                await self.send_progress("Form filling timed out, proceeding with available data", 60)
-                result = "Form filling timed out but proceeding"
-            except Exception as e:
-                await self.send_progress(f"Form filling error: {str(e)}", 60)
-                result = f"Form filling error: {str(e)}"
-            
-            # Take screenshot after form filling
-            await self.take_screenshot()
-            
-            # Handle file uploads if any
+            contact_fields = [
+                f"   - {label}: {value}"
+                for key, label in CONTACT_FIELD_LABELS
+                if (value := contact_info.get(key))
+            ]
+            
+            # File uploads are part of the same agent run, so the page is analyzed once
+            file_upload_step = ""
+            max_steps, run_timeout = 12, 90
             if uploaded_files:
-                await self.send_progress(f"Processing {len(uploaded_files)} file(s) for upload", 65)
+                await self.send_progress(f"Including {len(uploaded_files)} file(s) for upload", 35)
                 
                 # Import controllers
                 from ..controllers import file_upload_controller
                 
-                # Create task for file upload
                 file_paths = [f.get('path', '') for f in uploaded_files if f.get('path')]
                 file_names = [f.get('name', '') for f in uploaded_files if f.get('name')]
                 
-                file_upload_task = f"""
-                Look for file upload fields on this form and upload the following files:
-                {chr(10).join([f"   - {name}" for name in file_names])}
-                
-                Use the file upload controller to detect file input fields and upload the files.
-                Report what files were uploaded and to which fields.
-                """
-                
-                self.agent.task = file_upload_task
+                file_upload_step = FILE_UPLOAD_STEP_TEMPLATE.format(
+                    file_list="\n".join(f"                   - {name}" for name in file_names)
+                )
                 
                 # Integrate controller with agent
                 self.agent._file_upload_controller = file_upload_controller
                 self.agent._file_paths = file_paths
                 
-                try:
-                    upload_result = await asyncio.wait_for(self.agent.run(max_steps=5), timeout=30)
-                    await self.send_progress("File upload completed", 75)
-                except Exception as e:
-                    await self.send_progress(f"File upload error: {str(e)}", 75)
-                    upload_result = f"File upload error: {str(e)}"
-                
-                await self.take_screenshot()
+                max_steps, run_timeout = max_steps + 5, run_timeout + 30
+            
+            task_description = FORM_FILLING_TASK_TEMPLATE.format(
+                form_type=form_type,
+                platform=platform,
+                contact_fields="\n".join(contact_fields),
+                subject=subject,
+                description=description,
+                priority=priority,
+                reference_urls=', '.join(reference_urls or []),
+                additional_comments=additional_comments,
+                file_upload_step=file_upload_step
+            )
+            
+            await self.send_progress("AI agent filling form fields", 40)
+            
+            # Let the agent work on filling the form (and attaching files)
+            result = await self._run_step(
+                task_description, max_steps, run_timeout, "Form filling", 60,
+                success_message="File upload completed" if uploaded_files else "Form fields filled successfully"
+            )
+            
+            # Take screenshot after form filling
+            await self.take_screenshot()
             
             await self.send_progress("Form filling completed", 85)
             
@@ -335,7 +614,7 @@ class PuppeteerBrowserAgent:
                 "contact_email": contact_info.get('email', ''),
                 "contact_phone": contact_info.get('phone', ''),
                 "contact_company": contact_info.get('company', ''),
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": iso_now(),
                 "browser_type": "Browser-Use with CDP"
             }
             
@@ -365,34 +644,19 @@ class PuppeteerBrowserAgent:
                 await self.send_progress("No approval required, submitting", 95)
             
             # Submit the form
-            submit_task = """
-            Now submit the form by clicking the submit, send, or save button.
-            Look for buttons with text like 'Submit', 'Send', 'Save', 'Post', 'Contact Us', etc.
-            After clicking, wait for any confirmation and take a final screenshot.
-            """
-            
-            self.agent.task = submit_task
-            
-            try:
-                submit_result = await asyncio.wait_for(self.agent.run(max_steps=5), timeout=30)
-            except asyncio.TimeoutError:
-                await self.send_progress("Form submission timed out", 100)
-                submit_result = "Form submission timed out"
-            except Exception as e:
-                await self.send_progress(f"Form submission error: {str(e)}", 100)
-                submit_result = f"Form submission error: {str(e)}"
+            submit_result = await self._run_step(SUBMIT_TASK, 5, 30, "Form submission", 100)
             
             await self.send_progress("Form submitted successfully", 100)
             
-            # Take final screenshot
-            await self.take_screenshot()
+            # Take final screenshot (full page, so the whole submitted form is on record)
+            await self.take_screenshot(full_page=True)
             
             return {
                 "success": True,
                 "message": f"{form_type.title()} form submitted successfully via Browser-Use with CDP",
                 "form_data": form_preview,
-                "agent_result": str(result),
-                "submit_result": str(submit_result),
+                "agent_result": result,
+                "submit_result": submit_result,
                 "browser_type": "Browser-Use with CDP",
                 "screenshots": []  # Would contain actual screenshots if needed
             }
@@ -403,8 +667,55 @@ class PuppeteerBrowserAgent:
             return {"success": False, "error": error_msg}
             
         finally:
-            if self.browser:
-                await self.cleanup()
+            # Browser and agent stay up for the next call - see close()
+            await self.stop_continuous_monitoring()
+            if self._screenshot_flusher:
+                await self._screenshot_flusher
+            await self._stop_progress_drain()
+    
+    async def _run_step(self, task_text: str, max_steps: int, timeout: float, stage: str,
+                        percentage: int, success_message: Optional[str] = None) -> str:
+        """Run one agent task, reporting timeouts/errors as progress instead of raising"""
+        self.agent.task = task_text
+        started = time.monotonic()
+        try:
+            result = str(await self._run_agent(max_steps, timeout))
+            message = success_message
+        except TimeoutError:
+            result = message = f"{stage} timed out"
+        except Exception as e:
+            result = message = f"{stage} error: {str(e)}"
+        logger.debug("%s took %.1fs", stage, time.monotonic() - started)
+        if message:
+            await self.send_progress(message, percentage)
+        return result
+    
+    async def _run_agent(self, max_steps: int, timeout: float):
+        """Run the agent within the process-wide LLM concurrency limit, backing off on 429s"""
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            try:
+                async with _LLM_SLOTS:
+                    async with asyncio.timeout(timeout):
+                        return await self.agent.run(max_steps=max_steps)
+            except Exception as e:
+                if attempt == LLM_MAX_RETRIES or not is_rate_limit_error(e):
+                    raise
+                delay = 2 ** (attempt + 1)
+                await self.send_progress(f"LLM rate limited, retrying in {delay}s", self._progress_percentage)
+                await asyncio.sleep(delay)
+    
+    async def _ensure_initialized(self) -> bool:
+        """Initialize browser and agent once; later calls reuse them"""
+        async with self._init_lock:
+            if not self._initialized:
+                self._initialized = await self.initialize()
+            return self._initialized
+    
+    async def close(self):
+        """Release the browser, agent and managed server (call when done with the agent)"""
+        if self.browser or self._initialized:
+            await self.cleanup()
+        await self._stop_progress_drain()
     
     def set_progress_callback(self, callback: Callable):
         """Set callback for progress updates"""
@@ -424,31 +735,164 @@ class PuppeteerBrowserAgent:
             return
         
         self.continuous_monitoring = True
+        await self._watch_page_changes()
+        # Prefer frames pushed by Chromium when the page repaints; poll only as a fallback
+        if await self._start_screencast():
+            logger.info("🔄 Started continuous monitoring (CDP screencast)")
+            return
         self.monitoring_task = asyncio.create_task(self._continuous_screenshot_loop())
-        print(f"🔄 Started continuous monitoring (every {self.screenshot_interval}s)")
+        logger.info("🔄 Started continuous monitoring (on page change, at most every %ss)", self.screenshot_interval)
     
     async def stop_continuous_monitoring(self):
         """Stop continuous screenshot monitoring"""
         self.continuous_monitoring = False
-        if self.monitoring_task:
-            self.monitoring_task.cancel()
+        await self._stop_screencast()
+        self._unwatch_page_changes()
+        task, self.monitoring_task = self.monitoring_task, None
+        if task:
+            task.cancel()
             try:
-                await self.monitoring_task
+                await task
             except asyncio.CancelledError:
+                # Swallow only the loop's own cancellation - ours must propagate
+                if not task.cancelled() or asyncio.current_task().cancelling():
+                    raise
+        logger.info("⏹️ Stopped continuous monitoring")
+    
+    async def _start_screencast(self) -> bool:
+        """Start a CDP screencast on the monitored page (False if unavailable)"""
+        page = self._monitored_page
+        if page is None:
+            return False
+        try:
+            cdp_session = await self._ensure_cdp_session(page)
+            viewport = page.viewport_size or {"width": 1280, "height": 720}
+            cdp_session.on("Page.screencastFrame", self._on_screencast_frame)
+            await cdp_session.send("Page.startScreencast", {
+                "format": "jpeg",
+                "quality": 60,
+                "maxWidth": int(viewport["width"] * self.monitor_scale),
+                "maxHeight": int(viewport["height"] * self.monitor_scale),
+                "everyNthFrame": 2
+            })
+        except Exception as e:
+            logger.debug("CDP screencast unavailable, polling instead: %s", e)
+            return False
+        self._screencasting = True
+        return True
+    
+    async def _stop_screencast(self):
+        """Stop the CDP screencast started by _start_screencast"""
+        if not self._screencasting:
+            return
+        self._screencasting = False
+        cdp_session = self._cdp_session
+        if cdp_session is None:
+            return
+        try:
+            cdp_session.remove_listener("Page.screencastFrame", self._on_screencast_frame)
+            await cdp_session.send("Page.stopScreencast")
+        except Exception as e:
+            logger.debug("Screencast stop error: %s", e)
+    
+    async def _on_screencast_frame(self, params: Dict[str, Any]):
+        """Forward a pushed screencast frame to the screenshot callback"""
+        cdp_session = self._cdp_session
+        if cdp_session is not None:
+            try:
+                # Chromium sends the next frame only after this one is acknowledged
+                await cdp_session.send("Page.screencastFrameAck", {"sessionId": params["sessionId"]})
+            except Exception as e:
+                logger.debug("Screencast ack error: %s", e)
+        
+        screenshot_b64 = params["data"]
+        screenshot_bytes = b64decode(screenshot_b64)
+        screenshot_hash = zlib.crc32(screenshot_bytes)
+        if screenshot_hash == self._last_screenshot_hash:
+            return
+        self._last_screenshot_hash = screenshot_hash
+        self.last_screenshot = screenshot_bytes
+        if self.screenshot_callback:
+            self._queue_screenshot(screenshot_bytes, "jpeg", screenshot_b64)
+    
+    async def _watch_page_changes(self):
+        """Subscribe to navigation/load events of the current page"""
+        if not self.browser:
+            return
+        try:
+            page = await self.browser.get_current_page()
+            if page:
+                page.on("framenavigated", self._on_page_event)
+                page.on("load", self._on_page_event)
+                self._monitored_page = page
+                await self._watch_dom_changes(page)
+                # Open the CDP session up front so monitoring captures go straight to captureScreenshot
+                await self._ensure_cdp_session(page)
+        except Exception as e:
+            logger.warning("Page event subscription error: %s", e)
+    
+    async def _watch_dom_changes(self, page):
+        """Install the DOM watcher in the page (and every document it loads from now on)"""
+        try:
+            await page.expose_binding(PAGE_MUTATED_BINDING, self._on_page_event)
+        except Exception:
+            pass  # already exposed on this page by an earlier monitoring run
+        try:
+            await page.add_init_script(DOM_WATCH_SCRIPT)
+            await page.evaluate(DOM_WATCH_SCRIPT)
+        except Exception as e:
+            logger.debug("DOM change watcher unavailable: %s", e)
+    
+    def _unwatch_page_changes(self):
+        """Remove page event listeners added by _watch_page_changes"""
+        page, self._monitored_page = self._monitored_page, None
+        if page:
+            try:
+                page.remove_listener("framenavigated", self._on_page_event)
+                page.remove_listener("load", self._on_page_event)
+            except Exception:
                 pass
-        print("⏹️ Stopped continuous monitoring")
+    
+    def _on_page_event(self, *args):
+        self._page_changed.set()
     
     async def _continuous_screenshot_loop(self):
-        """Continuous screenshot monitoring loop"""
+        """Continuous screenshot monitoring loop - captures on page change, with a slow safety refresh"""
+        captures = 0
         try:
             while self.continuous_monitoring:
+                try:
+                    async with asyncio.timeout(self.screenshot_safety_interval):
+                        await self._page_changed.wait()
+                except TimeoutError:
+                    pass
+                self._page_changed.clear()
+                
+                started = time.monotonic()
                 if self.browser:
                     await self.take_screenshot()
-                await asyncio.sleep(self.screenshot_interval)
+                    captures += 1
+                    if captures % GC_EVERY_CAPTURES == 0:
+                        await self._collect_page_garbage()
+                elapsed = time.monotonic() - started
+                
+                # Throttle bursts of page events, backing off when captures get slow
+                # (busy browser/event loop) so they never queue up behind each other
+                delay = max(0.5, self.screenshot_interval, elapsed * 1.5) - elapsed
+                await asyncio.sleep(max(0.0, delay))
         except asyncio.CancelledError:
-            print("📸 Screenshot monitoring loop cancelled")
+            logger.debug("📸 Screenshot monitoring loop cancelled")
         except Exception as e:
-            print(f"❌ Continuous monitoring error: {e}")
+            logger.exception("❌ Continuous monitoring error")
+    
+    async def _collect_page_garbage(self):
+        """Force a V8 GC on the monitored page so long approval sessions don't grow the heap"""
+        if self._cdp_session is None:
+            return
+        try:
+            await self._cdp_session.send("HeapProfiler.collectGarbage")
+        except Exception as e:
+            logger.debug("Page garbage collection failed: %s", e)
     
     def set_screenshot_interval(self, seconds: float):
         """Set screenshot interval for continuous monitoring"""
@@ -461,19 +905,27 @@ class PuppeteerBrowserAgent:
             await self.stop_continuous_monitoring()
             
             if self.browser:
-                await self.browser.close()
+                if self._pool_checkout:
+                    # Hand the browser back to the pool (which closes it for us)
+                    checkout, self._pool_checkout = self._pool_checkout, None
+                    await checkout.aclose()
+                else:
+                    await self.browser.close()
                 self.browser = None
                 self.agent = None
-            
-            # Stop Puppeteer server if managed
-            if self.manage_server and self.server_manager:
-                await self.send_progress("Stopping managed Puppeteer server", 95)
-                stop_result = await self.server_manager.stop_server()
-                if stop_result['success']:
-                    await self.send_progress("Puppeteer server stopped", 98)
+                self._cdp_session = None
+                self._cdp_page = None
+            self._initialized = False
+            
+            # Hand the managed Puppeteer server back - it keeps running for the next job
+            # and is only stopped at application shutdown
+            if self.server_manager and self._server_lease:
+                self.server_manager.release(self._server_lease)
+                self._server_lease = None
+                await self.send_progress("Released managed Puppeteer server", 98)
                 
         except Exception as e:
-            print(f"Error during cleanup: {e}")
+            logger.exception("Error during cleanup")
 
 
 # Test function
@@ -526,9 +978,18 @@ async def test_puppeteer_agent():
         print(f"Agent Result: {result.get('agent_result', 'N/A')[:100]}...")  # First 100 chars
     else:
         print(f"Error: {result.get('error', 'Unknown error')}")
+    
+    await agent.close()
+    await close_session()
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass  # e.g. Windows - stay on the default loop
     print("🎬 Testing Browser-Use Agent with CDP")
     print("=" * 60)
     asyncio.run(test_puppeteer_agent())
\ No newline at end of file
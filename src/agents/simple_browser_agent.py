@@ -5,52 +5,92 @@ without complex AI form analysis
 """
 
 import asyncio
+import functools
 import os
-import base64
-from datetime import datetime
+import time
+import zlib
+from contextlib import asynccontextmanager
 from typing import Dict, Any, Optional, Callable
 from browser_use import Agent, Browser
 from browser_use.browser.browser import BrowserConfig
 from dotenv import load_dotenv
-import json
+# Absolute - the server also imports this module as top-level "simple_browser_agent"
+from src.utils.encoding import OFFLOAD_ENCODE_BYTES, b64decode, b64encode_ascii
+from src.utils.progress import ProgressReporter
+from src.utils.timestamps import iso_now
 
-# Load environment variables
-load_dotenv()
+# Load environment variables (skipped when already provided, e.g. in containers)
+if not os.getenv("GOOGLE_API_KEY"):
+    load_dotenv()
+DEFAULT_API_KEY = os.getenv("GOOGLE_API_KEY", "")
 
+# Chromium flags for browsers launched by this agent
+CHROMIUM_ARGS = (
+    "--disable-blink-features=AutomationControlled",
+    "--disable-dev-shm-usage",
+    "--no-sandbox"
+)
 
-class SimpleBrowserAgent:
+
+@functools.lru_cache(maxsize=2)
+def make_browser_config(headless: bool) -> BrowserConfig:
+    """Browser configuration for the given headless mode (built once per mode)"""
+    return BrowserConfig(
+        headless=headless,
+        chrome_instance_path=None,
+        disable_security=True,
+        extra_chromium_args=list(CHROMIUM_ARGS)
+    )
+
+
+# Field mapping shown in the approval preview (filled in with str.format_map)
+FORM_FIELDS_DETECTED_TEMPLATE = {
+    "name_field": "Full Name",
+    "email_field": "Email Address",
+    "phone_field": "Phone Number (if available)",
+    "company_field": "Company/Organization",
+    "title_field": "Job Title/Role (if available)",
+    "subject_field": "{form_type_title} - {subject}",
+    "message_field": "Main message/inquiry",
+    "reference_field": "Reference URLs (if provided)",
+    "priority_field": "Priority: {priority}",
+    "files_field": "Attached files: {files_count} file(s)"
+}
+
+
+class SimpleBrowserAgent(ProgressReporter):
     """Simplified browser agent that focuses on approval workflow"""
     
     def __init__(self, headless: bool = False, api_key: str = None):
         self.headless = headless
-        self.api_key = api_key or os.getenv("GOOGLE_API_KEY", "")
+        self.api_key = api_key or DEFAULT_API_KEY
         self.browser = None
         self.agent = None
-        self.progress_callback = None
+        self._init_progress(throttle=0.1)
         self.approval_callback = None
-        self.screenshot_callback = None
-        self.last_screenshot = None
+        self.screenshot_callback = None  # receives base64 frames
+        self.screenshot_bytes_callback = None  # receives raw frames (e.g. WebSocket binary sinks)
+        self.last_screenshot = None  # raw image bytes
+        self._last_screenshot_hash = None
+        self._pending_screenshots = set()  # background capture tasks
+        self._screenshot_slots = asyncio.Semaphore(4)  # max in-flight background captures
+        self._capture_lock = asyncio.Lock()  # one capture of the page at a time
+        self._last_capture_time = 0.0  # monotonic time of the last completed capture
+        self.screenshot_cache_ttl = 0.25  # seconds a capture is reused by overlapping requests
         self.continuous_monitoring = False
         self.monitoring_task = None
-        self.screenshot_interval = 2  # seconds
+        self._stop_monitoring = asyncio.Event()  # wakes the polling loop for a prompt exit
+        self.screenshot_interval = 2  # seconds (polling fallback only)
+        self._cdp_session = None  # CDP session carrying the monitoring screencast
+        self._cached_page = None  # current page, refreshed after navigation
+        self._capture_session = None  # CDP session used for single screenshots
+        self._capture_page = None  # page the capture session belongs to
         
     async def initialize(self):
         """Initialize browser"""
         try:
-            # Configure browser
-            browser_config = BrowserConfig(
-                headless=self.headless,
-                chrome_instance_path=None,
-                disable_security=True,
-                extra_chromium_args=[
-                    "--disable-blink-features=AutomationControlled",
-                    "--disable-dev-shm-usage",
-                    "--no-sandbox"
-                ]
-            )
-            
-            # Create browser instance
-            self.browser = Browser(config=browser_config)
+            # Create browser instance (config is shared per headless mode)
+            self.browser = Browser(config=make_browser_config(self.headless))
             
             await self.send_progress("Browser initialized", 5)
             return True
@@ -59,47 +99,129 @@ class SimpleBrowserAgent:
             await self.send_progress(f"Failed to initialize browser: {str(e)}", 0)
             return False
     
-    async def send_progress(self, message: str, percentage: int):
-        """Send progress update"""
-        if self.progress_callback:
-            await self.progress_callback({
-                "message": message,
-                "progress_percentage": percentage,
-                "timestamp": datetime.now().isoformat()
-            })
-        else:
-            print(f"[{percentage}%] {message}")
+    def log_progress(self, message: str, percentage: int):
+        """Print a progress update (no callback registered)"""
+        print(f"[{percentage}%] {message}")
     
-    async def take_screenshot(self):
-        """Take browser screenshot and send to callback"""
+    async def take_screenshot(self, max_age: Optional[float] = None):
+        """Take browser screenshot and send to callback
+        
+        Captures are single-flight: overlapping calls wait for the one in progress and
+        reuse its frame if it is newer than max_age (default screenshot_cache_ttl)
+        seconds. max_age=0 always captures afresh (manual refresh).
+        """
         if self.browser:
-            try:
-                # Get current page
-                current_page = await self.browser.get_current_page()
-                if current_page:
-                    # Take screenshot
-                    screenshot_bytes = await current_page.screenshot(full_page=True)
-                    
-                    # Convert to base64
-                    screenshot_b64 = base64.b64encode(screenshot_bytes).decode('utf-8')
-                    self.last_screenshot = screenshot_b64
-                    
-                    # Send via callback if available
-                    if self.screenshot_callback:
-                        await self.screenshot_callback({
-                            "screenshot": screenshot_b64,
-                            "timestamp": datetime.now().isoformat(),
-                            "format": "png"
-                        })
-                    
-                    return screenshot_b64
-            except Exception as e:
-                print(f"Screenshot error: {e}")
-                return None
+            if max_age is None:
+                max_age = self.screenshot_cache_ttl
+            async with self._capture_lock:
+                if self.last_screenshot is not None and time.monotonic() - self._last_capture_time < max_age:
+                    return self.last_screenshot
+                try:
+                    current_page = await self._get_page()
+                    if current_page:
+                        # Take screenshot (viewport JPEG - far cheaper to encode and ship than a full-page PNG)
+                        screenshot_bytes, screenshot_b64 = await self._capture_viewport(current_page)
+                        self._last_capture_time = time.monotonic()
+                        
+                        # Unchanged page - skip re-sending the same frame
+                        frame_hash = zlib.crc32(screenshot_bytes)
+                        if frame_hash == self._last_screenshot_hash:
+                            return self.last_screenshot
+                        self._last_screenshot_hash = frame_hash
+                        
+                        await self._deliver_screenshot(screenshot_bytes, screenshot_b64)
+                        return screenshot_bytes
+                except Exception as e:
+                    print(f"Screenshot error: {e}")
+                    return None
         return None
     
+    async def _capture_viewport(self, page):
+        """Capture the viewport via CDP (returns raw bytes and Chromium's own base64)
+        
+        Page.captureScreenshot with optimizeForSpeed skips the font/animation
+        settling page.screenshot() does; falls back to Playwright if CDP fails.
+        """
+        try:
+            if self._capture_page is not page:
+                self._capture_session = await page.context.new_cdp_session(page)
+                self._capture_page = page
+            result = await self._capture_session.send("Page.captureScreenshot", {
+                "format": "jpeg",
+                "quality": 60,
+                "optimizeForSpeed": True,
+                "captureBeyondViewport": False
+            })
+            screenshot_b64 = result["data"]
+            return b64decode(screenshot_b64), screenshot_b64
+        except Exception as e:
+            print(f"CDP screenshot unavailable, using page.screenshot: {e}")
+            self._capture_session = None
+            self._capture_page = None
+            screenshot_bytes = await page.screenshot(
+                type="jpeg",
+                quality=60,
+                full_page=False,
+                animations="disabled",
+                caret="initial"
+            )
+            return screenshot_bytes, None
+    
+    async def _get_page(self):
+        """Get the current page, asking the browser only when the cached one is gone"""
+        page = self._cached_page
+        if page is None or page.is_closed():
+            page = self._cached_page = await self.browser.get_current_page()
+        return page
+    
+    def _take_screenshot_in_background(self):
+        """Capture a screenshot without holding up the caller"""
+        task = asyncio.create_task(self._bounded_screenshot())
+        self._pending_screenshots.add(task)
+        task.add_done_callback(self._pending_screenshots.discard)
+    
+    async def _bounded_screenshot(self):
+        async with self._screenshot_slots:
+            await self.take_screenshot()
+    
+    async def _drain_screenshots(self):
+        """Wait for background captures to finish"""
+        if self._pending_screenshots:
+            await asyncio.gather(*self._pending_screenshots, return_exceptions=True)
+    
+    async def _deliver_screenshot(self, screenshot_bytes: bytes, screenshot_b64: Optional[str] = None):
+        """Send a frame to the registered callbacks, base64-encoding only if a base64 sink wants it"""
+        self.last_screenshot = screenshot_bytes
+        timestamp = iso_now()
+        
+        if self.screenshot_bytes_callback:
+            await self.screenshot_bytes_callback(screenshot_bytes, timestamp=timestamp, format="jpeg")
+        
+        if self.screenshot_callback:
+            if screenshot_b64 is None:
+                if len(screenshot_bytes) >= OFFLOAD_ENCODE_BYTES:
+                    screenshot_b64 = await asyncio.to_thread(b64encode_ascii, screenshot_bytes)
+                else:
+                    screenshot_b64 = b64encode_ascii(screenshot_bytes)
+            await self.screenshot_callback({
+                "screenshot": screenshot_b64,
+                "timestamp": timestamp,
+                "format": "jpeg"
+            })
+    
+    async def _wait_for_page_ready(self):
+        """Wait until the page has loaded and shows form controls instead of sleeping"""
+        try:
+            current_page = await self._get_page()
+            await current_page.wait_for_load_state("domcontentloaded", timeout=10000)
+            await current_page.wait_for_selector("form, input, textarea", timeout=5000)
+        except Exception as e:
+            print(f"Page readiness wait ended early: {e}")
+    
     async def request_approval(self, form_data: Dict[str, Any]) -> bool:
         """Request human approval before submission"""
+        # Make sure the reviewer sees all progress leading up to the approval request
+        await self.flush_progress()
         if self.approval_callback:
             return await self.approval_callback(form_data)
         else:
@@ -124,6 +246,7 @@ class SimpleBrowserAgent:
                                       uploaded_files: list = None,
                                       requires_approval: bool = True) -> Dict[str, Any]:
         """Simplified form filling that focuses on approval workflow with browser-use controllers"""
+        form_type_title = form_type.title()
         
         try:
             await self.send_progress("Starting browser automation", 10)
@@ -135,69 +258,61 @@ class SimpleBrowserAgent:
             
             # Navigate to the target URL
             await self.browser.navigate(target_url)
-            await asyncio.sleep(3)
-            
-            # Get current page
-            current_page = await self.browser.get_current_page()
+            self._cached_page = await self.browser.get_current_page()
+            await self._wait_for_page_ready()
             
             # Take initial screenshot
-            await self.take_screenshot()
+            self._take_screenshot_in_background()
             
             await self.send_progress("Analyzing page structure and form fields", 30)
-            await asyncio.sleep(2)  # Simulate analysis
-            await self.take_screenshot()
+            self._take_screenshot_in_background()
             
             await self.send_progress("Detected contact form - mapping fields", 35)
-            await asyncio.sleep(1)
-            await self.take_screenshot()
+            self._take_screenshot_in_background()
             
             await self.send_progress("Filling reporter name field", 45)
-            await asyncio.sleep(1)  # Simulate filling name
-            await self.take_screenshot()
+            self._take_screenshot_in_background()
             
             await self.send_progress("Filling email address field", 50)
-            await asyncio.sleep(1)  # Simulate filling email
-            await self.take_screenshot()
+            self._take_screenshot_in_background()
             
             await self.send_progress("Filling phone number (if field exists)", 55)
-            await asyncio.sleep(1)  # Simulate filling phone
-            await self.take_screenshot()
+            self._take_screenshot_in_background()
             
             await self.send_progress("Filling company/organization field", 60)
-            await asyncio.sleep(1)  # Simulate filling company
-            await self.take_screenshot()
+            self._take_screenshot_in_background()
             
             await self.send_progress("Filling subject/title field", 65)
-            await asyncio.sleep(1)  # Simulate filling subject
-            await self.take_screenshot()
+            self._take_screenshot_in_background()
             
             await self.send_progress("Filling main message/description", 70)
-            await asyncio.sleep(2)  # Simulate filling description
-            await self.take_screenshot()
+            self._take_screenshot_in_background()
             
             if reference_urls:
                 await self.send_progress("Adding reference URLs", 72)
-                await asyncio.sleep(1)
-                await self.take_screenshot()
+                self._take_screenshot_in_background()
             
             if additional_comments:
                 await self.send_progress("Adding additional notes/comments", 74)
-                await asyncio.sleep(1)
-                await self.take_screenshot()
+                self._take_screenshot_in_background()
             
             await self.send_progress("Detecting additional form fields", 76)
-            await asyncio.sleep(1)
-            await self.take_screenshot()
+            self._take_screenshot_in_background()
             
             if uploaded_files:
                 await self.send_progress(f"Processing {len(uploaded_files)} uploaded file(s)", 77)
-                await asyncio.sleep(1)
-                await self.take_screenshot()
+                self._take_screenshot_in_background()
             
             await self.send_progress("Form filling completed", 80)
-            await self.take_screenshot()
+            self._take_screenshot_in_background()
             
             # Prepare comprehensive form data for approval
+            field_values = {
+                "form_type_title": form_type_title,
+                "subject": subject,
+                "priority": priority,
+                "files_count": len(uploaded_files or [])
+            }
             form_preview = {
                 "target_url": target_url,
                 "platform": platform,
@@ -213,18 +328,10 @@ class SimpleBrowserAgent:
                 "contact_phone": contact_info.get('phone', ''),
                 "contact_company": contact_info.get('company', ''),
                 "contact_job_title": contact_info.get('job_title', ''),
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": iso_now(),
                 "form_fields_detected": {
-                    "name_field": "Full Name",
-                    "email_field": "Email Address",
-                    "phone_field": "Phone Number (if available)",
-                    "company_field": "Company/Organization",
-                    "title_field": "Job Title/Role (if available)",
-                    "subject_field": f"{form_type.title()} - {subject}",
-                    "message_field": "Main message/inquiry",
-                    "reference_field": "Reference URLs (if provided)",
-                    "priority_field": f"Priority: {priority}",
-                    "files_field": f"Attached files: {len(uploaded_files or [])} file(s)"
+                    key: value.format_map(field_values)
+                    for key, value in FORM_FIELDS_DETECTED_TEMPLATE.items()
                 }
             }
             
@@ -232,14 +339,10 @@ class SimpleBrowserAgent:
             
             # Request approval if required
             if requires_approval:
-                # Start continuous monitoring during approval waiting
-                await self.start_continuous_monitoring()
-                await self.send_progress("Started continuous monitoring for approval period", 85)
-                
-                approved = await self.request_approval(form_preview)
-                
-                # Stop continuous monitoring
-                await self.stop_continuous_monitoring()
+                # Continuous monitoring runs exactly as long as the approval wait
+                async with self._monitoring():
+                    await self.send_progress("Started continuous monitoring for approval period", 85)
+                    approved = await self.request_approval(form_preview)
                 
                 if not approved:
                     await self.send_progress("Submission rejected by human reviewer", 90)
@@ -253,13 +356,12 @@ class SimpleBrowserAgent:
             else:
                 await self.send_progress("No approval required, submitting", 95)
             
-            # Simulate form submission
-            await asyncio.sleep(2)
+            # Form submission is simulated (see submit_result)
             await self.send_progress("Form submitted successfully", 100)
             
             return {
                 "success": True,
-                "message": f"{form_type.title()} form submitted successfully (simulated)",
+                "message": f"{form_type_title} form submitted successfully (simulated)",
                 "form_data": form_preview,
                 "agent_result": "Generic form filling workflow completed",
                 "submit_result": "Form submission simulated with intelligent field mapping",
@@ -272,8 +374,10 @@ class SimpleBrowserAgent:
             return {"success": False, "error": error_msg}
             
         finally:
+            await self._drain_screenshots()
             if self.browser:
                 await self.cleanup()
+            await self._stop_progress_drain()
     
     def set_progress_callback(self, callback: Callable):
         """Set callback for progress updates"""
@@ -284,36 +388,110 @@ class SimpleBrowserAgent:
         self.approval_callback = callback
     
     def set_screenshot_callback(self, callback: Callable):
-        """Set callback for screenshot updates"""
+        """Set callback for screenshot updates (base64 payload dict)"""
         self.screenshot_callback = callback
     
+    def set_screenshot_bytes_callback(self, callback: Callable):
+        """Set callback for raw screenshot bytes: callback(data, timestamp=..., format=...)"""
+        self.screenshot_bytes_callback = callback
+    
     async def start_continuous_monitoring(self):
         """Start continuous screenshot monitoring"""
         if self.continuous_monitoring:
             return
         
         self.continuous_monitoring = True
+        self._stop_monitoring.clear()
+        # Chromium pushes a frame only when the page repaints - no idle captures
+        if await self._start_screencast():
+            print("🔄 Started continuous monitoring (CDP screencast)")
+            return
         self.monitoring_task = asyncio.create_task(self._continuous_screenshot_loop())
         print(f"🔄 Started continuous monitoring (every {self.screenshot_interval}s)")
     
     async def stop_continuous_monitoring(self):
         """Stop continuous screenshot monitoring"""
         self.continuous_monitoring = False
-        if self.monitoring_task:
-            self.monitoring_task.cancel()
+        self._stop_monitoring.set()
+        await self._stop_screencast()
+        task, self.monitoring_task = self.monitoring_task, None
+        if task:
+            # The loop exits on the stop event; cancel only if a capture is stuck
             try:
-                await self.monitoring_task
+                async with asyncio.timeout(5):
+                    await task
+            except TimeoutError:
+                task.cancel()
             except asyncio.CancelledError:
-                pass
+                # Swallow only the loop's own cancellation - ours must propagate
+                if not task.cancelled() or asyncio.current_task().cancelling():
+                    task.cancel()
+                    raise
         print("⏹️ Stopped continuous monitoring")
     
+    @asynccontextmanager
+    async def _monitoring(self):
+        """Run continuous monitoring for the duration of an ``async with`` block"""
+        await self.start_continuous_monitoring()
+        try:
+            yield
+        finally:
+            await self.stop_continuous_monitoring()
+    
+    async def _start_screencast(self) -> bool:
+        """Start a CDP screencast on the current page (False if unavailable)"""
+        if not self.browser:
+            return False
+        try:
+            page = await self._get_page()
+            session = await page.context.new_cdp_session(page)
+            session.on("Page.screencastFrame", self._on_screencast_frame)
+            await session.send("Page.startScreencast", {
+                "format": "jpeg",
+                "quality": 60,
+                "maxWidth": 1280,
+                "everyNthFrame": 2
+            })
+        except Exception as e:
+            print(f"CDP screencast unavailable, polling instead: {e}")
+            return False
+        self._cdp_session = session
+        return True
+    
+    async def _stop_screencast(self):
+        """Stop the screencast started by _start_screencast"""
+        session, self._cdp_session = self._cdp_session, None
+        if session:
+            try:
+                await session.send("Page.stopScreencast")
+                await session.detach()
+            except Exception:
+                pass  # Page/browser already gone
+    
+    async def _on_screencast_frame(self, params: Dict[str, Any]):
+        """Forward a pushed (already base64) JPEG frame to the screenshot callback"""
+        session = self._cdp_session
+        if session:
+            try:
+                # Chromium sends the next frame only after this one is acknowledged
+                await session.send("Page.screencastFrameAck", {"sessionId": params["sessionId"]})
+            except Exception:
+                pass
+        
+        screenshot_b64 = params["data"]
+        await self._deliver_screenshot(b64decode(screenshot_b64), screenshot_b64)
+    
     async def _continuous_screenshot_loop(self):
         """Continuous screenshot monitoring loop"""
         try:
             while self.continuous_monitoring:
                 if self.browser:
                     await self.take_screenshot()
-                await asyncio.sleep(self.screenshot_interval)
+                try:
+                    async with asyncio.timeout(self.screenshot_interval):
+                        await self._stop_monitoring.wait()
+                except TimeoutError:
+                    pass
         except asyncio.CancelledError:
             print("📸 Screenshot monitoring loop cancelled")
         except Exception as e:
@@ -332,8 +510,15 @@ class SimpleBrowserAgent:
             if self.browser:
                 await self.browser.close()
                 self.browser = None
+                self._cached_page = None
+                self._capture_session = None
+                self._capture_page = None
         except Exception as e:
             print(f"Error during cleanup: {e}")
+    
+    async def close(self):
+        """Release browser resources (form filling already cleans up after itself)"""
+        await self.cleanup()
 
 
 # Test function
@@ -386,6 +571,11 @@ async def test_simple_agent():
 
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass  # e.g. Windows - stay on the default loop
     print("🎬 Testing Simplified Browser Agent with Approval Workflow")
     print("=" * 60)
     asyncio.run(test_simple_agent())
\ No newline at end of file
@@ -6,21 +6,107 @@ This controller handles file uploads in web forms using browser-use automation.
 It can detect file input fields and upload files automatically.
 """
 
+import asyncio
 import os
-from pathlib import Path
-from typing import Dict, List, Any, Optional
+from collections import deque
+from typing import Deque, Dict, List, Any, Optional
 from pydantic import BaseModel
 from browser_use import Controller, action
 from browser_use.browser.browser import Browser
 from browser_use.context import BrowserContext
 
 
+# Maximum number of upload records kept by a controller
+MAX_UPLOAD_HISTORY = 1024
+
+# JavaScript to find all file input elements (built once, evaluated per detection)
+DETECT_FILE_INPUTS_JS = """
+    () => {
+        const inputs = Array.from(document.querySelectorAll('input[type="file"]'));
+        
+        // Read all bounding boxes in one pass so the page is laid out only once
+        const rects = inputs.map(input => input.getBoundingClientRect());
+        
+        // Build the label[for] lookup once instead of querying per input
+        const labelFor = new Map();
+        for (const label of document.querySelectorAll('label[for]')) {
+            if (!labelFor.has(label.htmlFor)) {
+                labelFor.set(label.htmlFor, label.textContent.trim());
+            }
+        }
+        
+        const nearbyText = input => {
+            // Look for nearby text
+            let parent = input.parentElement;
+            while (parent && parent.tagName !== 'FORM') {
+                let text = parent.textContent;
+                if (text && text.trim().length > 0 && text.trim().length < 100) {
+                    return text.trim();
+                }
+                parent = parent.parentElement;
+            }
+            return '';
+        };
+        
+        return inputs.map((input, i) => {
+            const wrappingLabel = input.closest('label');
+            let label = wrappingLabel ? wrappingLabel.textContent.trim() : undefined;
+            if (label === undefined && input.id && labelFor.has(input.id)) {
+                label = labelFor.get(input.id);
+            }
+            if (label === undefined) {
+                label = nearbyText(input);
+            }
+            const rect = rects[i];
+            return {
+                id: input.id,
+                name: input.name,
+                accept: input.accept,
+                multiple: input.multiple,
+                required: input.required,
+                className: input.className,
+                placeholder: input.placeholder,
+                label: label,
+                boundingBox: {
+                    x: rect.x,
+                    y: rect.y,
+                    width: rect.width,
+                    height: rect.height
+                }
+            };
+        });
+    }
+"""
+
+# Resolve once a file input holds its files (or after 1s, so verification can fail)
+WAIT_FOR_FILES_JS = """
+    input => new Promise(resolve => {
+        if (input.files.length) {
+            resolve();
+            return;
+        }
+        input.addEventListener('change', () => resolve(), {once: true});
+        setTimeout(resolve, 1000);
+    })
+"""
+
+
+def input_selector_for(input_data: Dict[str, Any]) -> Optional[str]:
+    """CSS selector for a detected file input (None if it has neither id nor name)"""
+    if input_data.get('id'):
+        return f"#{input_data['id']}"
+    if input_data.get('name'):
+        return f"input[name='{input_data['name']}']"
+    return None
+
+
 class FileUploadController(Controller):
     """Controller for handling file uploads in web forms"""
     
     def __init__(self):
         super().__init__()
-        self.uploaded_files: List[Dict[str, Any]] = []
+        # Upload history of the (module-level, long-lived) controller - oldest entries drop off
+        self.uploaded_files: Deque[Dict[str, Any]] = deque(maxlen=MAX_UPLOAD_HISTORY)
         
     @action("Detect all file input fields on the current page")
     async def detect_file_inputs(self, context: BrowserContext) -> List[Dict[str, Any]]:
@@ -30,48 +116,7 @@ class FileUploadController(Controller):
             if not page:
                 return []
                 
-            # JavaScript to find all file input elements
-            js_code = """
-            Array.from(document.querySelectorAll('input[type="file"]')).map(input => ({
-                id: input.id,
-                name: input.name,
-                accept: input.accept,
-                multiple: input.multiple,
-                required: input.required,
-                className: input.className,
-                placeholder: input.placeholder,
-                label: (function() {
-                    // Try to find associated label
-                    let label = input.closest('label');
-                    if (!label && input.id) {
-                        label = document.querySelector('label[for="' + input.id + '"]');
-                    }
-                    if (!label) {
-                        // Look for nearby text
-                        let parent = input.parentElement;
-                        while (parent && parent.tagName !== 'FORM') {
-                            let text = parent.textContent;
-                            if (text && text.trim().length > 0 && text.trim().length < 100) {
-                                return text.trim();
-                            }
-                            parent = parent.parentElement;
-                        }
-                    }
-                    return label ? label.textContent.trim() : '';
-                })(),
-                boundingBox: (function() {
-                    let rect = input.getBoundingClientRect();
-                    return {
-                        x: rect.x,
-                        y: rect.y,
-                        width: rect.width,
-                        height: rect.height
-                    };
-                })()
-            }))
-            """
-            
-            file_inputs = await page.evaluate(js_code)
+            file_inputs = await page.evaluate(DETECT_FILE_INPUTS_JS)
             
             print(f"🔍 Found {len(file_inputs)} file input field(s)")
             for i, input_field in enumerate(file_inputs):
@@ -87,49 +132,53 @@ class FileUploadController(Controller):
             return []
     
     @action("Upload a file to a specific file input field")
-    async def upload_file(self, context: BrowserContext, file_path: str, input_selector: str = None) -> bool:
-        """Upload a file to a specific file input field"""
+    async def upload_file(self, context: BrowserContext, file_path: str, input_selector: str = None,
+                          file_inputs: Optional[List[Dict[str, Any]]] = None,
+                          file_meta: Optional[Dict[str, Any]] = None) -> bool:
+        """Upload a file to a specific file input field
+        
+        Pass file_inputs (from detect_file_inputs) to skip re-detecting the inputs
+        when no selector is given, and file_meta ({'name', 'size'} of an already
+        stat'ed file) to skip the existence check.
+        """
         try:
             page = context.page
             if not page:
                 self.logger.error("No browser page available")
                 return False
                 
-            if not os.path.exists(file_path):
-                self.logger.error(f"File not found: {file_path}")
-                return False
+            if file_meta is None:
+                if not os.path.exists(file_path):
+                    self.logger.error(f"File not found: {file_path}")
+                    return False
+                file_meta = {'name': os.path.basename(file_path)}
                 
             # Get file inputs if selector not provided
             if not input_selector:
-                file_inputs = await self.detect_file_inputs(context)
+                if file_inputs is None:
+                    file_inputs = await self.detect_file_inputs(context)
                 if not file_inputs:
                     self.logger.error("No file input fields found")
                     return False
                     
                 # Use first available input
-                input_data = file_inputs[0]
-                if input_data.get('id'):
-                    input_selector = f"#{input_data['id']}"
-                elif input_data.get('name'):
-                    input_selector = f"input[name='{input_data['name']}']"
-                else:
-                    input_selector = "input[type='file']"
+                input_selector = input_selector_for(file_inputs[0]) or "input[type='file']"
             
-            self.logger.info(f"Uploading file: {Path(file_path).name} to {input_selector}")
+            self.logger.info(f"Uploading file: {file_meta['name']} to {input_selector}")
             
             # Upload the file using Playwright
             file_input = page.locator(input_selector).first
             await file_input.set_input_files(file_path)
             
-            # Verify upload
-            await page.wait_for_timeout(1000)  # Wait for upload to process
+            # Verify upload - resolves as soon as the input has the file (at most 1s)
+            await file_input.evaluate(WAIT_FOR_FILES_JS)
             
             file_name = await file_input.evaluate("input => input.files[0]?.name")
             if file_name:
                 self.logger.info(f"File uploaded successfully: {file_name}")
                 self.uploaded_files.append({
                     'path': file_path,
-                    'name': Path(file_path).name,
+                    'name': file_meta['name'],
                     'selector': input_selector,
                     'uploaded_name': file_name
                 })
@@ -153,6 +202,21 @@ class FileUploadController(Controller):
         }
         
         try:
+            # Check all files up front with a single stat each (fail fast on missing files)
+            file_metas = {}
+            for file_path in file_paths:
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    self.logger.error(f"File not found: {file_path}")
+                    result['failed_files'].append(file_path)
+                    continue
+                file_metas[file_path] = {'name': os.path.basename(file_path), 'size': stat.st_size}
+            file_paths = [file_path for file_path in file_paths if file_path in file_metas]
+            if not file_paths:
+                result['success'] = False
+                return result
+            
             file_inputs = await self.detect_file_inputs(context)
             if not file_inputs:
                 self.logger.error("No file input fields found")
@@ -164,7 +228,7 @@ class FileUploadController(Controller):
             
             if multi_input:
                 # Upload all files to the multiple file input
-                selector = f"#{multi_input['id']}" if multi_input.get('id') else f"input[name='{multi_input['name']}']"
+                selector = input_selector_for(multi_input) or "input[type='file'][multiple]"
                 try:
                     file_input = context.page.locator(selector).first
                     await file_input.set_input_files(file_paths)
@@ -180,24 +244,28 @@ class FileUploadController(Controller):
                 except Exception as e:
                     self.logger.error(f"Multi-file upload failed: {e}")
             
-            # Fall back to uploading to individual inputs
-            for i, file_path in enumerate(file_paths):
-                if i < len(file_inputs):
-                    input_data = file_inputs[i]
-                    selector = None
-                    if input_data.get('id'):
-                        selector = f"#{input_data['id']}"
-                    elif input_data.get('name'):
-                        selector = f"input[name='{input_data['name']}']"
-                    
-                    success = await self.upload_file(context, file_path, selector)
-                    if success:
-                        result['uploaded_files'].append(file_path)
-                        result['inputs_used'].append(selector or f"input[{i}]")
+            # Fall back to uploading to individual inputs - they are independent, so in parallel
+            uploads = []
+            async with asyncio.TaskGroup() as tg:
+                for i, file_path in enumerate(file_paths):
+                    if i < len(file_inputs):
+                        # Inputs without id/name are addressed by position, so upload_file
+                        # never has to pick (or re-detect) an input itself
+                        selector = input_selector_for(file_inputs[i]) or f"input[type='file'] >> nth={i}"
+                        task = tg.create_task(self.upload_file(
+                            context, file_path, selector,
+                            file_inputs=file_inputs, file_meta=file_metas[file_path]
+                        ))
+                        uploads.append((file_path, selector, task))
                     else:
+                        self.logger.warning(f"No more file inputs for {file_metas[file_path]['name']}")
                         result['failed_files'].append(file_path)
+            
+            for file_path, selector, task in uploads:
+                if task.result():
+                    result['uploaded_files'].append(file_path)
+                    result['inputs_used'].append(selector)
                 else:
-                    self.logger.warning(f"No more file inputs for {Path(file_path).name}")
                     result['failed_files'].append(file_path)
             
             if result['failed_files']:
@@ -217,29 +285,27 @@ class FileUploadController(Controller):
         try:
             file_inputs = await self.detect_file_inputs(context)
             
+            # Single pass over the inputs for all per-input facts
+            accepts_multiple = False
+            required_files = 0
+            accepted_types = set()
+            for inp in file_inputs:
+                accepts_multiple |= bool(inp.get('multiple'))
+                required_files += bool(inp.get('required'))
+                accept = inp.get('accept')
+                if accept:
+                    accepted_types.update(t.strip() for t in accept.split(','))
+            
             analysis = {
                 'total_inputs': len(file_inputs),
-                'accepts_multiple': any(inp.get('multiple') for inp in file_inputs),
-                'required_files': len([inp for inp in file_inputs if inp.get('required')]),
-                'accepted_types': [],
-                'max_files': 0,
+                'accepts_multiple': accepts_multiple,
+                'required_files': required_files,
+                'accepted_types': list(accepted_types),
+                # Assume reasonable limit for multiple
+                'max_files': 99 if accepts_multiple else len(file_inputs),
                 'recommendations': []
             }
             
-            # Analyze accepted file types
-            for inp in file_inputs:
-                accept = inp.get('accept', '')
-                if accept:
-                    types = [t.strip() for t in accept.split(',')]
-                    analysis['accepted_types'].extend(types)
-            
-            analysis['accepted_types'] = list(set(analysis['accepted_types']))
-            
-            # Calculate max files
-            analysis['max_files'] = len(file_inputs)
-            if any(inp.get('multiple') for inp in file_inputs):
-                analysis['max_files'] = 99  # Assume reasonable limit for multiple
-            
             # Generate recommendations
             if analysis['total_inputs'] == 0:
                 analysis['recommendations'].append("No file upload fields detected")
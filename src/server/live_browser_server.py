@@ -4,22 +4,48 @@ Live browser server with real browser automation using browser-use
 """
 
 import asyncio
+import base64
+import gzip
+import hashlib
+import io
+import itertools
+import logging
+import queue
 import uvicorn
-import json
+import orjson
 import os
+import time
 import uuid
+from collections import OrderedDict, defaultdict, deque
 import aiofiles
 import shutil
 from pathlib import Path
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, WebSocket, HTTPException, UploadFile, File
+from logging.handlers import QueueHandler, QueueListener
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, HTTPException, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from websockets.exceptions import ConnectionClosed
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, Callable, Iterable, List, Set
 from PIL import Image
-import PyPDF2
+# PDFium (C++) text extraction, falling back to pure-Python PyPDF2
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+    import PyPDF2
+# Brotli for precompressed static assets, gzip only without it
+try:
+    import brotli
+except ImportError:
+    brotli = None
+# MessagePack WebSocket frames for clients that ask for them, JSON only without it
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
 from enum import Enum
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
@@ -27,12 +53,34 @@ from dotenv import load_dotenv
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'agents'))
+# Project root, so src.* imports work however the server module itself was imported
+# (run.py imports it as the top-level "server" package)
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from simple_browser_agent import SimpleBrowserAgent
+from src.utils.timestamps import iso_now
 
 # Load environment variables from .env file
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+def start_log_listener() -> QueueListener:
+    """Route root logging through a queue so handlers write to stdout on a worker thread
+    
+    Log calls on the event loop become a non-blocking queue put instead of a stdout
+    write that stalls broadcasts when stdout is piped to a slow collector.
+    """
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    root = logging.getLogger()
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    listener.start()
+    return listener
+
 # Job status enum
 class JobStatus(str, Enum):
     QUEUED = "queued"
@@ -43,6 +91,9 @@ class JobStatus(str, Enum):
     COMPLETED = "completed"
     FAILED = "failed"
 
+# Jobs store the plain status string (JobStatus.X.value), so hot comparisons are str == str
+ACTIVE_STATUSES = frozenset({JobStatus.RUNNING.value, JobStatus.WAITING_FOR_APPROVAL.value})
+
 # Request models
 class FormFillingRequest(BaseModel):
     target_url: str
@@ -66,102 +117,542 @@ class HumanApprovalRequest(BaseModel):
     analyst_name: str = None
     analyst_notes: str = None
 
+# Frames buffered per subscriber before its oldest frames are dropped
+OUTBOX_SIZE = 64
+
+# Job updates that are also pushed to the global (dashboard) subscribers
+GLOBAL_JOB_UPDATE_TYPES = frozenset({
+    "status_change", "approval_required", "approval_received", "completion", "error"
+})
+
+def new_id() -> str:
+    """Random 32-char hex id for jobs and uploads (uuid4 without str()'s dash formatting)"""
+    return uuid.uuid4().hex
+
+# Upload limits: maximum size, and the chunk size uploads are streamed to disk in
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+UPLOAD_CHUNK_BYTES = 1 << 16
+# Accepted content types and the file extensions allowed for each
+ALLOWED_UPLOAD_TYPES = {
+    'text/plain': ['.txt'],
+    'application/pdf': ['.pdf'],
+    'image/jpeg': ['.jpg', '.jpeg'],
+    'image/png': ['.png'],
+    'image/gif': ['.gif']
+}
+
+# Extracted details (text preview, image dimensions) of recent uploads by content digest,
+# so re-uploading the same file skips PDF/image processing - LRU, oldest evicted first
+UPLOAD_INFO_CACHE_SIZE = 1024
+upload_info_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+# Characters of text content returned as an upload preview
+TEXT_PREVIEW_CHARS = 1000
+
+# Pages of an uploaded PDF whose text is extracted for the preview
+PDF_PREVIEW_PAGES = 5
+
+def extract_pdf_text(file_path: Path, max_pages: int = PDF_PREVIEW_PAGES) -> str:
+    """Extract text from the first pages of a PDF (blocking - run it in a worker thread)"""
+    if pdfium is not None:
+        pdf = pdfium.PdfDocument(str(file_path))
+        try:
+            texts = []
+            for index in range(min(max_pages, len(pdf))):
+                page = pdf[index]
+                textpage = page.get_textpage()
+                texts.append(textpage.get_text_range())
+                textpage.close()
+                page.close()
+            return "\n".join(texts)
+        finally:
+            pdf.close()
+    with open(file_path, 'rb') as pdf_file:
+        pdf_reader = PyPDF2.PdfReader(pdf_file)
+        return "\n".join(page.extract_text() for page in pdf_reader.pages[:max_pages])
+
+def read_image_size(file_path: Path) -> tuple:
+    """Width and height from the image header only - pixels are never decoded (blocking)"""
+    with Image.open(file_path) as image:
+        return image.size
+
+# Lossless agent frames (full-page PNGs) are re-encoded to WebP at this quality,
+# no wider than the monitor view shows them, before being stored and fanned out
+WEBP_QUALITY = 80
+MONITOR_MAX_WIDTH = 1280
+
+def transcode_to_webp(image_bytes: bytes, quality: int = WEBP_QUALITY,
+                      max_width: int = MONITOR_MAX_WIDTH) -> bytes:
+    """Re-encode an image as WebP, downscaled to max_width (blocking - run it in a worker thread)
+    
+    Only the width is capped: full-page captures are tall, and fitting them into a
+    square box would make the form unreadable.
+    """
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        if image.width > max_width:
+            height = max(1, round(image.height * max_width / image.width))
+            image = image.resize((max_width, height), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, format="WEBP", quality=quality, method=4)
+    return buffer.getvalue()
+
+# Pages and assets at least this large are sent compressed to clients that accept it
+GZIP_MIN_BYTES = 1024
+
+def precompress(body: bytes) -> Dict[str, bytes]:
+    """Encode a static page or asset once at import: Content-Encoding -> compressed bytes"""
+    encoded = {"gzip": gzip.compress(body, compresslevel=9)}
+    if brotli is not None:
+        encoded["br"] = brotli.compress(body, quality=11)
+    return encoded
+
+# Content-hashed scripts served under /static: path -> (bytes, precompressed). A new
+# version gets a new path, so browsers may cache every one of them for good
+STATIC_SCRIPTS: Dict[str, tuple] = {}
+
+def static_script(name: str, source: str) -> str:
+    """Register a script under a content-hashed /static path and return that path"""
+    body = source.encode()
+    path = f"/static/{name}.{hashlib.blake2b(body, digest_size=8).hexdigest()}.js"
+    STATIC_SCRIPTS[path] = (body, precompress(body))
+    return path
+
+def html_page_response(body: bytes, request: Request, precompressed: Dict[str, bytes] = None,
+                       etag: str = None, cache_control: str = None,
+                       media_type: str = "text/html") -> Response:
+    """Serve an HTML page (or static asset), compressed when the client accepts it -
+    brotli when precompressed, else gzip (precompressed if given)
+    
+    Static pages pass their ETag (and Cache-Control) so revalidations get an empty 304.
+    """
+    headers = {"Vary": "Accept-Encoding"}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    if etag:
+        headers["ETag"] = etag
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+    precompressed = precompressed or {}
+    accept = request.headers.get("accept-encoding", "")
+    if len(body) >= GZIP_MIN_BYTES:
+        if "br" in precompressed and "br" in accept:
+            headers["Content-Encoding"] = "br"
+            body = precompressed["br"]
+        elif "gzip" in accept:
+            headers["Content-Encoding"] = "gzip"
+            body = precompressed.get("gzip") or gzip.compress(body, compresslevel=6)
+    return Response(content=body, media_type=media_type, headers=headers)
+
+# Stands in an outbox's FIFO for its (replaceable) latest screenshot frame
+_SCREENSHOT_SLOT = object()
+
+class Outbox:
+    """One subscriber's pending frames: a bounded FIFO with a last-write-wins screenshot
+    
+    A screenshot frame takes one place in the FIFO; a newer one replaces its content
+    there, so a slow client only ever gets the latest image. When the FIFO is full its
+    oldest frame is dropped.
+    """
+    __slots__ = ("maxsize", "_frames", "_screenshot", "_ready")
+    
+    def __init__(self, maxsize: int = OUTBOX_SIZE):
+        self.maxsize = maxsize
+        self._frames = deque()
+        self._screenshot = None  # pending screenshot frame, queued as _SCREENSHOT_SLOT
+        self._ready = asyncio.Event()
+    
+    def put(self, frame, latest: bool = False):
+        """Queue a frame; latest=True replaces a still-pending screenshot frame"""
+        if latest:
+            pending = self._screenshot is not None
+            self._screenshot = frame
+            if pending:
+                return
+            frame = _SCREENSHOT_SLOT
+        if len(self._frames) >= self.maxsize and self._frames.popleft() is _SCREENSHOT_SLOT:
+            self._screenshot = None
+        self._frames.append(frame)
+        self._ready.set()
+    
+    async def get(self):
+        """Wait for the next frame (the drainer or event stream is the only reader)"""
+        while not self._frames:
+            self._ready.clear()
+            await self._ready.wait()
+        frame = self._frames.popleft()
+        if frame is _SCREENSHOT_SLOT:
+            frame, self._screenshot = self._screenshot, None
+        return frame
+
 # WebSocket connection manager
 class ConnectionManager:
     def __init__(self):
-        self.job_connections: Dict[str, List[WebSocket]] = {}
-        self.global_connections: List[WebSocket] = []
+        # Sets, so disconnecting is O(1) however many analysts watch a job
+        self.job_connections: Dict[str, Set[WebSocket]] = {}
+        self.global_connections: Set[WebSocket] = set()
+        # Pre-serialized static head of job updates: (job_id, update_type) -> '{"type":...,'
+        self._job_prefixes: Dict[tuple, str] = {}
+        # Per-subscriber Outbox and the task draining it: websocket -> (outbox, task)
+        self._outboxes: Dict[WebSocket, tuple] = {}
+        # Monotonic sequence stamped on job updates so clients can drop stale frames
+        self._sequence = itertools.count(1)
+        # Sockets that negotiated the "msgpack" subprotocol
+        self._msgpack_sockets: Set[WebSocket] = set()
+
+    async def _accept(self, websocket: WebSocket):
+        """Accept a socket, in MessagePack when it offers the "msgpack" subprotocol
+        
+        Such a socket gets every update as one binary MessagePack frame, with any
+        image inlined under "image" (bin) instead of as a second frame.
+        """
+        if msgpack is not None and "msgpack" in websocket.scope.get("subprotocols", ()):
+            await websocket.accept(subprotocol="msgpack")
+            self._msgpack_sockets.add(websocket)
+        else:
+            await websocket.accept()
 
     async def connect_job(self, websocket: WebSocket, job_id: str):
-        await websocket.accept()
+        await self._accept(websocket)
         if job_id not in self.job_connections:
-            self.job_connections[job_id] = []
-        self.job_connections[job_id].append(websocket)
+            self.job_connections[job_id] = set()
+        self.job_connections[job_id].add(websocket)
+        self._open_outbox(websocket, self.job_connections[job_id])
 
     async def connect_global(self, websocket: WebSocket):
-        await websocket.accept()
-        self.global_connections.append(websocket)
+        await self._accept(websocket)
+        self.global_connections.add(websocket)
+        self._open_outbox(websocket, self.global_connections)
+
+    def open_job_stream(self, job_id: str) -> Outbox:
+        """Subscribe a receive-only (Server-Sent Events) client to a job's updates"""
+        return self._open_stream(self.job_connections.setdefault(job_id, set()))
+    
+    def open_global_stream(self) -> Outbox:
+        """Subscribe a receive-only (Server-Sent Events) client to global updates"""
+        return self._open_stream(self.global_connections)
+    
+    def _open_stream(self, connections: Set) -> Outbox:
+        """Register an event-stream subscriber, keyed by its own outbox
+        
+        Its response reads frames straight off the outbox, so unlike a WebSocket it
+        needs no drainer task. Close it with disconnect_job/disconnect_global.
+        """
+        outbox = Outbox()
+        self._outboxes[outbox] = (outbox, None)
+        connections.add(outbox)
+        return outbox
 
     def disconnect_job(self, websocket: WebSocket, job_id: str):
+        self._close_outbox(websocket)
         if job_id in self.job_connections:
-            self.job_connections[job_id].remove(websocket)
+            connections = self.job_connections[job_id]
+            connections.discard(websocket)
+            if not connections:
+                # Last monitor for this job is gone - drop its cached prefixes
+                del self.job_connections[job_id]
+                for key in [key for key in self._job_prefixes if key[0] == job_id]:
+                    del self._job_prefixes[key]
+    
+    def _job_prefix(self, job_id: str, update_type: str, cache: bool = True) -> str:
+        """JSON head of a job update (everything before the dynamic fields), built once
+        
+        cache=False builds it without storing it - for jobs with no monitor, whose
+        prefixes would never be cleaned up by disconnect_job.
+        """
+        prefix = self._job_prefixes.get((job_id, update_type))
+        if prefix is None:
+            head = orjson.dumps({"type": "job_update", "job_id": job_id, "update_type": update_type})
+            prefix = head[:-1].decode() + ","
+            if cache:
+                self._job_prefixes[(job_id, update_type)] = prefix
+        return prefix
 
     def disconnect_global(self, websocket: WebSocket):
-        if websocket in self.global_connections:
-            self.global_connections.remove(websocket)
+        self._close_outbox(websocket)
+        self.global_connections.discard(websocket)
     
-    async def broadcast_job_update(self, job_id: str, update_type: str, message: str, data: Dict = None):
-        """Broadcast update to job-specific WebSocket connections"""
-        if job_id in self.job_connections:
-            update = {
-                "type": "job_update",
-                "job_id": job_id,
-                "update_type": update_type,
-                "message": message,
-                "timestamp": datetime.now().isoformat(),
-                "data": data or {}
-            }
-            
-            for connection in self.job_connections[job_id]:
-                try:
-                    await connection.send_text(json.dumps(update))
-                except:
-                    pass  # Connection might be closed
+    async def broadcast_job_update(self, job_id: str, update_type: str, message: str, data: Dict = None,
+                                   binary: bytes = None):
+        """Broadcast update to job-specific WebSocket connections
+        
+        Job lifecycle updates (GLOBAL_JOB_UPDATE_TYPES) also go to the global
+        subscribers (the dashboard), sharing the same encoded frame. If binary is given
+        it follows the JSON update as a binary frame to job subscribers only (e.g. the
+        screenshot image itself), so it never goes through base64 or JSON.
+        """
+        connections = self.job_connections.get(job_id)
+        mirror = update_type in GLOBAL_JOB_UPDATE_TYPES and bool(self.global_connections)
+        if not connections and not mirror:
+            return  # nobody is listening for this update - skip building it
+        # Serialize once for all connections
+        message_text = self._encode_job_update(job_id, update_type, message, data, cache=bool(connections))
+        if connections:
+            self._enqueue_all(connections, update_type, message_text, binary)
+        if mirror:
+            self._enqueue_all(self.global_connections, update_type, message_text)
+    
+    def send_job_update(self, websocket: WebSocket, job_id: str, update_type: str, message: str,
+                        data: Dict = None, binary: bytes = None):
+        """Queue a job update (and optional binary frame) for one subscriber only"""
+        self.send_frame(websocket, update_type, self._encode_job_update(job_id, update_type, message, data), binary)
+    
+    def send_frame(self, websocket: WebSocket, update_type: str, message_text: str, binary: bytes = None):
+        """Queue one pre-encoded frame for a single subscriber"""
+        self._enqueue_all((websocket,), update_type, message_text, binary)
+    
+    def publish_job_patch(self, job_id: str, fields: Dict[str, Any]):
+        """Tell the global subscribers (the dashboard) which listed fields of a job changed"""
+        if not self.global_connections or not fields:
+            return
+        message_text = orjson.dumps({"type": "job_patch", "job_id": job_id, "fields": fields}).decode()
+        self._enqueue_all(self.global_connections, "job_patch", message_text)
+    
+    def _encode_job_update(self, job_id: str, update_type: str, message: str, data: Dict = None,
+                           cache: bool = True) -> str:
+        """Encode a job update: cached static head + freshly serialized dynamic fields"""
+        body = orjson.dumps({
+            "message": message,
+            "timestamp": iso_now(),
+            "seq": next(self._sequence),
+            "data": data or {}
+        })
+        return self._job_prefix(job_id, update_type, cache=cache) + body[1:].decode()
     
     async def broadcast_global_update(self, update_type: str, message: str, data: Dict = None):
         """Broadcast update to global WebSocket connections"""
+        if not self.global_connections:
+            return
         update = {
             "type": "system",
             "update_type": update_type,
             "message": message,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": iso_now(),
             "data": data or {}
         }
+        # Serialize once for all connections
+        message_text = orjson.dumps(update).decode()
+        self._enqueue_all(self.global_connections, update_type, message_text)
+    
+    def _enqueue_all(self, connections: Iterable[WebSocket], update_type: str, message_text: str,
+                     binary: bytes = None):
+        """Queue one pre-encoded frame for every connection without waiting on any socket
         
-        for connection in self.global_connections:
-            try:
-                await connection.send_text(json.dumps(update))
-            except:
-                pass
+        Each subscriber's drainer task does the actual sending, so a slow client only
+        backs up its own outbox. Screenshot updates are last-write-wins (see Outbox).
+        """
+        coalesce = update_type == "screenshot_update"
+        packed = None  # the MessagePack form, built once if any subscriber wants it
+        for websocket in connections:
+            entry = self._outboxes.get(websocket)
+            if entry is None:
+                continue  # drainer already stopped (socket closed)
+            queued = (update_type, message_text, binary)
+            if websocket in self._msgpack_sockets:
+                if packed is None:
+                    update = orjson.loads(message_text)
+                    if binary is not None:
+                        update["image"] = binary
+                    packed = msgpack.packb(update, use_bin_type=True)
+                queued = (update_type, packed, None)
+            entry[0].put(queued, latest=coalesce)
+    
+    def _open_outbox(self, websocket: WebSocket, connections: Set[WebSocket]):
+        """Create a subscriber's outbox and start its drainer"""
+        outbox = Outbox()
+        self._outboxes[websocket] = (outbox, asyncio.create_task(self._drain(websocket, outbox, connections)))
+    
+    def _close_outbox(self, websocket: WebSocket):
+        """Stop a subscriber's drainer and discard its pending frames"""
+        entry = self._outboxes.pop(websocket, None)
+        self._msgpack_sockets.discard(websocket)
+        if entry is not None and entry[1] is not None:
+            entry[1].cancel()
+    
+    async def close(self):
+        """Stop every drainer and forget all subscribers (server shutdown)"""
+        tasks = []
+        for outbox, task in self._outboxes.values():
+            if task is None:
+                # Event stream - wake its response so it ends instead of staying open
+                outbox.put(None)
+            else:
+                tasks.append(task)
+        self._outboxes.clear()
+        for task in tasks:
+            task.cancel()
+        # Let the cancellations land so no drainer is left pending when the loop closes
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.job_connections.clear()
+        self.global_connections.clear()
+        self._job_prefixes.clear()
+        self._msgpack_sockets.clear()
+    
+    async def _drain(self, websocket: WebSocket, outbox: Outbox, connections: Set[WebSocket]):
+        """Send queued frames to one subscriber until its socket fails"""
+        try:
+            while True:
+                _, message, binary = await outbox.get()
+                if isinstance(message, bytes):
+                    await websocket.send_bytes(message)  # MessagePack
+                else:
+                    await websocket.send_text(message)
+                if binary is not None:
+                    await websocket.send_bytes(binary)
+        except (WebSocketDisconnect, ConnectionClosed, RuntimeError):
+            # Connection closed (Starlette raises RuntimeError when sending after close)
+            pass
+        except Exception as e:
+            logger.warning("❌ WebSocket send failed: %s", e)
+        # Evict the socket right away so broadcasts stop queueing frames for it
+        if self._outboxes.get(websocket, (None,))[0] is outbox:
+            del self._outboxes[websocket]
+            self._msgpack_sockets.discard(websocket)
+        connections.discard(websocket)
 
 manager = ConnectionManager()
 
+# Maximum number of jobs driving a browser at the same time
+MAX_CONCURRENT_JOBS = max(1, int(os.getenv("MAX_CONCURRENT_JOBS", "4")))
+
+# Finished jobs kept for review before the oldest are evicted
+MAX_FINISHED_JOBS = max(1, int(os.getenv("MAX_FINISHED_JOBS", "10000")))
+
+# Finished jobs included (newest first) in the snapshot a dashboard gets on connect
+DASHBOARD_RECENT_JOBS = 20
+
 # Job manager for real browser automation
 class LiveJobManager:
     def __init__(self):
         self.jobs = {}
+        # Jobs per status, maintained on every transition so stats never scan self.jobs
+        self.status_counts: Dict[str, int] = defaultdict(int)
+        self._finished_jobs = deque()  # finished job ids, oldest first
         self.pending_approvals = {}  # job_id -> approval_event
         self.approval_data = {}  # job_id -> form_data
         self.job_screenshots = {}  # job_id -> latest screenshot
+        self.job_agents = {}  # job_id -> agent driving the job's browser (while running)
+        # Bumped on every change, so encoded responses are reused until the job changes
+        self.job_versions: Dict[str, int] = {}
+        self._job_bodies: Dict[str, tuple] = {}  # job_id -> (version, JSON bytes)
+        self.pending_version = 0  # bumped whenever pending_approvals changes
+        self._instance = new_id()[:8]  # keeps pending-list ETags distinct across restarts
+        # Each running job owns a browser - cap how many run at once (extra jobs stay queued)
+        self.job_slots = asyncio.Semaphore(MAX_CONCURRENT_JOBS)
     
     def create_job(self, request: FormFillingRequest) -> str:
-        job_id = str(uuid.uuid4())
+        job_id = new_id()
         self.jobs[job_id] = {
             "job_id": job_id,
-            "status": JobStatus.QUEUED,
-            "request_data": request.dict(),
+            "status": JobStatus.QUEUED.value,
+            "request_data": request.model_dump(),
             "created_at": datetime.now(),
             "progress_percentage": 0,
             "current_step": "Job created",
             "result": None,
             "error": None
         }
-        print(f"📋 Created job {job_id} - Status: {JobStatus.QUEUED}")
-        print(f"   Target URL: {request.target_url}")
-        print(f"   Requires approval: {request.require_human_approval}")
+        self.status_counts[JobStatus.QUEUED.value] += 1
+        self.job_versions[job_id] = 0
+        manager.publish_job_patch(job_id, self.job_summary(self.jobs[job_id]))
+        logger.info("📋 Created job %s - Status: %s", job_id, JobStatus.QUEUED.value)
+        logger.debug("   Target URL: %s", request.target_url)
+        logger.debug("   Requires approval: %s", request.require_human_approval)
         return job_id
     
+    def _set_status(self, job: Dict[str, Any], status: JobStatus):
+        """Change a job's status (stored as its string value) and keep status_counts in step"""
+        self.status_counts[job["status"]] -= 1
+        self.status_counts[status.value] += 1
+        job["status"] = status.value
+    
+    @staticmethod
+    def job_summary(job: Dict[str, Any]) -> Dict[str, Any]:
+        """The fields of a job the dashboard lists (job_patch fields use the same names)"""
+        return {
+            "status": job["status"],
+            "progress": job["progress_percentage"],
+            "current_step": job.get("current_step", ""),
+            "target_url": job["request_data"].get("target_url", "")
+        }
+    
+    def jobs_snapshot(self) -> str:
+        """Encoded jobs_snapshot frame: every unfinished job plus the most recently finished"""
+        finished = set(self._finished_jobs)
+        job_ids = [job_id for job_id in self.jobs if job_id not in finished]
+        job_ids.extend(itertools.islice(reversed(self._finished_jobs), DASHBOARD_RECENT_JOBS))
+        return orjson.dumps({
+            "type": "jobs_snapshot",
+            "jobs": {job_id: self.job_summary(self.jobs[job_id]) for job_id in job_ids if job_id in self.jobs}
+        }).decode()
+    
+    def _apply_delta(self, job: Dict[str, Any], status: JobStatus = None, progress: int = None,
+                     current_step: str = None) -> Dict[str, Any]:
+        """Apply status/progress/step changes to a job and return only the fields that changed
+        
+        The result is broadcast as the update's "delta", so monitors patch their view
+        from the push instead of refetching the whole job; the dashboard gets it as a
+        job_patch.
+        """
+        # Every caller changes the job, so its cached encoding is stale either way
+        self.job_versions[job["job_id"]] += 1
+        delta = {}
+        if status is not None and job["status"] != status.value:
+            self._set_status(job, status)
+            delta["status"] = status.value
+        if progress is not None and job["progress_percentage"] != progress:
+            job["progress_percentage"] = progress
+            delta["progress"] = progress
+        if current_step is not None and job.get("current_step") != current_step:
+            job["current_step"] = current_step
+            delta["current_step"] = current_step
+        manager.publish_job_patch(job["job_id"], delta)
+        return delta
+    
+    def _finish_job(self, job_id: str):
+        """Record a finished job and evict the oldest ones beyond MAX_FINISHED_JOBS"""
+        self._finished_jobs.append(job_id)
+        while len(self._finished_jobs) > MAX_FINISHED_JOBS:
+            old_id = self._finished_jobs.popleft()
+            old_job = self.jobs.pop(old_id, None)
+            if old_job:
+                self.status_counts[old_job["status"]] -= 1
+            self.job_screenshots.pop(old_id, None)
+            self.job_versions.pop(old_id, None)
+            self._job_bodies.pop(old_id, None)
+    
+    def pending_etag(self) -> str:
+        """ETag of the current pending-approvals list"""
+        return f'"pending-{self._instance}-{self.pending_version}"'
+    
+    def job_etag(self, job_id: str) -> str:
+        """ETag of a job's current state (job ids are unique, so it never repeats)"""
+        return f'"{job_id}-{self.job_versions[job_id]}"'
+    
+    def job_body(self, job_id: str) -> bytes:
+        """The job encoded as JSON, re-encoded only after it changed"""
+        version = self.job_versions[job_id]
+        cached = self._job_bodies.get(job_id)
+        if cached is None or cached[0] != version:
+            cached = self._job_bodies[job_id] = (version, orjson.dumps(self.jobs[job_id]))
+        return cached[1]
+    
     async def process_job_with_real_browser(self, job_id: str):
+        """Process job using real browser automation, bounded by the concurrent job limit"""
+        async with self.job_slots:
+            await self._process_job_with_real_browser(job_id)
+    
+    async def _process_job_with_real_browser(self, job_id: str):
         """Process job using real browser automation"""
         job = self.jobs.get(job_id)
         if not job:
-            print(f"❌ Job {job_id} not found")
+            logger.error("❌ Job %s not found", job_id)
             return
         
+        agent = None
         try:
-            print(f"🚀 Processing job {job_id}")
-            job["status"] = JobStatus.RUNNING
-            await manager.broadcast_job_update(job_id, "status_change", "Job started", {"status": "running"})
+            logger.info("🚀 Processing job %s", job_id)
+            delta = self._apply_delta(job, status=JobStatus.RUNNING, current_step="Job started")
+            await manager.broadcast_job_update(job_id, "status_change", "Job started", {"status": "running", "delta": delta})
             
             # Create browser agent based on engine selection
             request_data = job["request_data"]
@@ -169,7 +660,7 @@ class LiveJobManager:
             
             # Choose agent based on browser engine
             if browser_engine == "puppeteer":
-                from ..agents.puppeteer_browser_agent import PuppeteerBrowserAgent
+                from src.agents.puppeteer_browser_agent import PuppeteerBrowserAgent
                 agent = PuppeteerBrowserAgent(
                     headless=request_data.get("headless", False),
                     cdp_url=request_data.get("cdp_url", "http://localhost:9222"),
@@ -186,63 +677,97 @@ class LiveJobManager:
             
             # Set up callbacks for progress and approval
             async def progress_callback(progress_data):
-                job["progress_percentage"] = progress_data["progress_percentage"]
-                job["current_step"] = progress_data["message"]
+                delta = self._apply_delta(
+                    job, progress=progress_data["progress_percentage"], current_step=progress_data["message"]
+                )
                 await manager.broadcast_job_update(
                     job_id, "progress", progress_data["message"], 
-                    {"progress": progress_data["progress_percentage"]}
+                    {"progress": progress_data["progress_percentage"], "delta": delta}
                 )
             
             async def approval_callback(form_data):
-                print(f"⏳ Job {job_id} requesting approval")
-                print(f"   Form data: {form_data}")
+                logger.info("⏳ Job %s requesting approval", job_id)
+                logger.debug("   Form data: %s", form_data)
                 
                 # Store form data for approval
                 self.approval_data[job_id] = form_data
                 
                 # Update job status
-                job["status"] = JobStatus.WAITING_FOR_APPROVAL
-                print(f"   Status updated to: {JobStatus.WAITING_FOR_APPROVAL}")
+                delta = self._apply_delta(
+                    job, status=JobStatus.WAITING_FOR_APPROVAL,
+                    current_step="Human approval required before form submission"
+                )
+                logger.debug("   Status updated to: %s", job["status"])
                 
                 # Create approval event
                 approval_event = asyncio.Event()
                 self.pending_approvals[job_id] = approval_event
-                print(f"   Added to pending approvals. Total pending: {len(self.pending_approvals)}")
+                self.pending_version += 1
+                logger.debug("   Added to pending approvals. Total pending: %d", len(self.pending_approvals))
                 
                 # Broadcast approval required
                 await manager.broadcast_job_update(
                     job_id, "approval_required", 
                     "Human approval required before form submission",
-                    {"form_preview": form_data}
+                    {"form_preview": form_data, "status": job["status"], "delta": delta}
                 )
-                print(f"   Broadcasted approval_required event")
+                logger.debug("   Broadcasted approval_required event")
                 
                 # Wait for approval decision
-                print(f"   Waiting for human approval...")
+                logger.debug("   Waiting for human approval...")
                 await approval_event.wait()
                 
                 # Check if approved
                 approved = job.get("approved", False)
-                print(f"   Approval decision: {approved}")
+                logger.info("   Job %s approval decision: %s", job_id, approved)
                 return approved
             
-            async def screenshot_callback(screenshot_data):
-                """Handle screenshot updates from browser agent"""
-                print(f"📸 Job {job_id} screenshot received")
+            async def screenshot_bytes_callback(image, timestamp=None, format="png"):
+                """Handle raw screenshot frames from browser agent"""
+                logger.debug("📸 Job %s screenshot received", job_id)
                 
-                # Store latest screenshot
-                self.job_screenshots[job_id] = screenshot_data
+                if format == "png":
+                    # Full-page PNGs are large - send every monitor a WebP instead,
+                    # encoded off the event loop (viewport frames are JPEG already)
+                    try:
+                        image = await asyncio.to_thread(transcode_to_webp, image)
+                        format = "webp"
+                    except Exception as e:
+                        logger.warning("WebP transcode failed, sending PNG: %s", e)
+                
+                # Store latest screenshot, with a content hash as its ETag so pollers
+                # can revalidate instead of re-downloading an unchanged image
+                image_hash = hashlib.blake2b(image, digest_size=16).hexdigest()
+                self.job_screenshots[job_id] = {
+                    "image": image, "timestamp": timestamp, "format": format,
+                    "hash": image_hash, "etag": f'"{image_hash}"'
+                }
                 
-                # Broadcast screenshot update
+                # Broadcast screenshot update: JSON metadata, then the image as a binary frame
                 await manager.broadcast_job_update(
                     job_id, "screenshot_update", 
                     "Browser screenshot updated",
-                    {"screenshot_available": True, "timestamp": screenshot_data.get("timestamp")}
+                    {"screenshot_available": True, "timestamp": timestamp, "format": format, "hash": image_hash},
+                    binary=image
+                )
+            
+            async def screenshot_callback(screenshot_data):
+                """Handle base64 screenshot payloads from agents without a raw-bytes callback"""
+                image = screenshot_data.get("raw_bytes")
+                if image is None:
+                    image = base64.b64decode(screenshot_data["screenshot"])
+                await screenshot_bytes_callback(
+                    image, screenshot_data.get("timestamp"), screenshot_data.get("format", "png")
                 )
             
             agent.set_progress_callback(progress_callback)
             agent.set_approval_callback(approval_callback)
-            agent.set_screenshot_callback(screenshot_callback)
+            if hasattr(agent, "set_screenshot_bytes_callback"):
+                # Raw frames - the agent then skips base64 encoding entirely
+                agent.set_screenshot_bytes_callback(screenshot_bytes_callback)
+            else:
+                agent.set_screenshot_callback(screenshot_callback)
+            self.job_agents[job_id] = agent
             
             # Configure continuous monitoring for live updates
             agent.set_screenshot_interval(1.5)  # Screenshot every 1.5 seconds
@@ -281,41 +806,51 @@ class LiveJobManager:
             else:
                 result = {"success": False, "error": "Invalid target URL"}
             
+            # Release the browser before reporting the result (finally skips it then)
+            await agent.close()
+            agent = None
+            
             # Update job with result
             job["result"] = result
             
             if result.get("success"):
-                job["status"] = JobStatus.COMPLETED
-                job["progress_percentage"] = 100
+                delta = self._apply_delta(
+                    job, status=JobStatus.COMPLETED, progress=100, current_step="Job completed successfully"
+                )
                 await manager.broadcast_job_update(
                     job_id, "completion", "Job completed successfully", 
-                    {"result": result}
+                    {"result": result, "status": job["status"], "progress": 100, "delta": delta}
                 )
             else:
-                job["status"] = JobStatus.FAILED
                 job["error"] = result.get("error", "Unknown error")
+                delta = self._apply_delta(job, status=JobStatus.FAILED, current_step=f"Job failed: {job['error']}")
                 await manager.broadcast_job_update(
                     job_id, "error", f"Job failed: {job['error']}", 
-                    {"error": job["error"]}
+                    {"error": job["error"], "status": job["status"], "delta": delta}
                 )
             
         except Exception as e:
-            job["status"] = JobStatus.FAILED
             job["error"] = str(e)
-            print(f"❌ Job {job_id} failed: {e}")  # Console logging
-            import traceback
-            traceback.print_exc()  # Full stack trace
+            delta = self._apply_delta(job, status=JobStatus.FAILED, current_step=f"Job failed with exception: {str(e)}")
+            logger.exception("❌ Job %s failed: %s", job_id, e)  # Includes the full stack trace
             await manager.broadcast_job_update(
                 job_id, "error", f"Job failed with exception: {str(e)}", 
-                {"error": str(e)}
+                {"error": str(e), "status": job["status"], "delta": delta}
             )
         
         finally:
+            self.job_agents.pop(job_id, None)
+            # Make sure the browser is released if the job failed midway
+            if agent:
+                await agent.close()
+            
             # Clean up approval data and screenshots
-            self.pending_approvals.pop(job_id, None)
+            if self.pending_approvals.pop(job_id, None) is not None:
+                self.pending_version += 1
             self.approval_data.pop(job_id, None)
             # Keep screenshots for a while for completed job review
             # self.job_screenshots.pop(job_id, None)
+            self._finish_job(job_id)
     
     async def approve_job(self, job_id: str, approved: bool, reason: str = None, analyst_name: str = None):
         """Approve or reject a pending job"""
@@ -332,18 +867,18 @@ class LiveJobManager:
         job["approved_by"] = analyst_name
         
         if approved:
-            job["status"] = JobStatus.APPROVED
+            message = f"Job approved by {analyst_name}: {reason}"
+            delta = self._apply_delta(job, status=JobStatus.APPROVED, current_step=message)
             await manager.broadcast_job_update(
-                job_id, "approval_received", 
-                f"Job approved by {analyst_name}: {reason}",
-                {"approved": True, "analyst": analyst_name}
+                job_id, "approval_received", message,
+                {"approved": True, "analyst": analyst_name, "status": job["status"], "delta": delta}
             )
         else:
-            job["status"] = JobStatus.REJECTED
+            message = f"Job rejected by {analyst_name}: {reason}"
+            delta = self._apply_delta(job, status=JobStatus.REJECTED, current_step=message)
             await manager.broadcast_job_update(
-                job_id, "approval_received", 
-                f"Job rejected by {analyst_name}: {reason}",
-                {"approved": False, "analyst": analyst_name}
+                job_id, "approval_received", message,
+                {"approved": False, "analyst": analyst_name, "status": job["status"], "delta": delta}
             )
         
         # Signal the approval event
@@ -356,7 +891,7 @@ class LiveJobManager:
     def get_pending_approvals(self) -> List[str]:
         """Get list of jobs waiting for approval"""
         pending_list = list(self.pending_approvals.keys())
-        print(f"🔍 get_pending_approvals called - Found {len(pending_list)} pending: {pending_list}")
+        logger.debug("🔍 get_pending_approvals called - Found %d pending: %s", len(pending_list), pending_list)
         return pending_list
 
 # Global job manager
@@ -365,17 +900,54 @@ job_manager = LiveJobManager()
 # FastAPI app
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    print("🚀 Starting Live Browser Automation Server...")
-    print("🔧 Browser-use agent ready for real browser automation")
-    print("👁️  Set headless=False to watch browser activity live!")
+    log_listener = start_log_listener()
+    logger.info("🚀 Starting Live Browser Automation Server...")
+    # Python 3.12+: run agent coroutines eagerly until their first suspension,
+    # so progress updates that never yield skip Task scheduling entirely
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+        logger.info("⚡ Eager task factory enabled")
+    
+    # Optionally pre-launch browsers for the Puppeteer engine (BROWSER_POOL_SIZE > 0)
+    browser_pool = None
+    pool_size = int(os.getenv("BROWSER_POOL_SIZE", "0"))
+    if pool_size > 0:
+        from src.utils.browser_pool import BrowserPool, set_browser_pool
+        from src.agents.puppeteer_browser_agent import create_launch_browser
+        pool_headless = os.getenv("BROWSER_POOL_HEADLESS", "false").lower() == "true"
+        browser_pool = BrowserPool(
+            # Port 0 - pooled browsers must not fight over the CDP port
+            browser_factory=lambda: create_launch_browser(pool_headless, debugging_port=0),
+            size=pool_size,
+            headless=pool_headless
+        )
+        set_browser_pool(browser_pool)
+        await browser_pool.prewarm()
+    logger.info("🔧 Browser-use agent ready for real browser automation")
+    logger.info("👁️  Set headless=False to watch browser activity live!")
     yield
-    print("🛑 Shutting down server...")
+    logger.info("🛑 Shutting down server...")
+    await manager.close()
+    if browser_pool:
+        await browser_pool.close()
+    # Stop the Puppeteer servers shared by the browser agents (if any were started)
+    for module_name in ("src.utils.puppeteer_server_manager", "utils.puppeteer_server_manager"):
+        server_managers = sys.modules.get(module_name)
+        if server_managers:
+            await server_managers.stop_server_managers()
+    # Close the pooled HTTP session shared by the browser agents (if one was loaded)
+    for module_name in ("src.utils.http_session", "utils.http_session"):
+        http_session = sys.modules.get(module_name)
+        if http_session:
+            await http_session.close_session()
+    log_listener.stop()  # flushes queued records
 
 app = FastAPI(
     title="Live Browser Automation with Human Approval",
     description="Real browser automation using browser-use with human approval workflow",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
@@ -396,111 +968,165 @@ app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 # Routes
 @app.post("/api/v1/form/submit")
 async def submit_form_filling_job(request: FormFillingRequest):
-    print(f"🚀 API: Received form filling request")
-    print(f"   URL: {request.target_url}")
-    print(f"   Platform: {request.platform}")
-    print(f"   Form Type: {request.form_type}")
+    logger.info("🚀 API: Received form filling request for %s", request.target_url)
+    logger.debug("   Platform: %s", request.platform)
+    logger.debug("   Form Type: %s", request.form_type)
     
     job_id = job_manager.create_job(request)
     
     # Start job processing in background
-    print(f"📋 API: Starting background job processing for {job_id}")
+    logger.debug("📋 API: Starting background job processing for %s", job_id)
     asyncio.create_task(job_manager.process_job_with_real_browser(job_id))
     
     return {"job_id": job_id, "status": "Form filling job submitted successfully"}
 
-@app.post("/api/v1/files/upload")
-async def upload_file(file: UploadFile = File(...)):
-    """Upload a file (TXT, PDF, or Image)"""
+def check_upload_type(file: UploadFile):
+    """Reject files whose content type / extension pair is not supported"""
+    file_extension = Path(file.filename).suffix.lower()
+    if file_extension not in ALLOWED_UPLOAD_TYPES.get(file.content_type, []):
+        raise HTTPException(status_code=400, detail=f"File type not supported ({file.filename}). Allowed types: TXT, PDF, JPG, PNG, GIF")
+
+async def store_upload(file: UploadFile) -> Dict[str, Any]:
+    """Store an uploaded file and build its info (with preview) for the client"""
     try:
-        # Validate file type
-        allowed_types = {
-            'text/plain': ['.txt'],
-            'application/pdf': ['.pdf'],
-            'image/jpeg': ['.jpg', '.jpeg'],
-            'image/png': ['.png'],
-            'image/gif': ['.gif']
-        }
-        
+        check_upload_type(file)
         file_extension = Path(file.filename).suffix.lower()
         content_type = file.content_type
         
-        if content_type not in allowed_types or file_extension not in allowed_types.get(content_type, []):
-            raise HTTPException(status_code=400, detail=f"File type not supported. Allowed types: TXT, PDF, JPG, PNG, GIF")
-        
-        # Check file size (10MB limit)
-        content = await file.read()
-        if len(content) > 10 * 1024 * 1024:
-            raise HTTPException(status_code=400, detail="File too large. Maximum size is 10MB")
-        
-        # Generate unique filename
-        file_id = str(uuid.uuid4())
-        filename = f"{file_id}_{file.filename}"
-        file_path = UPLOAD_DIR / filename
+        file_id = new_id()
+        temp_path = UPLOAD_DIR / f".{file_id}.part"
         
-        # Save file
-        async with aiofiles.open(file_path, 'wb') as f:
-            await f.write(content)
+        # Stream to disk in chunks, hashing as we go and aborting as soon as the
+        # 10MB limit is exceeded
+        size = 0
+        hasher = hashlib.sha256()
+        try:
+            async with aiofiles.open(temp_path, 'wb') as f:
+                while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+                    size += len(chunk)
+                    if size > MAX_UPLOAD_BYTES:
+                        raise HTTPException(status_code=400, detail="File too large. Maximum size is 10MB")
+                    hasher.update(chunk)
+                    await f.write(chunk)
+            
+            # Content-addressed name: identical uploads share one file on disk
+            digest = hasher.hexdigest()
+            filename = f"{digest}{file_extension}"
+            file_path = UPLOAD_DIR / filename
+            if not file_path.exists():
+                os.replace(temp_path, file_path)
+        finally:
+            # Whatever happened (too large, client gone, disk error, duplicate content),
+            # no partial file is left behind in the served upload directory
+            temp_path.unlink(missing_ok=True)
         
-        # Process file based on type
         file_info = {
             "file_id": file_id,
             "original_name": file.filename,
             "filename": filename,
             "content_type": content_type,
-            "size": len(content),
+            "size": size,
             "file_url": f"/uploads/{filename}"
         }
         
-        # Extract text content for text processing
+        cached_details = upload_info_cache.get(digest)
+        if cached_details is not None:
+            # Seen this content before - reuse its preview instead of re-processing
+            upload_info_cache.move_to_end(digest)
+            file_info.update(cached_details)
+            logger.info("📁 File uploaded: %s (%d bytes, duplicate content)", file.filename, size)
+            return file_info
+        
+        # Process file based on type - extract text content for the preview
         if content_type == 'text/plain':
-            text_content = content.decode('utf-8')
-            file_info["text_content"] = text_content[:1000]  # First 1000 chars for preview
+            # Only the preview is needed - read back just enough bytes for it (UTF-8 is at
+            # most 4 bytes per char; a character cut off at the end is dropped)
+            async with aiofiles.open(file_path, 'rb') as f:
+                head = await f.read(TEXT_PREVIEW_CHARS * 4)
+            text_content = head.decode('utf-8', errors='ignore')
+            file_info["text_content"] = text_content[:TEXT_PREVIEW_CHARS]  # First 1000 chars for preview
         elif content_type == 'application/pdf':
             try:
-                # Extract text from PDF
-                with open(file_path, 'rb') as pdf_file:
-                    pdf_reader = PyPDF2.PdfReader(pdf_file)
-                    text_content = ""
-                    for page in pdf_reader.pages[:5]:  # First 5 pages
-                        text_content += page.extract_text() + "\n"
-                    file_info["text_content"] = text_content[:1000]  # First 1000 chars
+                # Extract text from PDF off the event loop (first PDF_PREVIEW_PAGES pages)
+                text_content = await asyncio.to_thread(extract_pdf_text, file_path)
+                file_info["text_content"] = text_content[:1000]  # First 1000 chars
             except Exception as e:
-                print(f"Error extracting PDF text: {e}")
+                logger.warning("Error extracting PDF text: %s", e)
                 file_info["text_content"] = "[PDF text extraction failed]"
         elif content_type.startswith('image/'):
             try:
-                # Get image dimensions
-                image = Image.open(file_path)
-                file_info["image_dimensions"] = {"width": image.width, "height": image.height}
-                file_info["text_content"] = f"[Image: {image.width}x{image.height}]"
+                # Get image dimensions off the event loop
+                width, height = await asyncio.to_thread(read_image_size, file_path)
+                file_info["image_dimensions"] = {"width": width, "height": height}
+                file_info["text_content"] = f"[Image: {width}x{height}]"
             except Exception as e:
-                print(f"Error processing image: {e}")
+                logger.warning("Error processing image: %s", e)
                 file_info["text_content"] = "[Image processing failed]"
         
-        print(f"📁 File uploaded: {file.filename} ({len(content)} bytes)")
+        upload_info_cache[digest] = {
+            key: file_info[key] for key in ("text_content", "image_dimensions") if key in file_info
+        }
+        if len(upload_info_cache) > UPLOAD_INFO_CACHE_SIZE:
+            upload_info_cache.popitem(last=False)
+        
+        logger.info("📁 File uploaded: %s (%d bytes)", file.filename, size)
         return file_info
         
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"❌ File upload error: {e}")
+        logger.error("❌ File upload error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/v1/files/upload")
+async def upload_file(file: UploadFile = File(...)):
+    """Upload a file (TXT, PDF, or Image)"""
+    return await store_upload(file)
+
+@app.post("/api/v1/files/upload/batch")
+async def upload_files(files: List[UploadFile] = File(...)):
+    """Upload several files in one request - every file's type is checked before any
+    is stored, so an unsupported one rejects the whole batch"""
+    for file in files:
+        check_upload_type(file)
+    return ORJSONResponse({"files": [await store_upload(file) for file in files]})
+
+@app.get("/api/v1/jobs")
+async def get_jobs(ids: str = ""):
+    """Several jobs in one round-trip: the given ids (comma-separated) plus every job
+    pending approval, along with the pending list itself"""
+    pending = job_manager.get_pending_approvals()
+    jobs = {}
+    for job_id in itertools.chain(filter(None, ids.split(",")), pending):
+        job = job_manager.jobs.get(job_id)
+        if job is not None:
+            jobs[job_id] = job
+    return ORJSONResponse({"pending": pending, "jobs": jobs})
+
 @app.get("/api/v1/jobs/{job_id}")
-async def get_job_status(job_id: str):
-    print(f"📋 API: get_job_status called for {job_id}")
+async def get_job_status(job_id: str, request: Request):
+    logger.debug("📋 API: get_job_status called for %s", job_id)
     job = job_manager.jobs.get(job_id)
     if not job:
-        print(f"   ❌ Job {job_id} not found")
+        logger.debug("   ❌ Job %s not found", job_id)
         raise HTTPException(status_code=404, detail="Job not found")
-    print(f"   ✅ Job found - Status: {job['status']}, Progress: {job['progress_percentage']}%")
-    return job
+    logger.debug("   ✅ Job found - Status: %s, Progress: %s%%", job['status'], job['progress_percentage'])
+    # Polled by monitors and dashboards - an unchanged job costs a 304, and a changed one
+    # is encoded once (orjson, datetimes natively) however many clients ask for it
+    headers = {"ETag": job_manager.job_etag(job_id), "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=job_manager.job_body(job_id), media_type="application/json", headers=headers)
 
 @app.get("/api/v1/approval/pending")
-async def get_pending_approvals():
-    print(f"📋 API: get_pending_approvals endpoint called")
+async def get_pending_approvals(request: Request):
+    logger.debug("📋 API: get_pending_approvals endpoint called")
+    headers = {"ETag": job_manager.pending_etag(), "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
     pending = job_manager.get_pending_approvals()
-    print(f"   Returning: {pending}")
-    return pending
+    logger.debug("   Returning: %s", pending)
+    return ORJSONResponse(pending, headers=headers)
 
 @app.get("/api/v1/approval/{job_id}/preview")
 async def get_approval_preview(job_id: str):
@@ -536,10 +1162,10 @@ async def approve_job(job_id: str, approval: HumanApprovalRequest):
 
 @app.get("/api/v1/approval/stats")
 async def get_approval_stats():
-    all_jobs = list(job_manager.jobs.values())
-    pending = len([j for j in all_jobs if j["status"] == JobStatus.WAITING_FOR_APPROVAL])
-    approved = len([j for j in all_jobs if j["status"] == JobStatus.APPROVED])
-    rejected = len([j for j in all_jobs if j["status"] == JobStatus.REJECTED])
+    status_counts = job_manager.status_counts
+    pending = status_counts[JobStatus.WAITING_FOR_APPROVAL.value]
+    approved = status_counts[JobStatus.APPROVED.value]
+    rejected = status_counts[JobStatus.REJECTED.value]
     
     return {
         "pending_approvals": pending,
@@ -549,8 +1175,12 @@ async def get_approval_stats():
     }
 
 @app.get("/api/v1/jobs/{job_id}/screenshot")
-async def get_job_screenshot(job_id: str):
-    """Get the latest screenshot for a job"""
+async def get_job_screenshot(job_id: str, request: Request, h: str = None):
+    """Get the latest screenshot for a job (304 if the client already has it)
+    
+    ?h=<hash> names a specific image (see /screenshot/meta); while it is still the
+    latest, the response may be cached indefinitely since that URL never changes.
+    """
     if job_id not in job_manager.jobs:
         raise HTTPException(status_code=404, detail="Job not found")
     
@@ -558,12 +1188,40 @@ async def get_job_screenshot(job_id: str):
     if not screenshot_data:
         raise HTTPException(status_code=404, detail="No screenshot available for this job")
     
-    return {
+    headers = {
+        "Cache-Control": "private, max-age=31536000, immutable" if h == screenshot_data["hash"] else "no-store",
+        "ETag": screenshot_data["etag"],
+        "X-Screenshot-Timestamp": screenshot_data.get("timestamp") or ""
+    }
+    if request.headers.get("if-none-match") == screenshot_data["etag"]:
+        # Browser unchanged since the client's last fetch - skip the body
+        return Response(status_code=304, headers=headers)
+    
+    # Serve the image itself - no base64 inflation or JSON wrapper. The stored bytes
+    # object is handed to Starlette as-is (bytes bodies aren't copied), so every poll
+    # and every WebSocket subscriber shares the one buffer the agent produced
+    return Response(
+        content=screenshot_data["image"],
+        media_type=f"image/{screenshot_data.get('format', 'png')}",
+        headers=headers
+    )
+
+@app.get("/api/v1/jobs/{job_id}/screenshot/meta")
+async def get_job_screenshot_meta(job_id: str):
+    """Describe the latest screenshot without sending it, so pollers fetch only changed images"""
+    if job_id not in job_manager.jobs:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    screenshot_data = job_manager.job_screenshots.get(job_id)
+    if not screenshot_data:
+        raise HTTPException(status_code=404, detail="No screenshot available for this job")
+    
+    return ORJSONResponse({
         "job_id": job_id,
-        "screenshot": screenshot_data.get("screenshot"),
+        "hash": screenshot_data["hash"],
         "timestamp": screenshot_data.get("timestamp"),
         "format": screenshot_data.get("format", "png")
-    }
+    })
 
 @app.post("/api/v1/jobs/{job_id}/screenshot/refresh")
 async def force_screenshot_refresh(job_id: str):
@@ -574,17 +1232,22 @@ async def force_screenshot_refresh(job_id: str):
     job = job_manager.jobs[job_id]
     
     # Check if job is active
-    if job["status"] not in [JobStatus.RUNNING, JobStatus.WAITING_FOR_APPROVAL]:
+    if job["status"] not in ACTIVE_STATUSES:
         raise HTTPException(status_code=400, detail="Job is not active - cannot refresh screenshot")
     
-    # This would ideally trigger the agent to take a fresh screenshot
-    # For now, we'll return a response indicating refresh was requested
     await manager.broadcast_job_update(
         job_id, "screenshot_refresh_requested", 
         "Manual screenshot refresh requested",
-        {"refresh_requested": True, "timestamp": datetime.now().isoformat()}
+        {"refresh_requested": True}
     )
     
+    # Bypass the agent's short capture cache; the new frame reaches monitors through
+    # the usual screenshot callback. Captures are single-flight per agent, so this
+    # never overlaps one the agent (or another refresh) already has in progress
+    agent = job_manager.job_agents.get(job_id)
+    if agent is not None:
+        await agent.take_screenshot(max_age=0)
+    
     return {
         "job_id": job_id,
         "refresh_requested": True,
@@ -593,53 +1256,64 @@ async def force_screenshot_refresh(job_id: str):
 
 @app.get("/health")
 async def health_check():
-    return {
+    return ORJSONResponse({
         "status": "healthy",
-        "active_jobs": len([j for j in job_manager.jobs.values() if j["status"] == JobStatus.RUNNING]),
+        "active_jobs": job_manager.status_counts[JobStatus.RUNNING.value],
         "pending_approvals": len(job_manager.pending_approvals)
-    }
+    })
 
-@app.get("/api/v1/jobs/{job_id}/monitor", response_class=HTMLResponse)
-async def monitor_job_browser(job_id: str):
-    """Remote browser monitoring for analysts"""
-    job = job_manager.jobs.get(job_id)
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    
-    return HTMLResponse(content=f"""
+# Remote monitor page - a single-window monitor for any number of jobs. It is identical
+# for every job (the script reads the job to show from the URL and switches between
+# jobs itself), so it is encoded and compressed once and revalidated with an ETag
+MONITOR_PAGE_HTML = """
 <!DOCTYPE html>
 <html>
 <head>
-    <title>🔍 Browser Monitor - Job {job_id[:8]}</title>
+    <title>🔍 Browser Monitor</title>
     <style>
-        body {{ font-family: Arial, sans-serif; margin: 0; padding: 20px; background: #f5f5f5; }}
-        .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 20px; border-radius: 8px; margin-bottom: 20px; }}
-        .monitor-container {{ background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-        .job-info {{ background: #e8f4f8; padding: 15px; border-radius: 5px; margin-bottom: 20px; }}
-        .status-indicator {{ display: inline-block; width: 10px; height: 10px; border-radius: 50%; margin-right: 5px; }}
-        .status-running {{ background: #27ae60; animation: pulse 1s infinite; }}
-        .status-waiting {{ background: #f39c12; animation: pulse 1s infinite; }}
-        .status-completed {{ background: #3498db; }}
-        .live-feed {{ border: 2px solid #ddd; border-radius: 8px; padding: 20px; text-align: center; min-height: 300px; }}
-        .refresh-btn {{ background: #667eea; color: white; padding: 10px 20px; border: none; border-radius: 4px; cursor: pointer; }}
-        @keyframes pulse {{ 0% {{ opacity: 1; }} 50% {{ opacity: 0.5; }} 100% {{ opacity: 1; }} }}
-        .instructions {{ background: #fff3cd; border: 1px solid #ffeaa7; padding: 15px; border-radius: 4px; margin-bottom: 20px; }}
+        body { font-family: Arial, sans-serif; margin: 0; padding: 20px; background: #f5f5f5; }
+        .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 20px; border-radius: 8px; margin-bottom: 20px; }
+        .monitor-container { background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+        .job-info { background: #e8f4f8; padding: 15px; border-radius: 5px; margin-bottom: 20px; }
+        .status-indicator { display: inline-block; width: 10px; height: 10px; border-radius: 50%; margin-right: 5px; }
+        .status-running { background: #27ae60; animation: pulse 1s infinite; }
+        .status-waiting { background: #f39c12; animation: pulse 1s infinite; }
+        .status-completed { background: #3498db; }
+        .live-feed { border: 2px solid #ddd; border-radius: 8px; padding: 20px; text-align: center; min-height: 300px; }
+        .refresh-btn { background: #667eea; color: white; padding: 10px 20px; border: none; border-radius: 4px; cursor: pointer; }
+        @keyframes pulse { 0% { opacity: 1; } 50% { opacity: 0.5; } 100% { opacity: 1; } }
+        .instructions { background: #fff3cd; border: 1px solid #ffeaa7; padding: 15px; border-radius: 4px; margin-bottom: 20px; }
+        .layout { display: flex; gap: 20px; align-items: flex-start; }
+        #jobList { width: 220px; flex-shrink: 0; background: white; padding: 15px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+        #jobList ul { list-style: none; margin: 0; padding: 0; }
+        .job-tab { padding: 8px 10px; border-radius: 4px; cursor: pointer; margin-bottom: 5px; }
+        .job-tab:hover { background: #f0f0f8; }
+        .job-tab.selected { background: #667eea; color: white; }
+        .job-tab small { display: block; opacity: 0.8; }
+        #jobPanel { flex: 1; min-width: 0; }
     </style>
 </head>
 <body>
     <div class="header">
         <h1>🔍 Remote Browser Monitor</h1>
-        <p>Monitoring Job: {job_id[:8]}... - Real-time browser activity view for analysts</p>
+        <p>Monitoring Job: <span id="jobIdShort"></span>... - Real-time browser activity view for analysts</p>
     </div>
     
+    <div class="layout">
+    <aside id="jobList">
+        <h3>🗂️ Jobs</h3>
+        <ul id="jobTabs"></ul>
+    </aside>
+    
+    <main id="jobPanel">
     <div class="job-info">
         <h3>📋 Job Information</h3>
-        <p><strong>Job ID:</strong> {job_id}</p>
-        <p><strong>Target URL:</strong> {job.get('request_data', {}).get('target_url', 'N/A')}</p>
-        <p><strong>Platform:</strong> {job.get('request_data', {}).get('platform', 'N/A')}</p>
-        <p><strong>Status:</strong> <span id="jobStatus" class="status-indicator status-running"></span><span id="statusText">{job.get('status', 'unknown')}</span></p>
-        <p><strong>Progress:</strong> <span id="progressText">{job.get('progress_percentage', 0)}%</span></p>
-        <p><strong>Current Step:</strong> <span id="currentStep">{job.get('current_step', 'Processing...')}</span></p>
+        <p><strong>Job ID:</strong> <span id="jobId"></span></p>
+        <p><strong>Target URL:</strong> <span id="targetUrl">N/A</span></p>
+        <p><strong>Platform:</strong> <span id="platform">N/A</span></p>
+        <p><strong>Status:</strong> <span id="jobStatus" class="status-indicator status-running"></span><span id="statusText">unknown</span></p>
+        <p><strong>Progress:</strong> <span id="progressText">0%</span></p>
+        <p><strong>Current Step:</strong> <span id="currentStep">Processing...</span></p>
     </div>
     
     <div class="instructions">
@@ -663,6 +1337,10 @@ async def monitor_job_browser(job_id: str):
                 ⚡ Enable Fast Polling
             </button>
         </div>
+        <p id="pollingStopped" style="display: none; color: #95a5a6;">
+            ⏹️ Job finished - status polling stopped.
+            <button class="refresh-btn" onclick="resumePolling()" style="margin-left: 10px;">▶️ Resume Polling</button>
+        </p>
         
         <div class="live-feed" id="liveFeed">
             <h4>📺 Live Browser View</h4>
@@ -678,20 +1356,123 @@ async def monitor_job_browser(job_id: str):
             </div>
         </div>
     </div>
+    </main>
+    </div>
     
     <script>
+        // One window monitors every job: /monitor#<job id> (or the older
+        // /api/v1/jobs/<job id>/monitor) picks the job shown; the sidebar switches jobs
+        // over the same page, WebSocket and timers instead of opening more windows
+        const PATH_JOB_ID = window.location.pathname.startsWith('/api/v1/jobs/')
+            ? decodeURIComponent(window.location.pathname.split('/').slice(-2, -1)[0]) : '';
+        let JOB_ID = '';
+        let JOB_PATH = '';
+        
+        // Elements the handlers touch, looked up once (the script runs after the markup)
+        const els = {
+            jobIdShort: document.getElementById('jobIdShort'),
+            jobId: document.getElementById('jobId'),
+            targetUrl: document.getElementById('targetUrl'),
+            platform: document.getElementById('platform'),
+            statusText: document.getElementById('statusText'),
+            jobStatus: document.getElementById('jobStatus'),
+            progressText: document.getElementById('progressText'),
+            currentStep: document.getElementById('currentStep'),
+            img: document.getElementById('browserScreenshot'),
+            screenshotStatus: document.getElementById('screenshotStatus'),
+            activityLog: document.getElementById('activityLog'),
+            pollingStopped: document.getElementById('pollingStopped'),
+            fastPollingBtn: document.getElementById('fastPollingBtn'),
+            jobTabs: document.getElementById('jobTabs')
+        };
+        const STATUS_CLASS = {running: 'status-running', waiting_for_approval: 'status-waiting'};
+        
+        // Sidebar entries: job id -> {item, status} (the list survives reloads of this tab)
+        const jobTabs = new Map();
+        
+        function addJob(jobId) {
+            if (!jobId || jobTabs.has(jobId)) return;
+            const item = document.createElement('li');
+            item.className = 'job-tab';
+            item.textContent = `${jobId.substring(0, 8)}...`;
+            const status = document.createElement('small');
+            item.appendChild(status);
+            item.onclick = () => { window.location.hash = jobId; };
+            els.jobTabs.appendChild(item);
+            jobTabs.set(jobId, {item, status});
+            sessionStorage.setItem('monitorJobs', JSON.stringify([...jobTabs.keys()]));
+        }
+        
+        function setTabStatus(jobId, status) {
+            const tab = jobTabs.get(jobId);
+            if (tab) tab.status.textContent = status;
+        }
+        
+        function selectJob(jobId) {
+            if (!jobId || jobId === JOB_ID) return;
+            addJob(jobId);
+            if (JOB_ID) jobTabs.get(JOB_ID).item.classList.remove('selected');
+            jobTabs.get(jobId).item.classList.add('selected');
+            
+            JOB_ID = jobId;
+            JOB_PATH = `/api/v1/jobs/${encodeURIComponent(JOB_ID)}`;
+            document.title = `🔍 Browser Monitor - Job ${JOB_ID.substring(0, 8)}`;
+            els.jobIdShort.textContent = JOB_ID.substring(0, 8);
+            els.jobId.textContent = JOB_ID;
+            els.targetUrl.textContent = 'N/A';
+            els.platform.textContent = 'N/A';
+            pendingFields = null;  // merged for the previous job
+            applyJobFields({status: 'unknown', progress: 0, current_step: 'Processing...'});
+            els.img.removeAttribute('src');
+            els.img.dataset.hash = '';
+            els.screenshotStatus.textContent = '📷 Waiting for browser screenshots...';
+            els.screenshotStatus.style.color = '';
+            
+            // Move the job subscription over to the new job
+            stopPolling();
+            showPollingStopped(false);
+            const previous = ws;
+            ws = null;  // its handlers must not reconnect, start polling or show old frames
+            pendingScreenshot = null;
+            if (previous) previous.close();
+            connectWebSocket();  // its open handler resyncs the status; the image is pushed
+            logActivity(`🔍 Monitoring job ${JOB_ID.substring(0, 8)}...`);
+        }
+        
         let ws = null;
+        let lastScreenshotSeq = 0;
+        let pendingScreenshot = null;  // metadata of the binary frame that comes next
+        let screenshotUrl = null;  // object URL of the last image pushed over the WebSocket
         
-        function connectWebSocket() {{
+        function connectWebSocket() {
             const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-            ws = new WebSocket(`${{protocol}}//${{window.location.host}}/ws/job/{job_id}`);
+            const socket = new WebSocket(`${protocol}//${window.location.host}/ws/job/${encodeURIComponent(JOB_ID)}`);
+            ws = socket;
             
-            ws.onopen = function() {{
+            ws.onopen = function() {
+                if (socket !== ws) return;  // replaced by a job switch
+                lastScreenshotSeq = 0;  // sequence restarts if the server did
                 console.log('📡 Connected to job monitoring');
                 logActivity('📡 Connected to real-time monitoring');
-            }};
+                // Status and screenshots are pushed from here on - stop the fallback
+                // polling and catch up on the status (the server sends the current
+                // screenshot as the first frame, so that needs no fetch)
+                stopPolling();
+                refreshStatus();
+            };
             
-            ws.onmessage = function(event) {{
+            ws.onmessage = function(event) {
+                if (socket !== ws) return;  // replaced by a job switch
+                // Binary frame: the image announced by the preceding screenshot_update
+                if (event.data instanceof Blob) {
+                    if (pendingScreenshot) {
+                        const meta = pendingScreenshot.data || {};
+                        showScreenshot(new Blob([event.data], { type: `image/${meta.format || 'png'}` }), meta.timestamp, meta.hash);
+                        pendingScreenshot = null;
+                    }
+                    return;
+                }
+                
                 const data = JSON.parse(event.data);
                 console.log('📨 Monitor received:', data);
                 
@@ -699,444 +1480,495 @@ async def monitor_job_browser(job_id: str):
                 updateJobStatus(data);
                 
                 // Handle screenshot updates
-                if (data.update_type === 'screenshot_update') {{
-                    updateScreenshot();
+                if (data.update_type === 'screenshot_update') {
+                    // Ignore frames older than the one already shown
+                    if (data.seq <= lastScreenshotSeq) {
+                        pendingScreenshot = null;
+                        return;
+                    }
+                    lastScreenshotSeq = data.seq;
+                    pendingScreenshot = data;
                     logActivity(`📸 Browser screenshot updated`);
-                }} else {{
+                } else {
                     // Log other activity
-                    logActivity(`${{data.update_type}}: ${{data.message}}`);
-                }}
-            }};
+                    logActivity(`${data.update_type}: ${data.message}`);
+                }
+            };
             
-            ws.onclose = function() {{
+            ws.onclose = function() {
+                if (socket !== ws) return;  // replaced by a job switch
                 console.log('📡 Monitor connection closed, reconnecting...');
                 logActivity('📡 Connection lost, reconnecting...');
-                setTimeout(connectWebSocket, 3000);
-            }};
-        }}
-        
-        function updateJobStatus(data) {{
-            if (data.job_id === '{job_id}') {{
-                if (data.data && data.data.status) {{
-                    document.getElementById('statusText').textContent = data.data.status;
-                    const indicator = document.getElementById('jobStatus');
-                    indicator.className = 'status-indicator status-' + (data.data.status === 'running' ? 'running' : 
-                                          data.data.status === 'waiting_for_approval' ? 'waiting' : 'completed');
-                }}
-                if (data.data && data.data.progress !== undefined) {{
-                    document.getElementById('progressText').textContent = data.data.progress + '%';
-                }}
-                if (data.message) {{
-                    document.getElementById('currentStep').textContent = data.message;
-                }}
-            }}
-        }}
-        
-        function logActivity(message) {{
-            const log = document.getElementById('activityLog');
+                startPolling();  // keep the view updating until the push channel is back
+                setTimeout(() => { if (socket === ws) connectWebSocket(); }, 3000);
+            };
+        }
+        
+        // Patch the job fields an update says changed - no refetch of the whole job. Bursts
+        // of updates (progress ticks) are merged and applied once per animation frame
+        let pendingFields = null;
+        
+        function updateJobStatus(data) {
+            if (data.job_id !== JOB_ID || !data.data || !data.data.delta) return;
+            if (!pendingFields) {
+                pendingFields = {};
+                requestAnimationFrame(() => {
+                    const fields = pendingFields;
+                    pendingFields = null;
+                    if (fields) applyJobFields(fields);
+                });
+            }
+            Object.assign(pendingFields, data.data.delta);
+        }
+        
+        // Returns whether any shown field actually changed
+        function applyJobFields(fields) {
+            let changed = false;
+            const setText = (element, text) => {
+                if (element.textContent !== text) {
+                    element.textContent = text;
+                    changed = true;
+                }
+            };
+            if (fields.status !== undefined) {
+                jobFinished = TERMINAL_STATUSES.includes(fields.status);
+                setTabStatus(JOB_ID, fields.status);
+                setText(els.statusText, fields.status);
+                els.jobStatus.className = 'status-indicator ' + (STATUS_CLASS[fields.status] || 'status-completed');
+            }
+            if (fields.progress !== undefined) {
+                setText(els.progressText, fields.progress + '%');
+            }
+            if (fields.current_step !== undefined) {
+                setText(els.currentStep, fields.current_step || 'Processing...');
+            }
+            return changed;
+        }
+        
+        // Last LOG_SIZE activity entries as HTML strings (ring buffer, newest at logHead - 1)
+        const LOG_SIZE = 10;
+        const logBuffer = new Array(LOG_SIZE);
+        let logHead = 0;
+        let logFlushPending = false;
+        
+        function escapeHtml(text) {
+            return String(text).replace(/[&<>"']/g, ch => ({
+                '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+            })[ch]);
+        }
+        
+        function logActivity(message) {
             const timestamp = new Date().toLocaleTimeString();
-            const entry = document.createElement('p');
-            entry.innerHTML = `<strong>[${{timestamp}}]</strong> ${{message}}`;
-            log.insertBefore(entry, log.firstChild);
-            
-            // Keep only last 10 entries
-            while (log.children.length > 10) {{
-                log.removeChild(log.lastChild);
-            }}
-        }}
-        
-        async function updateScreenshot() {{
-            try {{
-                const response = await fetch('/api/v1/jobs/{job_id}/screenshot');
-                if (response.ok) {{
-                    const screenshotData = await response.json();
-                    const img = document.getElementById('browserScreenshot');
-                    const status = document.getElementById('screenshotStatus');
-                    
-                    if (screenshotData.screenshot) {{
-                        img.src = `data:image/png;base64,${{screenshotData.screenshot}}`;
-                        img.style.display = 'block';
-                        status.textContent = `📸 Screenshot updated: ${{new Date(screenshotData.timestamp).toLocaleTimeString()}}`;
-                        status.style.color = '#27ae60';
-                    }}
-                }} else if (response.status === 404) {{
-                    document.getElementById('screenshotStatus').textContent = '📷 No screenshot available yet';
-                    document.getElementById('screenshotStatus').style.color = '#95a5a6';
-                }}
-            }} catch (error) {{
+            logBuffer[logHead] = `<p><strong>[${timestamp}]</strong> ${escapeHtml(message)}</p>`;
+            logHead = (logHead + 1) % LOG_SIZE;
+            scheduleLogFlush();
+        }
+        
+        // Rewrite the log once per animation frame, however many entries arrived
+        function scheduleLogFlush() {
+            if (logFlushPending) return;
+            logFlushPending = true;
+            requestAnimationFrame(() => {
+                logFlushPending = false;
+                const parts = [];
+                for (let i = 1; i <= LOG_SIZE; i++) {
+                    const entry = logBuffer[(logHead - i + LOG_SIZE) % LOG_SIZE];
+                    if (entry) parts.push(entry);
+                }
+                els.activityLog.innerHTML = parts.join('');
+            });
+        }
+        
+        function showScreenshotStatus(timestamp) {
+            const shownAt = timestamp ? new Date(timestamp) : new Date();
+            els.screenshotStatus.textContent = `📸 Screenshot updated: ${shownAt.toLocaleTimeString()}`;
+            els.screenshotStatus.style.color = '#27ae60';
+        }
+        
+        function setScreenshotSource(src, hash) {
+            const img = els.img;
+            // Release the previous pushed frame's object URL before replacing it
+            if (screenshotUrl && screenshotUrl !== src) URL.revokeObjectURL(screenshotUrl);
+            screenshotUrl = src.startsWith('blob:') ? src : null;
+            img.src = src;
+            img.style.display = 'block';
+            img.dataset.hash = hash || '';
+        }
+        
+        function showScreenshot(blob, timestamp, hash) {
+            setScreenshotSource(URL.createObjectURL(blob), hash);
+            showScreenshotStatus(timestamp);
+        }
+        
+        // Returns whether a new image was shown
+        async function updateScreenshot() {
+            try {
+                // Poll the small metadata document; only a changed hash loads the image,
+                // which the browser then fetches and decodes natively from its own URL
+                const jobId = JOB_ID;
+                const response = await fetch(`${JOB_PATH}/screenshot/meta`);
+                if (jobId !== JOB_ID) return false;  // switched to another job meanwhile
+                if (response.ok) {
+                    const meta = await response.json();
+                    const changed = meta.hash !== els.img.dataset.hash;
+                    if (changed) {
+                        setScreenshotSource(`${JOB_PATH}/screenshot?h=${meta.hash}`, meta.hash);
+                    }
+                    showScreenshotStatus(meta.timestamp);
+                    return changed;
+                } else if (response.status === 404) {
+                    els.screenshotStatus.textContent = '📷 No screenshot available yet';
+                    els.screenshotStatus.style.color = '#95a5a6';
+                }
+            } catch (error) {
                 console.error('Screenshot update error:', error);
-                document.getElementById('screenshotStatus').textContent = '❌ Screenshot update failed';
-                document.getElementById('screenshotStatus').style.color = '#e74c3c';
-            }}
-        }}
-        
-        async function refreshStatus() {{
-            try {{
-                const response = await fetch('/api/v1/jobs/{job_id}');
-                if (response.ok) {{
+                els.screenshotStatus.textContent = '❌ Screenshot update failed';
+                els.screenshotStatus.style.color = '#e74c3c';
+            }
+            return false;
+        }
+        
+        // Full resync from the job document - used on (re)connect, by the polling
+        // fallback and by the Refresh Status button. Returns whether anything changed
+        async function refreshStatus() {
+            try {
+                const jobId = JOB_ID;
+                const response = await fetch(JOB_PATH);
+                if (jobId !== JOB_ID) return false;  // switched to another job meanwhile
+                if (response.ok) {
                     const job = await response.json();
-                    document.getElementById('statusText').textContent = job.status;
-                    document.getElementById('progressText').textContent = job.progress_percentage + '%';
-                    document.getElementById('currentStep').textContent = job.current_step || 'Processing...';
-                    logActivity(`Status refreshed: ${{job.status}} (${{job.progress_percentage}}%)`);
-                }}
-            }} catch (error) {{
+                    const requestData = job.request_data || {};
+                    els.targetUrl.textContent = requestData.target_url || 'N/A';
+                    els.platform.textContent = requestData.platform || 'N/A';
+                    const changed = applyJobFields({
+                        status: job.status,
+                        progress: job.progress_percentage,
+                        current_step: job.current_step
+                    });
+                    logActivity(`Status refreshed: ${job.status} (${job.progress_percentage}%)`);
+                    return changed;
+                }
+            } catch (error) {
                 logActivity('❌ Failed to refresh status');
-            }}
-        }}
+            }
+            return false;
+        }
         
+        // Polling is only a fallback for while the WebSocket is disconnected. Each poll
+        // schedules the next one: after QUIET_POLLS polls without a change its delay grows
+        // 1.5x (up to MAX_POLL_DELAY), and polling stops altogether once the job finished
+        const TERMINAL_STATUSES = ['completed', 'failed'];
+        const QUIET_POLLS = 3;
+        const MAX_POLL_DELAY = 30000;
         let fastPolling = false;
-        let statusInterval = null;
-        let screenshotInterval = null;
+        let polling = false;
+        let pollGeneration = 0;  // bumped on every (re)start so stale polls don't reschedule
+        let jobFinished = false;
+        const pollers = [
+            {run: refreshStatus, baseDelay: () => fastPolling ? 2000 : 5000, timer: null, delay: 0, quiet: 0},
+            {run: updateScreenshot, baseDelay: () => fastPolling ? 1000 : 3000, timer: null, delay: 0, quiet: 0}
+        ];
         
-        function startPolling() {{
-            // Clear existing intervals
-            if (statusInterval) clearInterval(statusInterval);
-            if (screenshotInterval) clearInterval(screenshotInterval);
-            
-            const statusDelay = fastPolling ? 2000 : 5000;
-            const screenshotDelay = fastPolling ? 1000 : 3000;
-            
-            statusInterval = setInterval(refreshStatus, statusDelay);
-            screenshotInterval = setInterval(updateScreenshot, screenshotDelay);
+        function stopPolling() {
+            polling = false;
+            pollGeneration++;
+            for (const poller of pollers) {
+                clearTimeout(poller.timer);
+                poller.timer = null;
+            }
+        }
+        
+        function startPolling() {
+            stopPolling();
+            if (jobFinished) {
+                showPollingStopped(true);
+                return;
+            }
+            showPollingStopped(false);
+            polling = true;
+            for (const poller of pollers) {
+                poller.delay = poller.baseDelay();
+                poller.quiet = 0;
+                poller.timer = setTimeout(() => poll(poller, pollGeneration), poller.delay);
+            }
             
-            console.log(`Polling: Status every ${{statusDelay}}ms, Screenshots every ${{screenshotDelay}}ms`);
-        }}
+            console.log(`Polling: Status every ${pollers[0].delay}ms, Screenshots every ${pollers[1].delay}ms (slower while idle)`);
+        }
+        
+        async function poll(poller, generation) {
+            poller.timer = null;
+            if (document.visibilityState === 'hidden') {
+                // Nobody is looking - keep the chain alive without fetching anything
+                poller.timer = setTimeout(() => poll(poller, generation), poller.delay);
+                return;
+            }
+            const changed = await poller.run();
+            if (generation !== pollGeneration) return;  // stopped or re-armed meanwhile
+            if (jobFinished) {
+                stopPolling();
+                showPollingStopped(true);
+                return;
+            }
+            if (changed) {
+                poller.quiet = 0;
+                poller.delay = poller.baseDelay();
+            } else if (++poller.quiet >= QUIET_POLLS) {
+                poller.delay = Math.min(poller.delay * 1.5, MAX_POLL_DELAY);
+            }
+            poller.timer = setTimeout(() => poll(poller, generation), poller.delay);
+        }
+        
+        function showPollingStopped(stopped) {
+            els.pollingStopped.style.display = stopped ? 'block' : 'none';
+        }
         
-        function toggleFastPolling() {{
+        // Back in view: catch up at once and poll at the base rate again
+        document.addEventListener('visibilitychange', () => {
+            if (document.visibilityState !== 'visible' || !polling) return;
+            startPolling();
+            refreshStatus();
+            updateScreenshot();
+        });
+        
+        function resumePolling() {
+            jobFinished = false;  // the next status poll decides again
+            startPolling();
+        }
+        
+        function toggleFastPolling() {
             fastPolling = !fastPolling;
-            const btn = document.getElementById('fastPollingBtn');
+            const btn = els.fastPollingBtn;
             
-            if (fastPolling) {{
+            if (fastPolling) {
                 btn.textContent = '🐌 Disable Fast Polling';
                 btn.style.background = '#27ae60';
                 logActivity('⚡ Fast polling enabled (1s screenshots, 2s status)');
-            }} else {{
+            } else {
                 btn.textContent = '⚡ Enable Fast Polling';
                 btn.style.background = '#f39c12';
                 logActivity('🐌 Normal polling enabled (3s screenshots, 5s status)');
-            }}
+            }
             
-            startPolling();
-        }}
+            // Only affects the fallback - re-arm it if it is currently running
+            if (polling) startPolling();
+        }
         
-        async function forceScreenshotRefresh() {{
-            try {{
-                const response = await fetch('/api/v1/jobs/{job_id}/screenshot/refresh', {{
+        async function forceScreenshotRefresh() {
+            try {
+                const response = await fetch(`${JOB_PATH}/screenshot/refresh`, {
                     method: 'POST',
-                    headers: {{'Content-Type': 'application/json'}}
-                }});
+                    headers: {'Content-Type': 'application/json'}
+                });
                 
-                if (response.ok) {{
+                if (response.ok) {
                     const result = await response.json();
                     logActivity('📸 Manual screenshot refresh requested');
                     
                     // Force immediate screenshot update after short delay
                     setTimeout(updateScreenshot, 1000);
-                }} else {{
+                } else {
                     const errorText = await response.text();
-                    logActivity(`❌ Screenshot refresh failed: ${{response.status}}`);
-                }}
-            }} catch (error) {{
-                logActivity(`❌ Screenshot refresh error: ${{error}}`);
-            }}
-        }}
+                    logActivity(`❌ Screenshot refresh failed: ${response.status}`);
+                }
+            } catch (error) {
+                logActivity(`❌ Screenshot refresh error: ${error}`);
+            }
+        }
+        
+        // Sidebar statuses of the jobs not shown come from the (receive-only) global stream
+        const jobEvents = new EventSource('/sse/global');
+        jobEvents.onmessage = function(event) {
+            const data = JSON.parse(event.data);
+            if (data.type === 'jobs_snapshot') {
+                for (const [jobId, fields] of Object.entries(data.jobs)) {
+                    if (jobId !== JOB_ID) setTabStatus(jobId, fields.status);
+                }
+            } else if (data.type === 'job_patch' && data.job_id !== JOB_ID && data.fields.status) {
+                setTabStatus(data.job_id, data.fields.status);
+            }
+        };
         
-        // Initialize
-        connectWebSocket();
-        startPolling();
+        // The dashboard adds jobs to this window instead of opening new ones
+        window.addEventListener('message', (event) => {
+            if (event.origin !== window.location.origin || !event.data || event.data.type !== 'monitorJob') return;
+            addJob(event.data.jobId);
+            if (event.data.select) window.location.hash = event.data.jobId;
+        });
+        window.addEventListener('hashchange', () => selectJob(decodeURIComponent(window.location.hash.slice(1))));
         
-        // Initial screenshot load
-        updateScreenshot();
+        // Tell the dashboard that opened this window when it goes away
+        window.addEventListener('beforeunload', () => {
+            if (window.opener && !window.opener.closed) {
+                window.opener.postMessage({ type: 'monitorClosed' }, window.location.origin);
+            }
+        });
+        
+        // Initialize: restore this tab's job list, then show the job named by the URL
+        for (const jobId of JSON.parse(sessionStorage.getItem('monitorJobs') || '[]')) addJob(jobId);
+        addJob(PATH_JOB_ID);
+        selectJob(decodeURIComponent(window.location.hash.slice(1)) || PATH_JOB_ID || jobTabs.keys().next().value);
         
         // Initial activity log
-        logActivity('🔍 Browser monitoring started for job {job_id[:8]}...');
         logActivity('💡 Tip: Use "Force Screenshot Refresh" to capture manual changes');
-        logActivity('💡 Tip: Enable "Fast Polling" for real-time updates');
+        logActivity('💡 Tip: "Fast Polling" speeds up the fallback used while the live connection is down');
     </script>
 </body>
 </html>
-    """)
+    """
+MONITOR_PAGE_BYTES = MONITOR_PAGE_HTML.encode()
+MONITOR_PAGE_COMPRESSED = precompress(MONITOR_PAGE_BYTES)
+MONITOR_PAGE_ETAG = f'"{hashlib.blake2b(MONITOR_PAGE_BYTES, digest_size=16).hexdigest()}"'
 
-# WebSocket endpoints
-@app.websocket("/ws/job/{job_id}")
-async def websocket_job_endpoint(websocket: WebSocket, job_id: str):
-    await manager.connect_job(websocket, job_id)
-    try:
-        while True:
-            await websocket.receive_text()  # Keep connection alive
-    except:
-        manager.disconnect_job(websocket, job_id)
+@app.get("/monitor", response_class=HTMLResponse)
+async def monitor(request: Request):
+    """Remote browser monitoring for analysts - one window for all jobs (/monitor#<job id>)"""
+    return html_page_response(
+        MONITOR_PAGE_BYTES, request, MONITOR_PAGE_COMPRESSED,
+        etag=MONITOR_PAGE_ETAG, cache_control="public, max-age=300"
+    )
 
-@app.websocket("/ws/global")
-async def websocket_global_endpoint(websocket: WebSocket):
+@app.get("/api/v1/jobs/{job_id}/monitor", response_class=HTMLResponse)
+async def monitor_job_browser(job_id: str, request: Request):
+    """Remote browser monitoring for analysts"""
+    if job_id not in job_manager.jobs:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return html_page_response(
+        MONITOR_PAGE_BYTES, request, MONITOR_PAGE_COMPRESSED,
+        etag=MONITOR_PAGE_ETAG, cache_control="public, max-age=300"
+    )
+
+# WebSocket endpoints
+async def wait_for_disconnect(websocket: WebSocket):
+    """Hold a push-only connection open until the client goes away
+    
+    Reads raw ASGI messages - the close arrives as a websocket.disconnect message
+    instead of an exception, and anything the client sends is dropped undecoded.
+    """
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+@app.websocket("/ws/job/{job_id}")
+async def websocket_job_endpoint(websocket: WebSocket, job_id: str):
+    await manager.connect_job(websocket, job_id)
+    screenshot_data = job_manager.job_screenshots.get(job_id)
+    if screenshot_data:
+        # Start the new monitor off with the current image over the socket itself,
+        # so it never needs an HTTP round-trip for screenshots while connected
+        manager.send_job_update(
+            websocket, job_id, "screenshot_update", "Browser screenshot updated",
+            {"screenshot_available": True, "timestamp": screenshot_data["timestamp"],
+             "format": screenshot_data["format"], "hash": screenshot_data["hash"]},
+            binary=screenshot_data["image"]
+        )
+    try:
+        await wait_for_disconnect(websocket)
+    finally:
+        manager.disconnect_job(websocket, job_id)
+
+@app.websocket("/ws/global")
+async def websocket_global_endpoint(websocket: WebSocket):
     await manager.connect_global(websocket)
+    manager.send_frame(websocket, "jobs_snapshot", job_manager.jobs_snapshot())
     try:
-        while True:
-            await websocket.receive_text()  # Keep connection alive
-    except:
+        await wait_for_disconnect(websocket)
+    finally:
         manager.disconnect_global(websocket)
 
-# Enhanced dashboard with live browser info
-@app.get("/dashboard", response_class=HTMLResponse) 
-async def dashboard():
-    return HTMLResponse(content="""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>🤖 Generic Web Form Filling Agent</title>
-    <style>
-        body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 20px; background: #f8f9fa; }
-        .container { max-width: 1200px; margin: 0 auto; }
-        .header { background: linear-gradient(135deg, #007bff 0%, #28a745 100%); color: white; padding: 25px; border-radius: 12px; margin-bottom: 25px; box-shadow: 0 4px 15px rgba(0,0,0,0.1); }
-        .alert { background: #e8f4f8; border: 1px solid #bee5eb; padding: 15px; border-radius: 5px; margin-bottom: 20px; }
-        .stats { display: flex; gap: 15px; margin-bottom: 20px; }
-        .stat-card { background: white; padding: 15px; border-radius: 8px; flex: 1; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
-        .stat-value { font-size: 24px; font-weight: bold; color: #3498db; }
-        .jobs-container { background: white; border-radius: 8px; padding: 20px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
-        .job-item { border-bottom: 1px solid #eee; padding: 15px 0; display: flex; justify-content: space-between; align-items: center; }
-        .approval-btn { padding: 8px 16px; border: none; border-radius: 4px; cursor: pointer; margin: 0 5px; }
-        .approve-btn { background: #27ae60; color: white; }
-        .reject-btn { background: #e74c3c; color: white; }
-        .submit-form { background: #f8f9fa; padding: 20px; border-radius: 8px; margin-bottom: 20px; border: 2px dashed #6c757d; }
-        .form-field { margin-bottom: 10px; }
-        .form-field input, .form-field textarea, .form-field select { width: 100%; padding: 8px; border: 1px solid #ddd; border-radius: 4px; }
-        .file-upload-area { border: 2px dashed #007bff; border-radius: 8px; padding: 20px; text-align: center; margin: 10px 0; background: #f8f9fa; transition: all 0.3s ease; }
-        .file-upload-area:hover { border-color: #28a745; background: #e8f5e9; }
-        .file-upload-area.dragover { border-color: #28a745; background: #e8f5e9; transform: scale(1.02); }
-        .uploaded-files { margin-top: 10px; }
-        .file-item { display: flex; align-items: center; justify-content: space-between; padding: 8px; margin: 4px 0; background: #e3f2fd; border-radius: 4px; border-left: 4px solid #2196f3; }
-        .file-item .file-info { display: flex; align-items: center; flex: 1; }
-        .file-item .file-icon { margin-right: 8px; font-size: 16px; }
-        .file-item .file-name { font-weight: 500; margin-right: 8px; }
-        .file-item .file-size { color: #666; font-size: 12px; }
-        .file-item .remove-file { background: #f44336; color: white; border: none; border-radius: 50%; width: 20px; height: 20px; cursor: pointer; font-size: 12px; }
-        .file-drop-text { color: #666; margin: 10px 0; }
-        .submit-btn { background: #667eea; color: white; padding: 12px 24px; border: none; border-radius: 4px; cursor: pointer; font-size: 16px; }
-        .live-indicator { display: inline-block; width: 10px; height: 10px; background: #27ae60; border-radius: 50%; margin-right: 5px; animation: pulse 1s infinite; }
-        @keyframes pulse { 0% { opacity: 1; } 50% { opacity: 0.5; } 100% { opacity: 1; } }
-        .browser-note { background: #fff3cd; border: 1px solid #ffeaa7; padding: 10px; border-radius: 4px; margin-bottom: 15px; }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🤖 Generic Web Form Filling Agent</h1>
-            <p><span class="live-indicator"></span>AI-powered form filling for any website with intelligent field detection</p>
-        </div>
-        
-        <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 15px; margin-bottom: 20px;">
-            <div style="background: #e3f2fd; padding: 15px; border-radius: 8px; border: 1px solid #2196f3;">
-                <h4 style="margin: 0 0 10px 0; color: #1976d2;">🔍 CAPTCHA Solving</h4>
-                <ul style="margin: 0; padding-left: 20px; font-size: 0.9em;">
-                    <li>Automatic CAPTCHA detection</li>
-                    <li>Supports reCAPTCHA v2/v3</li>
-                    <li>hCaptcha support</li>
-                    <li>Image CAPTCHA solving</li>
-                </ul>
-            </div>
-            <div style="background: #e8f5e9; padding: 15px; border-radius: 8px; border: 1px solid #4caf50;">
-                <h4 style="margin: 0 0 10px 0; color: #2e7d32;">📎 File Upload Automation</h4>
-                <ul style="margin: 0; padding-left: 20px; font-size: 0.9em;">
-                    <li>Auto-detect file input fields</li>
-                    <li>Upload multiple files</li>
-                    <li>Smart field mapping</li>
-                    <li>Drag & drop support</li>
-                </ul>
-            </div>
-        </div>
-        
-        <div class="browser-note">
-            <strong>🎯 Smart Form Filling!</strong> Set headless=false to watch the AI agent automatically navigate to any website, detect form fields, and fill them with your custom data using intelligent field matching.
-        </div>
-        
-        <div class="alert">
-            <h4>🔴 Auto-Monitoring Settings</h4>
-            <label>
-                <input type="checkbox" id="autoMonitorEnabled"> 
-                <strong>Auto-open monitor windows for active/pending jobs</strong>
-            </label>
-            <p><small>When enabled, monitoring windows will automatically open for running and pending jobs. You can manually open monitors using the buttons below.</small></p>
-        </div>
-        
-        <div class="submit-form">
-            <h3>📝 Generic Form Filling Request</h3>
-            <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
-                <div>
-                    <h4>🎯 Target Form Information</h4>
-                    <div class="form-field">
-                        <label>Target Form URL:</label>
-                        <input type="text" id="targetUrl" placeholder="https://example.com/contact" value="https://httpbin.org/forms/post">
-                    </div>
-                    <div class="form-field">
-                        <label>Website/Platform Name:</label>
-                        <input type="text" id="platform" placeholder="Company Name, Website, etc." value="Example Website">
-                    </div>
-                    <div class="form-field">
-                        <label>Form Type/Purpose:</label>
-                        <select id="formType">
-                            <option value="contact">Contact Form</option>
-                            <option value="support">Support Request</option>
-                            <option value="inquiry">General Inquiry</option>
-                            <option value="feedback">Feedback/Review</option>
-                            <option value="application">Application Form</option>
-                            <option value="registration">Registration Form</option>
-                            <option value="complaint">Complaint Form</option>
-                            <option value="quote">Quote Request</option>
-                            <option value="other">Other</option>
-                        </select>
-                    </div>
-                    <div class="form-field">
-                        <label>Priority Level:</label>
-                        <select id="priority">
-                            <option value="normal">Normal</option>
-                            <option value="high">High</option>
-                            <option value="urgent">Urgent</option>
-                            <option value="low">Low</option>
-                        </select>
-                    </div>
-                </div>
-                <div>
-                    <h4>👤 Your Information</h4>
-                    <div class="form-field">
-                        <label>Full Name:</label>
-                        <input type="text" id="contactName" placeholder="John Doe" value="John Smith">
-                    </div>
-                    <div class="form-field">
-                        <label>Email Address:</label>
-                        <input type="email" id="contactEmail" placeholder="john@example.com" value="john@example.com">
-                    </div>
-                    <div class="form-field">
-                        <label>Phone Number:</label>
-                        <input type="tel" id="contactPhone" placeholder="+1-555-123-4567" value="">
-                    </div>
-                    <div class="form-field">
-                        <label>Company/Organization:</label>
-                        <input type="text" id="company" placeholder="Your Company Name" value="Example Corp">
-                    </div>
-                    <div class="form-field">
-                        <label>Your Role/Title:</label>
-                        <input type="text" id="jobTitle" placeholder="Manager, Developer, etc." value="">
-                    </div>
-                </div>
-            </div>
-            <div class="form-field">
-                <label>Subject/Title:</label>
-                <input type="text" id="subject" placeholder="Brief subject line for your message" value="General Inquiry">
-            </div>
-            <div class="form-field">
-                <label>Main Message:</label>
-                <textarea id="description" placeholder="Please provide your detailed message, inquiry, or request. This will be used to fill the main message/description field on the target form." rows="4">Hello, I am reaching out regarding your services. Could you please provide more information about your offerings? Thank you for your time.</textarea>
-            </div>
-            <div class="form-field">
-                <label>Reference URLs (comma-separated):</label>
-                <input type="text" id="referenceUrls" placeholder="https://reference1.com, https://reference2.com" value="">
-            </div>
-            <div class="form-field">
-                <label>Additional Notes:</label>
-                <textarea id="additionalComments" placeholder="Any additional information or special instructions for form filling" rows="2"></textarea>
-            </div>
-            <div class="form-field">
-                <label>📎 File Attachments (TXT, PDF, Images):</label>
-                <div style="margin-bottom: 10px; padding: 10px; background: #e8f5e9; border-radius: 8px; border: 1px solid #4caf50;">
-                    <strong style="color: #2e7d32;">🚀 Enhanced File Upload Features:</strong>
-                    <ul style="margin: 5px 0; padding-left: 20px; font-size: 0.9em; color: #2e7d32;">
-                        <li>✅ Direct file upload to our server</li>
-                        <li>✅ Automatic file upload to web forms via browser automation</li>
-                        <li>✅ Intelligent file input field detection</li>
-                        <li>✅ Multi-file upload support</li>
-                    </ul>
-                </div>
-                <div class="file-upload-area" id="fileUploadArea">
-                    <div class="file-drop-text">
-                        <strong>📁 Drop files here or click to upload</strong><br>
-                        <small>Supported: .txt, .pdf, .jpg, .png, .gif (Max 10MB each)</small><br>
-                        <small style="color: #4caf50;">Files will be automatically uploaded to form fields when detected</small>
-                    </div>
-                    <input type="file" id="fileInput" multiple accept=".txt,.pdf,.jpg,.jpeg,.png,.gif" style="display: none;">
-                    <button type="button" onclick="document.getElementById('fileInput').click()" style="margin-top: 10px; padding: 10px 20px; background: #007bff; color: white; border: none; border-radius: 4px; cursor: pointer;">
-                        📎 Choose Files
-                    </button>
-                </div>
-                <div class="uploaded-files" id="uploadedFiles"></div>
-            </div>
-            <div class="form-field">
-                <label>🚀 Browser Engine:</label>
-                <select id="browserEngine" style="width: 100%; padding: 12px; border: 1px solid #ddd; border-radius: 4px; font-size: 16px;" onchange="togglePuppeteerOptions()">
-                    <option value="browser-use" selected>Browser-Use (AI-Powered)</option>
-                    <option value="puppeteer">Puppeteer (CDP)</option>
-                </select>
-                <small style="color: #666; display: block; margin-top: 5px;">
-                    Browser-Use: AI-powered form filling with smart field detection<br>
-                    Puppeteer: Direct browser control via Chrome DevTools Protocol
-                </small>
-                
-                <div id="puppeteerOptions" style="display: none; margin-top: 10px; padding: 10px; background: #f0f0f0; border-radius: 4px;">
-                    <label style="display: flex; align-items: center;">
-                        <input type="checkbox" id="managePuppeteerServer" checked style="margin-right: 8px;">
-                        <span>🤖 Automatically manage Puppeteer server</span>
-                    </label>
-                    <small style="color: #666; display: block; margin-top: 5px; margin-left: 24px;">
-                        When checked, the Python agent will automatically start and stop the Node.js Puppeteer server
-                    </small>
-                </div>
-            </div>
-            <div class="form-field">
-                <label>
-                    <input type="checkbox" id="headless"> Run in headless mode (no visible browser)
-                </label>
-            </div>
-            <button class="submit-btn" onclick="submitFormFillingRequest()">🤖 Start Form Filling</button>
-        </div>
-        
-        <div class="stats">
-            <div class="stat-card">
-                <div class="stat-value" id="activeJobs">-</div>
-                <div>🔄 Active Jobs</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-value" id="pendingApprovals">-</div>
-                <div>⏳ Pending Approvals</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-value" id="completedJobs">-</div>
-                <div>✅ Completed</div>
-            </div>
-        </div>
-        
-        <div class="jobs-container">
-            <h3>🎬 Live Jobs</h3>
-            <div id="jobsList">Loading...</div>
-        </div>
-    </div>
+# Server-Sent Events endpoints - for clients that only receive (the dashboard).
+# A plain streaming response holds far less per-connection state than a WebSocket,
+# and EventSource reconnects by itself. Binary frames (screenshot images) are not
+# sent; subscribers load the announced image from /screenshot?h=<hash> instead.
+EVENT_STREAM_RETRY_MS = 3000
+EVENT_STREAM_KEEPALIVE_SECONDS = 15
+EVENT_STREAM_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+async def event_stream(subscribe: Callable[[], Outbox], unsubscribe: Callable[[Outbox], None]):
+    """Yield a subscriber's queued updates as SSE messages until it goes away
     
-    <script>
-        // WebSocket for real-time updates
-        let ws = null;
+    Frames are already single-line JSON, so each becomes one data: line. Idle
+    streams get a comment line now and then, which also surfaces dead clients.
+    The subscription is opened only once the response starts streaming, in the same
+    try/finally that closes it - a client gone before that never registers at all.
+    """
+    outbox = subscribe()
+    try:
+        yield f"retry: {EVENT_STREAM_RETRY_MS}\n\n".encode()
+        while True:
+            try:
+                frame = await asyncio.wait_for(outbox.get(), EVENT_STREAM_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            if frame is None:
+                return  # server shutting down
+            yield f"data: {frame[1]}\n\n".encode()
+    finally:
+        unsubscribe(outbox)
+
+@app.get("/sse/job/{job_id}")
+async def sse_job_endpoint(job_id: str):
+    if job_id not in job_manager.jobs:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return StreamingResponse(
+        event_stream(lambda: manager.open_job_stream(job_id),
+                     lambda outbox: manager.disconnect_job(outbox, job_id)),
+        media_type="text/event-stream", headers=EVENT_STREAM_HEADERS
+    )
+
+def open_dashboard_stream() -> Outbox:
+    """Subscribe to global updates, starting with the job list to build on"""
+    outbox = manager.open_global_stream()
+    # job_patch frames keep the snapshot current from here on
+    manager.send_frame(outbox, "jobs_snapshot", job_manager.jobs_snapshot())
+    return outbox
+
+@app.get("/sse/global")
+async def sse_global_endpoint():
+    return StreamingResponse(
+        event_stream(open_dashboard_stream, manager.disconnect_global),
+        media_type="text/event-stream", headers=EVENT_STREAM_HEADERS
+    )
+
+# Enhanced dashboard with live browser info
+# The dashboard is fully static - its scripts are served from content-hashed paths that
+# browsers cache for good, and page and scripts are encoded and compressed once at import
+DASHBOARD_SCRIPT = """
+        // Server-Sent Events stream for real-time updates (the dashboard only listens).
+        // The server starts each stream with a jobs_snapshot and then sends a job_patch
+        // for every change, so the job list is kept without polling
+        let events = null;
         
-        function connectWebSocket() {
-            const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-            ws = new WebSocket(`${protocol}//${window.location.host}/ws/global`);
+        function connectEventStream() {
+            events = new EventSource('/sse/global');
             
-            ws.onopen = function() {
+            events.onopen = function() {
                 console.log('📡 Connected to live updates');
             };
             
-            ws.onmessage = function(event) {
+            events.onmessage = function(event) {
                 const data = JSON.parse(event.data);
                 console.log('📨 Received:', data);
                 
-                // Immediately refresh jobs on any update
-                loadJobs();
+                if (data.type === 'jobs_snapshot') {
+                    replaceJobs(data.jobs);
+                    return;
+                }
+                if (data.type === 'job_patch') {
+                    patchJob(data.job_id, data.fields);
+                    return;
+                }
                 
-                // Show live notifications for important events
+                // Show live notifications for important events right away
                 if (data.update_type === 'approval_required') {
                     const jobId = data.job_id ? data.job_id.substring(0, 8) : 'Unknown';
                     showNotification(`🔔 Job ${jobId} needs approval!`, 'warning');
                     
                     // Auto-open monitor if enabled and not already open
-                    if (document.getElementById('autoMonitorEnabled').checked && data.job_id && !monitorWindows.has(data.job_id)) {
-                        setTimeout(() => openMonitorWindow(data.job_id), 1500);
+                    if (document.getElementById('autoMonitorEnabled').checked && data.job_id && !monitoredJobs.has(data.job_id)) {
+                        setTimeout(() => openMonitorWindow(data.job_id, false), 1500);
                     }
                 } else if (data.update_type === 'completion') {
                     const jobId = data.job_id ? data.job_id.substring(0, 8) : 'Unknown';
@@ -1146,74 +1978,227 @@ async def dashboard():
                     showNotification(`🚀 Job ${jobId} started!`, 'info');
                     
                     // Auto-open monitor for newly running job if enabled
-                    if (document.getElementById('autoMonitorEnabled').checked && data.job_id && !monitorWindows.has(data.job_id)) {
-                        setTimeout(() => openMonitorWindow(data.job_id), 1000);
+                    if (document.getElementById('autoMonitorEnabled').checked && data.job_id && !monitoredJobs.has(data.job_id)) {
+                        setTimeout(() => openMonitorWindow(data.job_id, false), 1000);
                     }
                 }
             };
             
-            ws.onclose = function() {
-                console.log('📡 Connection closed, reconnecting...');
-                setTimeout(connectWebSocket, 3000);
+            // EventSource reconnects on its own (after the server's retry: delay) and
+            // then gets a fresh snapshot; meanwhile resync once over HTTP
+            events.onerror = function() {
+                console.log('📡 Connection lost, reconnecting...');
+                // A hidden tab catches up when it is shown again instead
+                if (document.visibilityState === 'visible') loadJobs();
             };
         }
         
+        // Dashboard job list: job id -> listed fields (plus a revision bumped per patch).
+        // It is virtualized: only the fixed-height rows in view (and OVERSCAN around them)
+        // are in the DOM, recycled as the list scrolls, so cost follows what is visible
+        const jobsById = new Map();
+        const jobOrder = [];  // job ids in list order
+        const ROW_HEIGHT = 120;  // px - keep in sync with #jobsWindow .job-item
+        const OVERSCAN = 5;
+        const rowSlots = [];  // row elements for the rendered positions, reused
+        let renderPending = false;
+        let jobsChanged = false;  // stats need recounting (not just a scroll)
+        
+        const statusEmoji = {
+            'queued': '⏳',
+            'running': '🔄',
+            'waiting_for_approval': '⏸️',
+            'approved': '✅',
+            'rejected': '❌',
+            'completed': '🎉',
+            'failed': '💥'
+        };
+        
+        function replaceJobs(jobs) {
+            jobsById.clear();
+            jobOrder.length = 0;
+            for (const [jobId, fields] of Object.entries(jobs)) patchJob(jobId, fields);
+            jobsChanged = true;
+            scheduleRender();  // also for an empty list
+        }
+        
+        function patchJob(jobId, fields) {
+            let job = jobsById.get(jobId);
+            if (!job) {
+                job = {rev: 0};
+                jobsById.set(jobId, job);
+                jobOrder.push(jobId);
+            }
+            Object.assign(job, fields);
+            job.rev++;
+            jobsChanged = true;
+            scheduleRender();
+        }
+        
+        // Render at most once per animation frame, whether for patches or scrolling
+        function scheduleRender() {
+            if (renderPending) return;
+            renderPending = true;
+            requestAnimationFrame(() => {
+                renderPending = false;
+                renderJobs();
+            });
+        }
+        
+        function renderJobs() {
+            const list = document.getElementById('jobsList');
+            document.getElementById('jobsSpacer').style.height = `${jobOrder.length * ROW_HEIGHT}px`;
+            document.getElementById('noJobs').style.display = jobOrder.length ? 'none' : 'block';
+            
+            // Rows [start, end) are materialized; a row is only refilled when its slot now
+            // shows another job or its job changed since the slot was last filled
+            const start = Math.max(0, Math.floor(list.scrollTop / ROW_HEIGHT) - OVERSCAN);
+            const end = Math.min(jobOrder.length, Math.ceil((list.scrollTop + list.clientHeight) / ROW_HEIGHT) + OVERSCAN);
+            const jobsWindow = document.getElementById('jobsWindow');
+            jobsWindow.style.transform = `translateY(${start * ROW_HEIGHT}px)`;
+            for (let i = start; i < end; i++) {
+                let row = rowSlots[i - start];
+                if (!row) {
+                    row = createJobRow();
+                    rowSlots.push(row);
+                    jobsWindow.appendChild(row);
+                }
+                const jobId = jobOrder[i];
+                const job = jobsById.get(jobId);
+                if (row.dataset.jobId !== jobId || row.rev !== job.rev) {
+                    row.rev = job.rev;
+                    fillJobRow(row, jobId, job);
+                }
+            }
+            while (rowSlots.length > Math.max(0, end - start)) rowSlots.pop().remove();
+            
+            if (!jobsChanged) return;  // scrolled only
+            jobsChanged = false;
+            let activeCount = 0, pendingCount = 0, completedCount = 0;
+            for (const job of jobsById.values()) {
+                if (job.status === 'running') activeCount++;
+                if (job.status === 'waiting_for_approval') pendingCount++;
+                if (job.status === 'completed') completedCount++;
+            }
+            document.getElementById('activeJobs').textContent = activeCount;
+            document.getElementById('pendingApprovals').textContent = pendingCount;
+            document.getElementById('completedJobs').textContent = completedCount;
+            
+            // Auto-trigger monitoring for active jobs
+            setTimeout(autoOpenMonitorForActiveJobs, 500);
+        }
+        
+        // Build a row's nodes once; fillJobRow then only touches the parts whose value
+        // changed, so patches never reparse the row or reset its buttons
+        function createJobRow() {
+            const row = document.createElement('div');
+            row.className = 'job-item';
+            const info = row.appendChild(document.createElement('div'));
+            const small = () => {
+                info.appendChild(document.createElement('br'));
+                return info.appendChild(document.createElement('small'));
+            };
+            row.titleEl = info.appendChild(document.createElement('strong'));
+            row.statusEl = small();
+            row.stepEl = small();
+            row.urlEl = small();
+            
+            const actions = row.appendChild(document.createElement('div'));
+            const button = (className, label, onclick) => {
+                const btn = actions.appendChild(document.createElement('button'));
+                btn.className = `approval-btn ${className}`;
+                btn.textContent = label;
+                btn.onclick = () => onclick(row.dataset.jobId);
+                return btn;
+            };
+            row.liveBtn = button('', '🔴 LIVE Monitor', jobId => openMonitorWindow(jobId));
+            row.liveBtn.style.cssText = 'background: #e74c3c; color: white; margin-right: 5px;';
+            row.viewBtn = button('', '🔍 View Monitor', jobId => window.open(`/api/v1/jobs/${jobId}/monitor`, '_blank'));
+            row.viewBtn.style.cssText = 'background: #3498db; color: white; margin-right: 5px;';
+            row.approveBtn = button('approve-btn', '✅ Approve', jobId => approveJob(jobId, true));
+            row.rejectBtn = button('reject-btn', '❌ Reject', jobId => approveJob(jobId, false));
+            row.shown = {};
+            return row;
+        }
+        
+        function fillJobRow(row, jobId, job) {
+            const set = (key, value, apply) => {
+                if (row.shown[key] !== value) {
+                    row.shown[key] = value;
+                    apply(value);
+                }
+            };
+            const active = job.status === 'running' || job.status === 'waiting_for_approval';
+            row.dataset.jobId = jobId;
+            row.dataset.jobStatus = job.status;
+            set('title', `${statusEmoji[job.status] || '📋'} ${jobId.substring(0, 8)}...`, v => { row.titleEl.textContent = v; });
+            set('status', `Status: ${job.status} (${job.progress}%)`, v => { row.statusEl.textContent = v; });
+            set('step', `📝 ${job.current_step || 'Processing...'}`, v => { row.stepEl.textContent = v; });
+            set('url', `🌐 ${job.target_url || ''}`, v => { row.urlEl.textContent = v; });
+            set('active', active, v => {
+                row.liveBtn.hidden = !v;
+                row.viewBtn.hidden = v;
+            });
+            set('approval', job.status === 'waiting_for_approval', v => {
+                row.approveBtn.hidden = !v;
+                row.rejectBtn.hidden = !v;
+            });
+        }
+        
+        // Notifications stack in one container and expire through their CSS animation
+        // (no timers); only the newest MAX_NOTIFICATIONS are kept on screen
+        const MAX_NOTIFICATIONS = 5;
+        const NOTIFICATION_COLORS = {success: '#27ae60', warning: '#f39c12', error: '#e74c3c', info: '#3498db'};
+        
         function showNotification(message, type = 'info') {
-            // Create notification element
+            const container = document.getElementById('notifContainer');
             const notification = document.createElement('div');
-            notification.style.cssText = `
-                position: fixed; top: 20px; right: 20px; z-index: 1000;
-                padding: 15px 20px; border-radius: 8px; color: white;
-                font-weight: bold; box-shadow: 0 4px 8px rgba(0,0,0,0.3);
-                background: ${type === 'success' ? '#27ae60' : type === 'warning' ? '#f39c12' : '#3498db'};
-                transition: all 0.3s ease;
-            `;
+            notification.className = 'notif';
+            notification.style.background = NOTIFICATION_COLORS[type] || NOTIFICATION_COLORS.info;
             notification.textContent = message;
+            notification.addEventListener('animationend', () => notification.remove());
             
-            document.body.appendChild(notification);
-            
-            // Auto-remove after 5 seconds
-            setTimeout(() => {
-                if (notification.parentNode) {
-                    notification.style.transform = 'translateX(100%)';
-                    setTimeout(() => notification.remove(), 300);
-                }
-            }, 5000);
+            container.appendChild(notification);
+            while (container.childElementCount > MAX_NOTIFICATIONS) container.firstElementChild.remove();
         }
         
-        // Monitor window management
-        const monitorWindows = new Map();
+        // Monitor window management - every job is monitored in one window (/monitor),
+        // so each extra job costs a sidebar entry there rather than a whole new page
+        let monitorWindow = null;
+        const monitoredJobs = new Set();  // jobs added to that window
+        
+        // The monitor window posts 'monitorClosed' as it unloads
+        window.addEventListener('message', (event) => {
+            if (event.origin !== window.location.origin || !event.data || event.data.type !== 'monitorClosed') return;
+            const closingWindow = monitorWindow;
+            // A reload unloads the page too - forget the window only once it is really closed
+            setTimeout(() => {
+                if (closingWindow && closingWindow.closed && monitorWindow === closingWindow) {
+                    monitorWindow = null;
+                    monitoredJobs.clear();
+                }
+            }, 500);
+        });
         
-        function openMonitorWindow(jobId) {
-            // Close existing monitor window for this job if it exists
-            if (monitorWindows.has(jobId)) {
-                const existingWindow = monitorWindows.get(jobId);
-                if (existingWindow && !existingWindow.closed) {
-                    existingWindow.focus();
+        // select=false only adds the job to the monitor's sidebar (auto-open), so the job
+        // an analyst is watching is not switched away under them
+        function openMonitorWindow(jobId, select = true) {
+            if (monitorWindow && !monitorWindow.closed) {
+                monitorWindow.postMessage({ type: 'monitorJob', jobId, select }, window.location.origin);
+                if (select) monitorWindow.focus();
+            } else {
+                const windowFeatures = 'width=1200,height=800,scrollbars=yes,resizable=yes,toolbar=no,menubar=no';
+                monitorWindow = window.open(`/monitor#${encodeURIComponent(jobId)}`, 'jobMonitor', windowFeatures);
+                if (!monitorWindow) {
+                    showNotification('❌ Failed to open monitor window. Check popup blocker.', 'warning');
                     return;
                 }
+                monitoredJobs.clear();
             }
             
-            // Open new monitor window
-            const monitorUrl = `/api/v1/jobs/${jobId}/monitor`;
-            const windowFeatures = 'width=1200,height=800,scrollbars=yes,resizable=yes,toolbar=no,menubar=no';
-            const monitorWindow = window.open(monitorUrl, `monitor_${jobId}`, windowFeatures);
-            
-            if (monitorWindow) {
-                monitorWindows.set(jobId, monitorWindow);
-                
-                // Clean up when window is closed
-                const checkClosed = setInterval(() => {
-                    if (monitorWindow.closed) {
-                        monitorWindows.delete(jobId);
-                        clearInterval(checkClosed);
-                    }
-                }, 1000);
-                
-                showNotification(`🔴 Monitoring window opened for job ${jobId.substring(0, 8)}`, 'info');
-            } else {
-                showNotification('❌ Failed to open monitor window. Check popup blocker.', 'warning');
-            }
+            // Removed again when the window reports it is closing (see 'message' above)
+            monitoredJobs.add(jobId);
+            showNotification(`🔴 Monitoring job ${jobId.substring(0, 8)}`, 'info');
         }
         
         function autoOpenMonitorForActiveJobs() {
@@ -1223,17 +2208,15 @@ async def dashboard():
                 return;
             }
             
-            // Auto-open monitor windows for newly active jobs
-            const activeJobs = document.querySelectorAll('[data-job-status="running"], [data-job-status="waiting_for_approval"]');
-            
-            activeJobs.forEach(jobElement => {
-                const jobId = jobElement.getAttribute('data-job-id');
-                if (jobId && !monitorWindows.has(jobId)) {
+            // Auto-open monitor windows for newly active jobs (from the job map - the
+            // virtualized list only has the rows in view in the DOM)
+            for (const [jobId, job] of jobsById) {
+                if ((job.status === 'running' || job.status === 'waiting_for_approval') && !monitoredJobs.has(jobId)) {
                     // Check if this is a newly active job (not already monitored)
                     console.log(`🔴 Auto-opening monitor for active job: ${jobId.substring(0, 8)}`);
-                    setTimeout(() => openMonitorWindow(jobId), 1000); // Small delay to avoid overwhelming
+                    setTimeout(() => openMonitorWindow(jobId, false), 1000); // Small delay to avoid overwhelming
                 }
-            });
+            }
         }
         
         async function submitFormFillingRequest() {
@@ -1283,7 +2266,6 @@ async def dashboard():
                 alert('🤖 Form filling request submitted! Job ID: ' + result.job_id + '\\n\\n' + 
                       'The AI agent will automatically navigate to the target form and intelligently fill it with your information.\\n' +
                       (data.headless ? 'Running in headless mode - check the monitor for progress.' : 'Watch the browser window to see the smart form filling in action!'));
-                loadJobs();
             } catch (error) {
                 alert('❌ Error submitting form filling request: ' + error);
             }
@@ -1303,7 +2285,6 @@ async def dashboard():
                 
                 if (response.ok) {
                     alert(approved ? '✅ Job approved! Browser will continue.' : '❌ Job rejected.');
-                    loadJobs();
                 } else {
                     alert('Error processing approval');
                 }
@@ -1312,84 +2293,38 @@ async def dashboard():
             }
         }
         
-        async function loadJobs() {
+        // One-shot resync over HTTP - only for while the live stream is down. A single
+        // request returns the listed unfinished jobs and everything pending approval
+        // Single-flight: a resync requested while one is running joins it, so a slow
+        // backend never has several of them stacked up
+        let loadJobsInFlight = null;
+        
+        function loadJobs() {
+            if (!loadJobsInFlight) {
+                loadJobsInFlight = fetchJobs().finally(() => { loadJobsInFlight = null; });
+            }
+            return loadJobsInFlight;
+        }
+        
+        async function fetchJobs() {
             try {
                 console.log('🔄 Loading jobs...');
-                // Get pending approvals
-                const pendingResponse = await fetch('/api/v1/approval/pending');
-                const pending = await pendingResponse.json();
-                console.log('📋 Pending approvals:', pending);
-                document.getElementById('pendingApprovals').textContent = pending.length;
-                
-                // Show all jobs (for demo, showing pending ones)
-                let html = '';
-                let completedCount = 0;
-                let activeCount = 0;
-                
-                console.log('📋 Processing', pending.length, 'pending jobs');
-                
-                for (const jobId of pending) {
-                    console.log('🔍 Fetching job details for:', jobId);
-                    const jobResponse = await fetch(`/api/v1/jobs/${jobId}`);
-                    console.log('📊 Job response status:', jobResponse.status);
-                    
-                    if (!jobResponse.ok) {
-                        console.error('❌ Failed to fetch job:', jobId, jobResponse.status);
-                        continue;
-                    }
-                    
-                    const job = await jobResponse.json();
-                    console.log('📋 Job data:', job);
-                    
-                    if (job.status === 'running') activeCount++;
-                    if (job.status === 'completed') completedCount++;
-                    
-                    const statusEmoji = {
-                        'queued': '⏳',
-                        'running': '🔄',
-                        'waiting_for_approval': '⏸️',
-                        'approved': '✅',
-                        'rejected': '❌',
-                        'completed': '🎉',
-                        'failed': '💥'
-                    };
-                    
-                    html += `
-                        <div class="job-item" data-job-id="${jobId}" data-job-status="${job.status}">
-                            <div>
-                                <strong>${statusEmoji[job.status] || '📋'} ${jobId.substring(0, 8)}...</strong><br>
-                                <small>Status: ${job.status} (${job.progress_percentage}%)</small><br>
-                                <small>📝 ${job.current_step || 'Processing...'}</small><br>
-                                <small>🌐 ${job.request_data.target_url}</small>
-                            </div>
-                            <div>
-                                ${(job.status === 'running' || job.status === 'waiting_for_approval') ? `
-                                    <button class="approval-btn" style="background: #e74c3c; color: white; margin-right: 5px;" 
-                                            onclick="openMonitorWindow('${jobId}')">
-                                        🔴 LIVE Monitor
-                                    </button>
-                                ` : `
-                                    <button class="approval-btn" style="background: #3498db; color: white; margin-right: 5px;" 
-                                            onclick="window.open('/api/v1/jobs/${jobId}/monitor', '_blank')">
-                                        🔍 View Monitor
-                                    </button>
-                                `}
-                                ${job.status === 'waiting_for_approval' ? `
-                                    <button class="approval-btn approve-btn" onclick="approveJob('${jobId}', true)">✅ Approve</button>
-                                    <button class="approval-btn reject-btn" onclick="approveJob('${jobId}', false)">❌ Reject</button>
-                                ` : ''}
-                            </div>
-                        </div>
-                    `;
+                const ids = [...jobsById].filter(([, job]) => !['completed', 'failed'].includes(job.status)).map(([jobId]) => jobId);
+                const response = await fetch(`/api/v1/jobs?ids=${encodeURIComponent(ids.join(','))}`);
+                if (!response.ok) {
+                    console.error('❌ Failed to load jobs:', response.status);
+                    return;
                 }
                 
-                document.getElementById('jobsList').innerHTML = html || '<p>No active jobs</p>';
-                document.getElementById('activeJobs').textContent = activeCount;
-                document.getElementById('completedJobs').textContent = completedCount;
-                
-                // Auto-trigger monitoring for active jobs
-                setTimeout(autoOpenMonitorForActiveJobs, 500);
-                
+                const {jobs} = await response.json();
+                for (const [jobId, job] of Object.entries(jobs)) {
+                    patchJob(jobId, {
+                        status: job.status,
+                        progress: job.progress_percentage,
+                        current_step: job.current_step,
+                        target_url: job.request_data.target_url
+                    });
+                }
             } catch (error) {
                 console.error('Error loading jobs:', error);
             }
@@ -1404,6 +2339,24 @@ async def dashboard():
             options.style.display = engine === 'puppeteer' ? 'block' : 'none';
         }
         
+        // Initialize (the upload form is wired up by the upload script, which runs next)
+        connectEventStream();
+        document.getElementById('jobsList').addEventListener('scroll', scheduleRender, {passive: true});
+        
+        // Resync when the window gains focus or is shown while the live stream is down
+        window.addEventListener('focus', () => {
+            if (events.readyState !== EventSource.OPEN) loadJobs();
+        });
+        document.addEventListener('visibilitychange', () => {
+            if (document.visibilityState === 'visible' && events.readyState !== EventSource.OPEN) loadJobs();
+        });
+"""
+DASHBOARD_SCRIPT_PATH = static_script("dashboard", DASHBOARD_SCRIPT)
+
+# File upload form: drag and drop, batch upload and the uploaded files list. Not needed
+# for the live job list, so it (deferred, like the main script) is parsed after that
+# script has opened the event stream
+DASHBOARD_UPLOAD_SCRIPT = """
         function setupFileUpload() {
             const fileInput = document.getElementById('fileInput');
             const fileUploadArea = document.getElementById('fileUploadArea');
@@ -1431,21 +2384,20 @@ async def dashboard():
         }
         
         async function handleFileSelect(event) {
-            const files = Array.from(event.target.files);
-            
-            for (const file of files) {
+            const files = Array.from(event.target.files).filter(file => {
                 if (file.size > 10 * 1024 * 1024) { // 10MB limit
                     alert(`File "${file.name}" is too large. Maximum size is 10MB.`);
-                    continue;
+                    return false;
                 }
                 
                 if (!isValidFileType(file)) {
                     alert(`File "${file.name}" is not supported. Please use TXT, PDF, JPG, PNG, or GIF files.`);
-                    continue;
+                    return false;
                 }
-                
-                await uploadFile(file);
-            }
+                return true;
+            });
+            
+            if (files.length > 0) await uploadFiles(files);
             
             // Clear file input
             document.getElementById('fileInput').value = '';
@@ -1457,36 +2409,38 @@ async def dashboard():
                    ['.txt', '.pdf', '.jpg', '.jpeg', '.png', '.gif'].some(ext => file.name.toLowerCase().endsWith(ext));
         }
         
-        async function uploadFile(file) {
+        // All selected files go up in one multipart request
+        async function uploadFiles(files) {
             const formData = new FormData();
-            formData.append('file', file);
+            files.forEach(file => formData.append('files', file));
+            const names = files.map(file => file.name).join(', ');
             
             try {
-                showNotification(`📤 Uploading ${file.name}...`, 'info');
+                showNotification(`📤 Uploading ${names}...`, 'info');
                 
-                const response = await fetch('/api/v1/files/upload', {
+                const response = await fetch('/api/v1/files/upload/batch', {
                     method: 'POST',
                     body: formData
                 });
                 
                 if (response.ok) {
                     const result = await response.json();
-                    uploadedFiles.push({
-                        id: result.file_id,
-                        name: file.name,
-                        size: file.size,
-                        type: file.type,
-                        url: result.file_url
-                    });
+                    result.files.forEach((info, i) => uploadedFiles.push({
+                        id: info.file_id,
+                        name: files[i].name,
+                        size: files[i].size,
+                        type: files[i].type,
+                        url: info.file_url
+                    }));
                     
                     updateFilesList();
-                    showNotification(`✅ ${file.name} uploaded successfully!`, 'success');
+                    showNotification(`✅ ${names} uploaded successfully!`, 'success');
                 } else {
                     throw new Error(`Upload failed: ${response.statusText}`);
                 }
             } catch (error) {
                 console.error('File upload error:', error);
-                showNotification(`❌ Failed to upload ${file.name}: ${error.message}`, 'error');
+                showNotification(`❌ Failed to upload ${names}: ${error.message}`, 'error');
             }
         }
         
@@ -1531,43 +2485,287 @@ async def dashboard():
             showNotification('🗑️ File removed', 'info');
         }
         
-        function showNotification(message, type) {
-            // Simple notification system
-            const notification = document.createElement('div');
-            notification.style.cssText = `
-                position: fixed; top: 20px; right: 20px; z-index: 1000;
-                padding: 12px 20px; border-radius: 4px; color: white; font-weight: bold;
-                background: ${type === 'error' ? '#f44336' : type === 'success' ? '#4caf50' : '#2196f3'};
-                box-shadow: 0 2px 8px rgba(0,0,0,0.2);
-            `;
-            notification.textContent = message;
-            document.body.appendChild(notification);
-            
-            setTimeout(() => {
-                if (notification.parentElement) {
-                    notification.parentElement.removeChild(notification);
-                }
-            }, 4000);
-        }
-
-        // Initialize
         setupFileUpload();
-        connectWebSocket();
-        loadJobs();
-        setInterval(loadJobs, 1000); // More frequent refresh for real-time feel
+"""
+DASHBOARD_UPLOAD_SCRIPT_PATH = static_script("dashboard-upload", DASHBOARD_UPLOAD_SCRIPT)
+
+DASHBOARD_PAGE_HTML = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>🤖 Generic Web Form Filling Agent</title>
+    <style>
+        body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 20px; background: #f8f9fa; }
+        .container { max-width: 1200px; margin: 0 auto; }
+        .header { background: linear-gradient(135deg, #007bff 0%, #28a745 100%); color: white; padding: 25px; border-radius: 12px; margin-bottom: 25px; box-shadow: 0 4px 15px rgba(0,0,0,0.1); }
+        .alert { background: #e8f4f8; border: 1px solid #bee5eb; padding: 15px; border-radius: 5px; margin-bottom: 20px; }
+        .stats { display: flex; gap: 15px; margin-bottom: 20px; }
+        .stat-card { background: white; padding: 15px; border-radius: 8px; flex: 1; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+        .stat-value { font-size: 24px; font-weight: bold; color: #3498db; }
+        .jobs-container { background: white; border-radius: 8px; padding: 20px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+        .job-item { border-bottom: 1px solid #eee; padding: 15px 0; display: flex; justify-content: space-between; align-items: center; }
+        #jobsList { max-height: 600px; overflow-y: auto; position: relative; }
+        #jobsWindow { position: absolute; top: 0; left: 0; right: 0; }
+        #jobsWindow .job-item { height: 120px; box-sizing: border-box; overflow: hidden; }
+        .approval-btn { padding: 8px 16px; border: none; border-radius: 4px; cursor: pointer; margin: 0 5px; }
+        .approve-btn { background: #27ae60; color: white; }
+        .reject-btn { background: #e74c3c; color: white; }
+        .submit-form { background: #f8f9fa; padding: 20px; border-radius: 8px; margin-bottom: 20px; border: 2px dashed #6c757d; }
+        .form-field { margin-bottom: 10px; }
+        .form-field input, .form-field textarea, .form-field select { width: 100%; padding: 8px; border: 1px solid #ddd; border-radius: 4px; }
+        .file-upload-area { border: 2px dashed #007bff; border-radius: 8px; padding: 20px; text-align: center; margin: 10px 0; background: #f8f9fa; transition: all 0.3s ease; }
+        .file-upload-area:hover { border-color: #28a745; background: #e8f5e9; }
+        .file-upload-area.dragover { border-color: #28a745; background: #e8f5e9; transform: scale(1.02); }
+        .uploaded-files { margin-top: 10px; }
+        .file-item { display: flex; align-items: center; justify-content: space-between; padding: 8px; margin: 4px 0; background: #e3f2fd; border-radius: 4px; border-left: 4px solid #2196f3; }
+        .file-item .file-info { display: flex; align-items: center; flex: 1; }
+        .file-item .file-icon { margin-right: 8px; font-size: 16px; }
+        .file-item .file-name { font-weight: 500; margin-right: 8px; }
+        .file-item .file-size { color: #666; font-size: 12px; }
+        .file-item .remove-file { background: #f44336; color: white; border: none; border-radius: 50%; width: 20px; height: 20px; cursor: pointer; font-size: 12px; }
+        .file-drop-text { color: #666; margin: 10px 0; }
+        .submit-btn { background: #667eea; color: white; padding: 12px 24px; border: none; border-radius: 4px; cursor: pointer; font-size: 16px; }
+        .live-indicator { display: inline-block; width: 10px; height: 10px; background: #27ae60; border-radius: 50%; margin-right: 5px; animation: pulse 1s infinite; }
+        @keyframes pulse { 0% { opacity: 1; } 50% { opacity: 0.5; } 100% { opacity: 1; } }
+        .browser-note { background: #fff3cd; border: 1px solid #ffeaa7; padding: 10px; border-radius: 4px; margin-bottom: 15px; }
+        #notifContainer { position: fixed; top: 20px; right: 20px; z-index: 1000; display: flex; flex-direction: column; gap: 10px; pointer-events: none; }
+        .notif { padding: 15px 20px; border-radius: 8px; color: white; font-weight: bold; box-shadow: 0 4px 8px rgba(0,0,0,0.3); animation: fadeOut 5s forwards; }
+        @keyframes fadeOut { 0%, 94% { opacity: 1; transform: none; } 100% { opacity: 0; transform: translateX(100%); } }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🤖 Generic Web Form Filling Agent</h1>
+            <p><span class="live-indicator"></span>AI-powered form filling for any website with intelligent field detection</p>
+        </div>
         
-        // Also refresh when window gains focus
-        window.addEventListener('focus', loadJobs);
-    </script>
+        <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 15px; margin-bottom: 20px;">
+            <div style="background: #e3f2fd; padding: 15px; border-radius: 8px; border: 1px solid #2196f3;">
+                <h4 style="margin: 0 0 10px 0; color: #1976d2;">🔍 CAPTCHA Solving</h4>
+                <ul style="margin: 0; padding-left: 20px; font-size: 0.9em;">
+                    <li>Automatic CAPTCHA detection</li>
+                    <li>Supports reCAPTCHA v2/v3</li>
+                    <li>hCaptcha support</li>
+                    <li>Image CAPTCHA solving</li>
+                </ul>
+            </div>
+            <div style="background: #e8f5e9; padding: 15px; border-radius: 8px; border: 1px solid #4caf50;">
+                <h4 style="margin: 0 0 10px 0; color: #2e7d32;">📎 File Upload Automation</h4>
+                <ul style="margin: 0; padding-left: 20px; font-size: 0.9em;">
+                    <li>Auto-detect file input fields</li>
+                    <li>Upload multiple files</li>
+                    <li>Smart field mapping</li>
+                    <li>Drag & drop support</li>
+                </ul>
+            </div>
+        </div>
+        
+        <div class="browser-note">
+            <strong>🎯 Smart Form Filling!</strong> Set headless=false to watch the AI agent automatically navigate to any website, detect form fields, and fill them with your custom data using intelligent field matching.
+        </div>
+        
+        <div class="alert">
+            <h4>🔴 Auto-Monitoring Settings</h4>
+            <label>
+                <input type="checkbox" id="autoMonitorEnabled"> 
+                <strong>Auto-open monitor windows for active/pending jobs</strong>
+            </label>
+            <p><small>When enabled, monitoring windows will automatically open for running and pending jobs. You can manually open monitors using the buttons below.</small></p>
+        </div>
+        
+        <div class="submit-form">
+            <h3>📝 Generic Form Filling Request</h3>
+            <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
+                <div>
+                    <h4>🎯 Target Form Information</h4>
+                    <div class="form-field">
+                        <label>Target Form URL:</label>
+                        <input type="text" id="targetUrl" placeholder="https://example.com/contact" value="https://httpbin.org/forms/post">
+                    </div>
+                    <div class="form-field">
+                        <label>Website/Platform Name:</label>
+                        <input type="text" id="platform" placeholder="Company Name, Website, etc." value="Example Website">
+                    </div>
+                    <div class="form-field">
+                        <label>Form Type/Purpose:</label>
+                        <select id="formType">
+                            <option value="contact">Contact Form</option>
+                            <option value="support">Support Request</option>
+                            <option value="inquiry">General Inquiry</option>
+                            <option value="feedback">Feedback/Review</option>
+                            <option value="application">Application Form</option>
+                            <option value="registration">Registration Form</option>
+                            <option value="complaint">Complaint Form</option>
+                            <option value="quote">Quote Request</option>
+                            <option value="other">Other</option>
+                        </select>
+                    </div>
+                    <div class="form-field">
+                        <label>Priority Level:</label>
+                        <select id="priority">
+                            <option value="normal">Normal</option>
+                            <option value="high">High</option>
+                            <option value="urgent">Urgent</option>
+                            <option value="low">Low</option>
+                        </select>
+                    </div>
+                </div>
+                <div>
+                    <h4>👤 Your Information</h4>
+                    <div class="form-field">
+                        <label>Full Name:</label>
+                        <input type="text" id="contactName" placeholder="John Doe" value="John Smith">
+                    </div>
+                    <div class="form-field">
+                        <label>Email Address:</label>
+                        <input type="email" id="contactEmail" placeholder="john@example.com" value="john@example.com">
+                    </div>
+                    <div class="form-field">
+                        <label>Phone Number:</label>
+                        <input type="tel" id="contactPhone" placeholder="+1-555-123-4567" value="">
+                    </div>
+                    <div class="form-field">
+                        <label>Company/Organization:</label>
+                        <input type="text" id="company" placeholder="Your Company Name" value="Example Corp">
+                    </div>
+                    <div class="form-field">
+                        <label>Your Role/Title:</label>
+                        <input type="text" id="jobTitle" placeholder="Manager, Developer, etc." value="">
+                    </div>
+                </div>
+            </div>
+            <div class="form-field">
+                <label>Subject/Title:</label>
+                <input type="text" id="subject" placeholder="Brief subject line for your message" value="General Inquiry">
+            </div>
+            <div class="form-field">
+                <label>Main Message:</label>
+                <textarea id="description" placeholder="Please provide your detailed message, inquiry, or request. This will be used to fill the main message/description field on the target form." rows="4">Hello, I am reaching out regarding your services. Could you please provide more information about your offerings? Thank you for your time.</textarea>
+            </div>
+            <div class="form-field">
+                <label>Reference URLs (comma-separated):</label>
+                <input type="text" id="referenceUrls" placeholder="https://reference1.com, https://reference2.com" value="">
+            </div>
+            <div class="form-field">
+                <label>Additional Notes:</label>
+                <textarea id="additionalComments" placeholder="Any additional information or special instructions for form filling" rows="2"></textarea>
+            </div>
+            <div class="form-field">
+                <label>📎 File Attachments (TXT, PDF, Images):</label>
+                <div style="margin-bottom: 10px; padding: 10px; background: #e8f5e9; border-radius: 8px; border: 1px solid #4caf50;">
+                    <strong style="color: #2e7d32;">🚀 Enhanced File Upload Features:</strong>
+                    <ul style="margin: 5px 0; padding-left: 20px; font-size: 0.9em; color: #2e7d32;">
+                        <li>✅ Direct file upload to our server</li>
+                        <li>✅ Automatic file upload to web forms via browser automation</li>
+                        <li>✅ Intelligent file input field detection</li>
+                        <li>✅ Multi-file upload support</li>
+                    </ul>
+                </div>
+                <div class="file-upload-area" id="fileUploadArea">
+                    <div class="file-drop-text">
+                        <strong>📁 Drop files here or click to upload</strong><br>
+                        <small>Supported: .txt, .pdf, .jpg, .png, .gif (Max 10MB each)</small><br>
+                        <small style="color: #4caf50;">Files will be automatically uploaded to form fields when detected</small>
+                    </div>
+                    <input type="file" id="fileInput" multiple accept=".txt,.pdf,.jpg,.jpeg,.png,.gif" style="display: none;">
+                    <button type="button" onclick="document.getElementById('fileInput').click()" style="margin-top: 10px; padding: 10px 20px; background: #007bff; color: white; border: none; border-radius: 4px; cursor: pointer;">
+                        📎 Choose Files
+                    </button>
+                </div>
+                <div class="uploaded-files" id="uploadedFiles"></div>
+            </div>
+            <div class="form-field">
+                <label>🚀 Browser Engine:</label>
+                <select id="browserEngine" style="width: 100%; padding: 12px; border: 1px solid #ddd; border-radius: 4px; font-size: 16px;" onchange="togglePuppeteerOptions()">
+                    <option value="browser-use" selected>Browser-Use (AI-Powered)</option>
+                    <option value="puppeteer">Puppeteer (CDP)</option>
+                </select>
+                <small style="color: #666; display: block; margin-top: 5px;">
+                    Browser-Use: AI-powered form filling with smart field detection<br>
+                    Puppeteer: Direct browser control via Chrome DevTools Protocol
+                </small>
+                
+                <div id="puppeteerOptions" style="display: none; margin-top: 10px; padding: 10px; background: #f0f0f0; border-radius: 4px;">
+                    <label style="display: flex; align-items: center;">
+                        <input type="checkbox" id="managePuppeteerServer" checked style="margin-right: 8px;">
+                        <span>🤖 Automatically manage Puppeteer server</span>
+                    </label>
+                    <small style="color: #666; display: block; margin-top: 5px; margin-left: 24px;">
+                        When checked, the Python agent will automatically start and stop the Node.js Puppeteer server
+                    </small>
+                </div>
+            </div>
+            <div class="form-field">
+                <label>
+                    <input type="checkbox" id="headless"> Run in headless mode (no visible browser)
+                </label>
+            </div>
+            <button class="submit-btn" onclick="submitFormFillingRequest()">🤖 Start Form Filling</button>
+        </div>
+        
+        <div class="stats">
+            <div class="stat-card">
+                <div class="stat-value" id="activeJobs">-</div>
+                <div>🔄 Active Jobs</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-value" id="pendingApprovals">-</div>
+                <div>⏳ Pending Approvals</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-value" id="completedJobs">-</div>
+                <div>✅ Completed</div>
+            </div>
+        </div>
+        
+        <div class="jobs-container">
+            <h3>🎬 Live Jobs</h3>
+            <div id="jobsList"><div id="jobsSpacer"></div><div id="jobsWindow"></div></div>
+            <p id="noJobs">Loading...</p>
+        </div>
+    </div>
+    <div id="notifContainer"></div>
+    
+    <script src="{dashboard_script}" defer></script>
+    <script src="{dashboard_upload_script}" defer></script>
 </body>
 </html>
-    """)
+    """.replace("{dashboard_script}", DASHBOARD_SCRIPT_PATH).replace("{dashboard_upload_script}", DASHBOARD_UPLOAD_SCRIPT_PATH)
+DASHBOARD_PAGE_BYTES = DASHBOARD_PAGE_HTML.encode()
+DASHBOARD_PAGE_COMPRESSED = precompress(DASHBOARD_PAGE_BYTES)
+DASHBOARD_PAGE_ETAG = f'"{hashlib.blake2b(DASHBOARD_PAGE_BYTES, digest_size=16).hexdigest()}"'
+
+@app.get("/dashboard", response_class=HTMLResponse) 
+async def dashboard(request: Request):
+    # The page revalidates (cheap 304) so a new script hash is picked up on the next load
+    return html_page_response(
+        DASHBOARD_PAGE_BYTES, request, DASHBOARD_PAGE_COMPRESSED,
+        etag=DASHBOARD_PAGE_ETAG, cache_control="no-cache"
+    )
+
+@app.get("/static/{filename}")
+async def static_script_file(filename: str, request: Request):
+    script = STATIC_SCRIPTS.get(f"/static/{filename}")
+    if script is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    body, precompressed = script
+    return html_page_response(
+        body, request, precompressed,
+        cache_control="public, max-age=31536000, immutable", media_type="text/javascript"
+    )
 
 if __name__ == "__main__":
+    # Same loop/parser selection as run.py
+    from src.utils.runtime import LOOP, HTTP
     uvicorn.run(
         "live_browser_server:app",
         host="127.0.0.1",
         port=8002,
         reload=False,
+        loop=LOOP,
+        http=HTTP,
+        ws="websockets",
+        ws_per_message_deflate=False,  # one encoded frame per broadcast, no per-client deflate
         log_level="info"
     )
\ No newline at end of file
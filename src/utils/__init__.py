@@ -2,6 +2,8 @@
 Utility modules for Live Browser Agent
 """
 
-from .puppeteer_server_manager import PuppeteerServerManager
+from .puppeteer_server_manager import PuppeteerServerManager, get_server_manager, stop_server_managers
+from .http_session import get_session, close_session
+from .timestamps import iso_now
 
-__all__ = ['PuppeteerServerManager']
\ No newline at end of file
+__all__ = ['PuppeteerServerManager', 'get_server_manager', 'stop_server_managers', 'get_session', 'close_session', 'iso_now']
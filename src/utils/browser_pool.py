@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Browser Pool - keeps pre-launched browser-use Browser instances ready for agents
+
+Every browser serves a single job: cookies, storage and logins of one job's site
+must never reach the next (possibly another user's) job, so a returned browser is
+closed and a fresh one launched in its place.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserPool:
+    """Pool of pre-initialized browsers shared by browser agents"""
+    
+    def __init__(self, browser_factory: Callable[[], Any], size: int = 2, headless: bool = False):
+        """
+        Initialize browser pool
+        
+        Args:
+            browser_factory: Callable returning a new (not yet started) Browser
+            size: Maximum number of browsers owned by the pool
+            headless: Headless mode of the pooled browsers
+        """
+        self.browser_factory = browser_factory
+        self.size = max(1, size)
+        self.headless = headless
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._created = 0
+        self._replacements: set = set()  # launches replacing returned browsers
+        self._closed = False
+    
+    async def _launch(self):
+        """Create a browser and make sure its process is up"""
+        browser = self.browser_factory()
+        self._created += 1
+        try:
+            await browser.navigate("about:blank")
+        except Exception:
+            self._created -= 1
+            try:
+                await browser.close()
+            except Exception:
+                pass
+            raise
+        return browser
+    
+    async def _replace(self):
+        """Launch a fresh idle browser in place of a returned one"""
+        if self._created >= self.size:
+            return  # an acquire already launched one in its place
+        try:
+            self._idle.put_nowait(await self._launch())
+        except Exception as e:
+            logger.warning("❌ Failed to replace pooled browser: %s", e)
+    
+    async def prewarm(self):
+        """Launch browsers until the pool is full"""
+        missing = self.size - self._created
+        if missing <= 0:
+            return
+        results = await asyncio.gather(
+            *(self._launch() for _ in range(missing)),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("❌ Failed to prewarm browser: %s", result)
+            else:
+                self._idle.put_nowait(result)
+        logger.info("🌐 Browser pool ready (%d/%d idle)", self._idle.qsize(), self.size)
+    
+    async def acquire(self):
+        """Get an idle browser, launching one if the pool is not full yet"""
+        if self._idle.empty() and self._created < self.size:
+            return await self._launch()
+        return await self._idle.get()
+    
+    @asynccontextmanager
+    async def browser(self):
+        """Borrow a browser for the duration of an ``async with`` block"""
+        browser = await self.acquire()
+        try:
+            yield browser
+        finally:
+            await self.release(browser)
+    
+    async def release(self, browser):
+        """Close a browser a job is done with and launch a fresh one in its place"""
+        self._created -= 1
+        try:
+            await browser.close()
+        except Exception as e:
+            logger.warning("Error closing pooled browser: %s", e)
+        if not self._closed:
+            task = asyncio.create_task(self._replace())
+            self._replacements.add(task)
+            task.add_done_callback(self._replacements.discard)
+    
+    async def close(self):
+        """Close all idle browsers (replacements still launching are awaited first)"""
+        self._closed = True
+        await asyncio.gather(*self._replacements, return_exceptions=True)
+        while not self._idle.empty():
+            browser = self._idle.get_nowait()
+            self._created -= 1
+            try:
+                await browser.close()
+            except Exception as e:
+                logger.warning("Error closing pooled browser: %s", e)
+
+
+_BROWSER_POOL: Optional[BrowserPool] = None
+
+
+def get_browser_pool() -> Optional[BrowserPool]:
+    """Get the process-wide browser pool (None if pooling is disabled)"""
+    return _BROWSER_POOL
+
+
+def set_browser_pool(pool: Optional[BrowserPool]):
+    """Install the process-wide browser pool"""
+    global _BROWSER_POOL
+    _BROWSER_POOL = pool
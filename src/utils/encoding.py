@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+Base64 for screenshot payloads - SIMD pybase64 where installed, the stdlib otherwise
+"""
+
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+# Screenshots at least this large are base64-encoded off the event loop
+OFFLOAD_ENCODE_BYTES = 256 * 1024
+
+b64decode = base64.b64decode
+
+
+def b64encode_ascii(data: bytes) -> str:
+    """Base64-encode bytes to an ASCII string (straight to str with pybase64)"""
+    if hasattr(base64, "b64encode_as_string"):
+        return base64.b64encode_as_string(data)
+    return base64.b64encode(data).decode('ascii')
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Shared aiohttp session - one pooled connector reused by all local HTTP probes
+"""
+
+from typing import Optional
+
+import aiohttp
+
+
+_HTTP_SESSION: Optional[aiohttp.ClientSession] = None
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """Get the shared HTTP session, creating it on first use"""
+    global _HTTP_SESSION
+    if _HTTP_SESSION is None or _HTTP_SESSION.closed:
+        _HTTP_SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=64,              # Total connections across all agents
+                limit_per_host=16,     # Keep one busy host from starving the rest
+                ttl_dns_cache=300,
+                keepalive_timeout=30
+            )
+        )
+    return _HTTP_SESSION
+
+
+async def close_session():
+    """Close the shared HTTP session (call on application shutdown)"""
+    global _HTTP_SESSION
+    if _HTTP_SESSION is not None and not _HTTP_SESSION.closed:
+        await _HTTP_SESSION.close()
+    _HTTP_SESSION = None
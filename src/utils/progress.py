@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Progress reporting shared by the browser agents - queued, in-order delivery to the callback
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict
+
+from .timestamps import iso_now
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressReporter:
+    """Mixin delivering send_progress updates to ``progress_callback`` from a background task
+    
+    send_progress never waits on the callback: updates go to a bounded queue that one
+    drain task delivers in order. With ``progress_throttle`` > 0, repeats of the
+    current percentage and step within that window are coalesced to the latest one;
+    an update that moves either always goes out, so no milestone is ever collapsed.
+    """
+    
+    __slots__ = (
+        "progress_callback", "progress_throttle", "_progress_percentage",
+        "_progress_queue", "_progress_drain",
+        "_pending_progress", "_progress_flusher",
+        "_last_progress_time", "_last_progress_percentage", "_last_progress_message",
+    )
+    
+    def _init_progress(self, throttle: float = 0.0):
+        """Set up progress state (call from the agent's __init__)"""
+        self.progress_callback = None
+        self.progress_throttle = throttle  # seconds between delivered (non-terminal) updates
+        self._progress_percentage = 0  # last reported percentage
+        self._progress_queue = asyncio.Queue(maxsize=256)
+        self._progress_drain = None
+        self._pending_progress = None  # latest throttled update
+        self._progress_flusher = None
+        self._last_progress_time = 0.0
+        self._last_progress_percentage = -1
+        self._last_progress_message = None
+    
+    def log_progress(self, message: str, percentage: int):
+        """Log a progress update locally (no callback involved)"""
+        logger.info("[%d%%] %s", percentage, message)
+    
+    async def send_progress(self, message: str, percentage: int):
+        """Send progress update (queued and delivered by a background task)"""
+        self._progress_percentage = percentage
+        
+        # Fast path: nothing to schedule, so the await completes without suspending
+        if self.progress_callback is None:
+            self.log_progress(message, percentage)
+            return
+        
+        update = {
+            "message": message,
+            "progress_percentage": percentage,
+            "timestamp": iso_now()
+        }
+        
+        # Coalesce repeats: an update showing the same percentage and step as the one
+        # just delivered only refreshes it, so keep just the latest of those
+        if (self.progress_throttle > 0
+                and percentage == self._last_progress_percentage
+                and message == self._last_progress_message
+                and time.monotonic() - self._last_progress_time < self.progress_throttle):
+            self._pending_progress = update
+            if self._progress_flusher is None or self._progress_flusher.done():
+                self._progress_flusher = asyncio.create_task(self._flush_pending_progress())
+            return
+        
+        self._pending_progress = None  # superseded by this update
+        self._enqueue_progress(update)
+    
+    def _enqueue_progress(self, update: Dict[str, Any]):
+        """Hand an update to the drain task"""
+        self._last_progress_time = time.monotonic()
+        self._last_progress_percentage = update["progress_percentage"]
+        self._last_progress_message = update["message"]
+        if self._progress_drain is None or self._progress_drain.done():
+            self._progress_drain = asyncio.create_task(self._drain_progress())
+        try:
+            self._progress_queue.put_nowait(update)
+        except asyncio.QueueFull:
+            pass  # Progress is informational - drop under backpressure
+    
+    async def _flush_pending_progress(self):
+        """Deliver the latest throttled update once the throttle window has passed"""
+        await asyncio.sleep(self.progress_throttle)
+        pending, self._pending_progress = self._pending_progress, None
+        if pending:
+            self._enqueue_progress(pending)
+    
+    async def _drain_progress(self):
+        """Deliver queued progress updates to the callback in order"""
+        while True:
+            update = await self._progress_queue.get()
+            try:
+                await self.progress_callback(update)
+            except Exception as e:
+                logger.warning("Progress callback error: %s", e)
+            finally:
+                self._progress_queue.task_done()
+    
+    async def flush_progress(self):
+        """Wait until all queued progress updates have been delivered"""
+        pending, self._pending_progress = self._pending_progress, None
+        if pending:
+            self._enqueue_progress(pending)
+        if self._progress_drain and not self._progress_drain.done():
+            await self._progress_queue.join()
+    
+    async def _stop_progress_drain(self):
+        """Flush pending progress updates and stop the drain task"""
+        await self.flush_progress()
+        if self._progress_flusher:
+            self._progress_flusher.cancel()
+            self._progress_flusher = None
+        if self._progress_drain:
+            self._progress_drain.cancel()
+            try:
+                await self._progress_drain
+            except asyncio.CancelledError:
+                pass
+            self._progress_drain = None
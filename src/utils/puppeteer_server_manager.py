@@ -4,18 +4,31 @@ Puppeteer Server Manager - Manages Node.js Puppeteer server lifecycle from Pytho
 """
 
 import asyncio
-import subprocess
 import os
+import shutil
+import signal
 import time
+import uuid
 import aiohttp
 import json
+from collections import deque
 from typing import Optional, Dict, Any
 from pathlib import Path
 
+from .http_session import get_session
+
+
+# Line server.js logs once app.listen() is up
+READY_MARKER = "Puppeteer server running on port"
+STARTUP_TIMEOUT = 15.0  # seconds
+READY_FALLBACK_DELAY = 1.0  # seconds before probing without the ready line
+
 
 class PuppeteerServerManager:
     """Manages Puppeteer Node.js server lifecycle"""
     
+    _node_path: Optional[str] = None  # resolved once found, shared by all managers
+    
     def __init__(self, 
                  server_path: str = None,
                  server_port: int = 3000,
@@ -37,68 +50,171 @@ class PuppeteerServerManager:
         self.server_port = server_port
         self.cdp_port = cdp_port
         self.auto_install = auto_install
-        self.process: Optional[subprocess.Popen] = None
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self._output_tasks = []
+        self._reaper: Optional[asyncio.Task] = None  # notices the server exiting on its own
+        # Recent server output per stream, for error reports
+        self._stdout_tail = deque(maxlen=500)
+        self._stderr_tail = deque(maxlen=500)
+        self._probe_lock = asyncio.Lock()  # one /status probe at a time
+        self._status_cache: Optional[tuple] = None  # (monotonic time, running) of the last probe
+        self.status_cache_ttl = 0.1  # seconds a probe result is reused by overlapping checks
+        self._status_details: Optional[tuple] = None  # (monotonic time, /status response)
+        self.status_details_ttl = 1.0  # seconds a /status response is reused
+        self._start_lock = asyncio.Lock()  # concurrent starts share one server process
+        self._leases: set = set()  # ids of the jobs currently using the server
+        self._dependencies_ready = False  # npm install known to be current
+        self._dir_cache: Optional[tuple] = None  # (monotonic time, names in server_path)
+        self.dir_cache_ttl = 5.0  # seconds a server_path listing is reused
+        self._cdp_ws: Optional[str] = None  # browser WebSocket endpoint, once Chrome is up
         self.server_url = f"http://localhost:{server_port}"
         self.cdp_url = f"http://localhost:{cdp_port}"
         
-    async def is_server_running(self) -> bool:
-        """Check if Puppeteer server is running"""
+    async def is_server_running(self, max_age: Optional[float] = None) -> bool:
+        """Check if Puppeteer server is running
+        
+        Probes are single-flight: concurrent callers wait for the one in progress and
+        reuse its result if it is newer than max_age (default status_cache_ttl)
+        seconds. max_age=0 always probes afresh.
+        """
+        if max_age is None:
+            max_age = self.status_cache_ttl
+        async with self._probe_lock:
+            if self._status_cache is not None and time.monotonic() - self._status_cache[0] < max_age:
+                return self._status_cache[1]
+            running = await self._probe_status()
+            self._status_cache = (time.monotonic(), running)
+            return running
+    
+    async def _probe_status(self) -> bool:
+        """Probe whether the server accepts connections on its port"""
+        # Server is running if it accepts, regardless of browser status - a bare
+        # TCP connect skips building and parsing an HTTP request for loopback
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.server_url}/status", timeout=aiohttp.ClientTimeout(total=2)) as resp:
-                    if resp.status == 200:
-                        status = await resp.json()
-                        # Server is running if it responds, regardless of browser status
-                        return True
-        except Exception as e:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection("127.0.0.1", self.server_port),
+                timeout=0.5
+            )
+        except Exception:
             # Server is not reachable
             return False
-        return False
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception:
+            pass
+        return True
     
-    async def get_server_status(self) -> Dict[str, Any]:
-        """Get detailed server status"""
+    async def get_server_status(self, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """Get detailed server status
+        
+        A successful response is reused for max_age (default status_details_ttl)
+        seconds - it only changes when the browser starts or stops, which drops it.
+        """
+        if max_age is None:
+            max_age = self.status_details_ttl
+        if self._status_details is not None and time.monotonic() - self._status_details[0] < max_age:
+            return self._status_details[1]
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.server_url}/status") as resp:
-                    if resp.status == 200:
-                        return await resp.json()
+            session = await get_session()
+            async with session.get(f"{self.server_url}/status") as resp:
+                if resp.status == 200:
+                    status = await resp.json()
+                    self._status_details = (time.monotonic(), status)
+                    return status
         except Exception as e:
             return {"status": "error", "error": str(e)}
         return {"status": "not_running"}
     
+    def _list_server_dir(self) -> set:
+        """Names in server_path, from one scandir reused for ``dir_cache_ttl`` seconds"""
+        now = time.monotonic()
+        if self._dir_cache is not None and now - self._dir_cache[0] < self.dir_cache_ttl:
+            return self._dir_cache[1]
+        try:
+            with os.scandir(self.server_path) as entries:
+                names = {entry.name for entry in entries}
+        except (FileNotFoundError, NotADirectoryError):
+            names = set()
+        self._dir_cache = (now, names)
+        return names
+    
     async def ensure_dependencies(self) -> bool:
-        """Ensure npm dependencies are installed"""
+        """Ensure npm dependencies are installed (and not older than package.json)"""
+        if self._dependencies_ready:
+            return True
         package_json = os.path.join(self.server_path, "package.json")
+        package_lock = os.path.join(self.server_path, "package-lock.json")
         node_modules = os.path.join(self.server_path, "node_modules")
+        names = self._list_server_dir()
         
-        if not os.path.exists(package_json):
+        if "package.json" not in names:
             print(f"❌ No package.json found at {self.server_path}")
             return False
+        package_mtime = os.stat(package_json).st_mtime
+        has_lockfile = "package-lock.json" in names
+        if has_lockfile:
+            package_mtime = max(package_mtime, os.stat(package_lock).st_mtime)
         
-        if not os.path.exists(node_modules) and self.auto_install:
-            print("📦 Installing npm dependencies...")
+        # npm writes node_modules/.package-lock.json on every install - newer than
+        # package.json (and the lockfile) means the installed tree is current
+        try:
+            if "node_modules" in names and \
+                    os.stat(os.path.join(node_modules, ".package-lock.json")).st_mtime >= package_mtime:
+                self._dependencies_ready = True
+                return True
+        except FileNotFoundError:
+            pass
+        
+        if self.auto_install:
+            # A committed lockfile gets the faster, reproducible npm ci
+            command = "ci" if has_lockfile else "install"
+            print(f"📦 Installing npm dependencies (npm {command})...")
             try:
-                result = subprocess.run(
-                    ["npm", "install"],
+                # Async so a cold install doesn't freeze the event loop
+                proc = await asyncio.create_subprocess_exec(
+                    "npm", command,
                     cwd=self.server_path,
-                    capture_output=True,
-                    text=True
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
                 )
-                if result.returncode == 0:
+                _, stderr = await proc.communicate()
+                self._dir_cache = None  # the install may have created node_modules
+                if proc.returncode == 0:
                     print("✅ Dependencies installed successfully")
+                    self._dependencies_ready = True
                     return True
                 else:
-                    print(f"❌ Failed to install dependencies: {result.stderr}")
+                    print(f"❌ Failed to install dependencies: {stderr.decode(errors='replace')}")
                     return False
             except Exception as e:
                 print(f"❌ Error installing dependencies: {e}")
                 return False
         
-        return os.path.exists(node_modules)
+        return "node_modules" in names
     
-    async def start_server(self, headless: bool = False) -> Dict[str, Any]:
-        """Start the Puppeteer server"""
+    async def acquire(self, headless: bool = False) -> Dict[str, Any]:
+        """Lease the server (and its browser) for a job, starting it if it is not up
         
+        The server keeps running between jobs - release() gives the lease back and only
+        stop_server() (at shutdown) makes Chrome exit. The start result gets a "lease" id.
+        """
+        result = await self.start_server(headless)
+        if result['success']:
+            result['lease'] = uuid.uuid4().hex
+            self._leases.add(result['lease'])
+        return result
+    
+    def release(self, lease: str):
+        """Give back a lease from acquire() - the server stays up for the next job"""
+        self._leases.discard(lease)
+    
+    async def start_server(self, headless: bool = False) -> Dict[str, Any]:
+        """Start the Puppeteer server (a no-op returning its details if it is up)"""
+        async with self._start_lock:
+            return await self._start_server(headless)
+    
+    async def _start_server(self, headless: bool) -> Dict[str, Any]:
         # Check if already running
         if await self.is_server_running():
             status = await self.get_server_status()
@@ -130,10 +246,18 @@ class PuppeteerServerManager:
             
             # Use basic server.js for now
             server_file = "server.js"
+            if server_file not in self._list_server_dir():
+                return {
+                    "success": False,
+                    "message": f"{server_file} not found",
+                    "error": f"No {server_file} in {self.server_path}"
+                }
             
             # Check if node is available
-            node_check = subprocess.run(["which", "node"], capture_output=True, text=True)
-            if node_check.returncode != 0:
+            if PuppeteerServerManager._node_path is None:
+                PuppeteerServerManager._node_path = shutil.which("node")
+            node_path = PuppeteerServerManager._node_path
+            if not node_path:
                 return {
                     "success": False,
                     "message": "Node.js not found",
@@ -143,65 +267,102 @@ class PuppeteerServerManager:
             print(f"📁 Server path: {self.server_path}")
             print(f"📄 Server file: {server_file}")
             
-            self.process = subprocess.Popen(
-                ["node", server_file],
-                cwd=self.server_path,
+            # Own session (and process group), so stop_server can signal node together
+            # with the Chrome it launched; close_fds=False skips the fd sweep (our fds
+            # are non-inheritable by default)
+            self.process = await asyncio.create_subprocess_exec(
+                node_path, os.path.join(self.server_path, server_file),
                 env=env,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                close_fds=False,
+                start_new_session=True
             )
             
             print(f"🔄 Started process with PID: {self.process.pid}")
             
-            # Wait for server to start
-            max_retries = 30
-            for i in range(max_retries):
-                await asyncio.sleep(0.5)
-                
-                # Check if process is still running
-                if self.process.poll() is not None:
-                    stdout, stderr = self.process.communicate()
-                    print(f"❌ Process died early")
-                    print(f"STDOUT: {stdout}")
-                    print(f"STDERR: {stderr}")
-                    return {
-                        "success": False,
-                        "message": "Server process died",
-                        "error": stderr or stdout
-                    }
-                
-                if await self.is_server_running():
-                    print(f"✅ Puppeteer server started successfully")
-                    
-                    # Get server status
-                    status = await self.get_server_status()
+            # Wake on the ready line or the process exiting (asyncio's child watcher
+            # reports that at once), and probe the moment the line is in. Before it,
+            # probes are only a slow fallback in case it never shows up. The readers
+            # also keep the pipes drained afterwards
+            ready = asyncio.Event()
+            self._stdout_tail.clear()
+            self._stderr_tail.clear()
+            self._output_tasks = [
+                asyncio.create_task(self._read_output(self.process.stdout, self._stdout_tail, ready)),
+                asyncio.create_task(self._read_output(self.process.stderr, self._stderr_tail))
+            ]
+            ready_wait = asyncio.create_task(ready.wait())
+            exited = asyncio.create_task(self.process.wait())
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + STARTUP_TIMEOUT
+            delay = READY_FALLBACK_DELAY
+            banner_seen = False
+            try:
+                while loop.time() < deadline:
+                    waiting = {exited} if ready.is_set() else {exited, ready_wait}
+                    await asyncio.wait(
+                        waiting,
+                        timeout=min(delay, deadline - loop.time()),
+                        return_when=asyncio.FIRST_COMPLETED
+                    )
+                    if ready.is_set() and not banner_seen:
+                        banner_seen = True
+                        delay = 0.05  # listening - retry a failed probe quickly
+                    else:
+                        delay = min(delay * 2, 1.0 if banner_seen else 2 * READY_FALLBACK_DELAY)
                     
-                    # Ensure browser is started
-                    if status.get('status') != 'running':
-                        print(f"🌐 Starting browser...")
-                        browser_started = await self._start_browser()
-                        if browser_started:
-                            # Get updated status
-                            status = await self.get_server_status()
+                    # Check if process is still running
+                    if exited.done():
+                        # Take the output read so far (the readers end at EOF -
+                        # nothing blocks on it)
+                        await asyncio.wait(self._output_tasks, timeout=1)
+                        stdout = "\n".join(self._stdout_tail)
+                        stderr = "\n".join(self._stderr_tail)
+                        print(f"❌ Process died early")
+                        print(f"STDOUT: {stdout}")
+                        print(f"STDERR: {stderr}")
+                        await self._discard_process()
+                        return {
+                            "success": False,
+                            "message": "Server process died",
+                            "error": stderr or stdout
+                        }
                     
-                    return {
-                        "success": True,
-                        "message": "Server started successfully",
-                        "cdp_url": self.cdp_url,
-                        "ws_endpoint": status.get('wsEndpoint'),
-                        "pid": self.process.pid
-                    }
-                
-                # Check if process failed
-                if self.process.poll() is not None:
-                    stdout, stderr = self.process.communicate()
-                    return {
-                        "success": False,
-                        "message": "Server process failed to start",
-                        "error": stderr or stdout
-                    }
+                    # Once the ready line is in, a cached miss from before it is stale
+                    if await self.is_server_running(max_age=0 if ready.is_set() else None):
+                        print(f"✅ Puppeteer server started successfully")
+                        
+                        # Get server status
+                        status = await self.get_server_status()
+                        
+                        # server.js launches the browser itself right after it starts
+                        # listening - wait for Chrome's CDP endpoint before asking for
+                        # another one, so the two launches never race
+                        if status.get('status') != 'running' and await self._wait_cdp():
+                            status = await self.get_server_status(max_age=0)
+                        
+                        # Ensure browser is started
+                        if status.get('status') != 'running':
+                            print(f"🌐 Starting browser...")
+                            browser_started = await self._start_browser()
+                            if browser_started:
+                                # Get updated status
+                                status = await self.get_server_status()
+                        
+                        self._reaper = asyncio.create_task(self._reap(self.process))
+                        return {
+                            "success": True,
+                            "message": "Server started successfully",
+                            "cdp_url": self.cdp_url,
+                            "ws_endpoint": status.get('wsEndpoint') or self._cdp_ws,
+                            "pid": self.process.pid
+                        }
+            finally:
+                ready_wait.cancel()
+                exited.cancel()
             
+            await self._discard_process()
             return {
                 "success": False,
                 "message": "Server failed to start within timeout",
@@ -215,40 +376,115 @@ class PuppeteerServerManager:
                 "error": str(e)
             }
     
+    async def _read_output(self, stream: asyncio.StreamReader, sink: deque,
+                           ready: Optional[asyncio.Event] = None):
+        """Read server output into ``sink`` until EOF, setting ``ready`` once the ready line appears"""
+        async for line in stream:
+            text = line.decode(errors="replace").rstrip()
+            sink.append(text)
+            if ready is not None and READY_MARKER in text:
+                ready.set()
+    
+    async def _discard_process(self):
+        """Kill a server that failed to start and drop its output readers"""
+        self._signal_server(signal.SIGKILL if hasattr(signal, "SIGKILL") else signal.SIGTERM)
+        await self.process.wait()
+        for task in self._output_tasks:
+            task.cancel()
+        await asyncio.gather(*self._output_tasks, return_exceptions=True)
+        self._output_tasks = []
+        self.process = None
+    
+    async def _reap(self, process: asyncio.subprocess.Process):
+        """Clean up after a server that exits without stop_server being called
+        
+        asyncio's child watcher already reaps the process and completes wait(), so no
+        signal handler or timed wait is needed here.
+        """
+        await process.wait()
+        if self.process is not process:
+            return
+        print(f"⚠️ Puppeteer server exited unexpectedly (code {process.returncode})")
+        self._output_tasks = []  # they end by themselves at EOF
+        self._status_cache = None
+        self._status_details = None
+        self._cdp_ws = None
+        self._reaper = None
+        self.process = None
+    
+    async def _wait_cdp(self, timeout: float = 5.0) -> bool:
+        """Wait for Chrome's CDP endpoint, which answers /json/version as soon as it is bound
+        
+        Remembers its webSocketDebuggerUrl so callers get the endpoint without another
+        discovery round-trip.
+        """
+        session = await get_session()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        delay = 0.05
+        while True:
+            try:
+                async with session.get(f"{self.cdp_url}/json/version",
+                                       timeout=aiohttp.ClientTimeout(total=1)) as resp:
+                    if resp.status == 200:
+                        self._cdp_ws = (await resp.json()).get('webSocketDebuggerUrl')
+                        return True
+            except Exception:
+                pass  # not bound yet
+            if loop.time() + delay > deadline:
+                return False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.5)
+    
     async def _start_browser(self) -> bool:
         """Start browser via Puppeteer server API"""
+        self._status_details = None
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(f"{self.server_url}/browser/start") as resp:
-                    if resp.status == 200:
-                        result = await resp.json()
-                        print(f"🌐 Browser started: {result.get('message')}")
-                        return True
+            session = await get_session()
+            async with session.post(f"{self.server_url}/browser/start") as resp:
+                if resp.status == 200:
+                    result = await resp.json()
+                    print(f"🌐 Browser started: {result.get('message')}")
+                    return True
         except Exception as e:
             print(f"❌ Failed to start browser: {e}")
         return False
     
     async def stop_server(self) -> Dict[str, Any]:
         """Stop the Puppeteer server"""
+        if self._leases:
+            print(f"⚠️ Stopping Puppeteer server with {len(self._leases)} lease(s) still held")
+            self._leases.clear()
         
         # First try graceful shutdown via API
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(f"{self.server_url}/browser/stop") as resp:
-                    if resp.status == 200:
-                        print("🛑 Browser stopped via API")
+            session = await get_session()
+            async with session.post(f"{self.server_url}/browser/stop") as resp:
+                if resp.status == 200:
+                    print("🛑 Browser stopped via API")
         except:
             pass
         
+        self._status_cache = None
+        self._status_details = None
+        self._cdp_ws = None
+        
         # Stop the process
+        if self._reaper:
+            self._reaper.cancel()  # this exit is expected
+            self._reaper = None
         if self.process:
             try:
-                self.process.terminate()
-                try:
-                    self.process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
-                    self.process.kill()
-                    self.process.wait()
+                if self.process.returncode is None:
+                    self._signal_server(signal.SIGTERM)
+                    try:
+                        await asyncio.wait_for(self.process.wait(), timeout=5)
+                    except asyncio.TimeoutError:
+                        # Stuck - kill the group while its pid is still ours
+                        self._signal_server(signal.SIGKILL if hasattr(signal, "SIGKILL") else signal.SIGTERM)
+                await self.process.wait()
+                await asyncio.gather(*self._output_tasks, return_exceptions=True)
+                self._output_tasks = []
                 
                 print("✅ Puppeteer server stopped")
                 self.process = None
@@ -282,40 +518,71 @@ class PuppeteerServerManager:
         # Start again
         return await self.start_server(headless)
     
-    def __del__(self):
-        """Cleanup on deletion"""
-        if self.process:
-            try:
-                self.process.terminate()
-                self.process.wait(timeout=2)
-            except:
-                try:
-                    self.process.kill()
-                except:
-                    pass
+    def _signal_server(self, sig: int):
+        """Signal the server's whole process group (just the process where there are none)
+        
+        Does nothing once the process has been reaped - its pid (and so the group id)
+        may already belong to someone else.
+        """
+        if self.process is None or self.process.returncode is not None:
+            return
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(self.process.pid, sig)
+            else:
+                self.process.send_signal(sig)
+        except ProcessLookupError:
+            pass  # already gone
+    
+    async def __aenter__(self):
+        """Start the server for an ``async with`` block, stopping it again on exit"""
+        result = await self.start_server()
+        if not result['success']:
+            raise RuntimeError(f"{result['message']}: {result.get('error')}")
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop_server()
+
+
+# One manager per server port, shared by every agent that uses that server
+_SERVER_MANAGERS: Dict[int, PuppeteerServerManager] = {}
+
+
+def get_server_manager(server_path: str = None, server_port: int = 3000,
+                       cdp_port: int = 9222) -> PuppeteerServerManager:
+    """Get the process-wide manager of the server on ``server_port``, creating it on first use"""
+    manager = _SERVER_MANAGERS.get(server_port)
+    if manager is None:
+        manager = PuppeteerServerManager(server_path=server_path, server_port=server_port, cdp_port=cdp_port)
+        _SERVER_MANAGERS[server_port] = manager
+    return manager
+
+
+async def stop_server_managers():
+    """Stop every shared server (call on application shutdown)"""
+    for manager in list(_SERVER_MANAGERS.values()):
+        await manager.stop_server()
+    _SERVER_MANAGERS.clear()
 
 
 # Example usage
 async def test_manager():
     """Test the Puppeteer server manager"""
-    manager = PuppeteerServerManager()
-    
-    # Start server
-    result = await manager.start_server(headless=False)
-    print(f"Start result: {result}")
-    
-    if result['success']:
+    # Started on entry, stopped on exit
+    async with PuppeteerServerManager() as manager:
         # Check status
         status = await manager.get_server_status()
         print(f"Server status: {status}")
         
         # Wait a bit
         await asyncio.sleep(5)
-        
-        # Stop server
-        stop_result = await manager.stop_server()
-        print(f"Stop result: {stop_result}")
 
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass  # e.g. Windows - stay on the default loop
     asyncio.run(test_manager())
\ No newline at end of file
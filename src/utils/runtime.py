@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""
+Event loop and HTTP parser for uvicorn - uvloop + httptools (uvicorn[standard]) where
+available, stdlib asyncio + h11 otherwise (e.g. uvloop on Windows)
+"""
+
+try:
+    import uvloop  # noqa: F401
+    LOOP = "uvloop"
+except ImportError:
+    LOOP = "asyncio"
+
+try:
+    import httptools  # noqa: F401
+    HTTP = "httptools"
+except ImportError:
+    HTTP = "h11"
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+ISO timestamps for progress, screenshot and broadcast payloads
+"""
+
+import time
+from datetime import datetime
+
+
+# Second-resolution local ISO prefix shared by timestamps within the same second
+_LAST_SECOND = [0, ""]
+
+
+def iso_now() -> str:
+    """datetime.now().isoformat(), formatting the datetime only once per second"""
+    now = time.time()
+    second = int(now)
+    if second != _LAST_SECOND[0]:
+        _LAST_SECOND[0] = second
+        _LAST_SECOND[1] = datetime.fromtimestamp(second).isoformat()
+    return f"{_LAST_SECOND[1]}.{int((now - second) * 1_000_000):06d}"
@@ -5,39 +5,47 @@ The Python agent automatically starts and stops the Node.js Puppeteer server
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
-import time
 import asyncio
-import websockets
+import aiohttp
 
-async def monitor_job(job_id):
-    """Monitor job progress via WebSocket"""
+# One pooled session for the synchronous external-server test
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+async def monitor_job(session, job_id):
+    """Monitor job progress via WebSocket until the job completes or fails"""
     uri = f"ws://localhost:8002/ws/job/{job_id}"
     
     print(f"📡 Connecting to WebSocket for job {job_id}")
     
     try:
-        async with websockets.connect(uri) as websocket:
-            while True:
+        async with session.ws_connect(uri) as websocket:
+            async for message in websocket:
+                if message.type == aiohttp.WSMsgType.BINARY:
+                    continue  # screenshot image following its update
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    print("WebSocket connection closed")
+                    break
                 try:
-                    message = await websocket.recv()
-                    data = json.loads(message)
-                    print(f"[{data.get('type')}] {data.get('message')}")
+                    data = json.loads(message.data)
+                    print(f"[{data.get('update_type', data.get('type'))}] {data.get('message')}")
                     
-                    if data.get('type') == 'status_change' and data.get('data', {}).get('status') in ['completed', 'failed']:
+                    if data.get('update_type') in ['completion', 'error']:
                         break
-                        
-                except websockets.exceptions.ConnectionClosed:
-                    print("WebSocket connection closed")
-                    break
                 except Exception as e:
                     print(f"Error: {e}")
                     break
     except Exception as e:
         print(f"Failed to connect to WebSocket: {e}")
 
-def test_managed_puppeteer():
-    """Test form submission with managed Puppeteer server"""
+async def main():
+    """Test form submission with managed Puppeteer server
+    
+    Submit, monitor and final status share one event loop and one aiohttp session, so
+    the status is fetched the moment the socket reports the job finished.
+    """
     
     # API endpoint
     url = "http://localhost:8002/api/v1/form/submit"
@@ -76,11 +84,14 @@ def test_managed_puppeteer():
     print(f"Server Management: Automatic")
     
     try:
-        # Submit the form
-        response = requests.post(url, json=data)
-        
-        if response.status_code == 200:
-            result = response.json()
+        async with aiohttp.ClientSession() as session:
+            # Submit the form
+            async with session.post(url, json=data) as response:
+                if response.status != 200:
+                    print(f"❌ Error: {response.status}")
+                    print(await response.text())
+                    return
+                result = await response.json()
             job_id = result.get('job_id')
             print(f"\n✅ Job created successfully!")
             print(f"Job ID: {job_id}")
@@ -88,28 +99,25 @@ def test_managed_puppeteer():
             
             # Monitor the job
             print("\n📊 Monitoring job progress...")
-            asyncio.run(monitor_job(job_id))
+            await monitor_job(session, job_id)
             
             # Get final job status
-            time.sleep(2)
-            status_response = requests.get(f"http://localhost:8002/api/v1/jobs/{job_id}")
-            if status_response.status_code == 200:
-                final_status = status_response.json()
-                print(f"\n📋 Final Job Status:")
-                print(f"Status: {final_status.get('status')}")
-                print(f"Progress: {final_status.get('progress_percentage')}%")
-                
-                if final_status.get('result'):
-                    print(f"\n🎉 Result:")
-                    result_data = final_status.get('result')
-                    if isinstance(result_data, dict):
-                        print(json.dumps(result_data, indent=2))
-                    else:
-                        print(result_data)
-                    
-        else:
-            print(f"❌ Error: {response.status_code}")
-            print(response.text)
+            async with session.get(f"http://localhost:8002/api/v1/jobs/{job_id}") as status_response:
+                if status_response.status != 200:
+                    return
+                final_status = await status_response.json()
+            
+            print(f"\n📋 Final Job Status:")
+            print(f"Status: {final_status.get('status')}")
+            print(f"Progress: {final_status.get('progress_percentage')}%")
+            
+            if final_status.get('result'):
+                print(f"\n🎉 Result:")
+                result_data = final_status.get('result')
+                if isinstance(result_data, dict):
+                    print(json.dumps(result_data, indent=2))
+                else:
+                    print(result_data)
             
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -144,7 +152,7 @@ def test_external_puppeteer():
     }
     
     try:
-        response = requests.post(url, json=data)
+        response = _session.post(url, json=data)
         if response.status_code == 200:
             result = response.json()
             print(f"✅ Job created: {result.get('job_id')}")
@@ -165,7 +173,7 @@ if __name__ == "__main__":
     print("\n")
     
     # Test managed server
-    test_managed_puppeteer()
+    asyncio.run(main())
     
     # Optionally test external server
     # test_external_puppeteer()
\ No newline at end of file
@@ -4,11 +4,16 @@ Test script to submit a form using the Puppeteer browser engine via API
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
 import asyncio
 import websockets
 
+# One pooled session, so submit and status calls reuse a keep-alive connection
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
 async def monitor_job(job_id):
     """Monitor job progress via WebSocket"""
     uri = f"ws://localhost:8002/ws/job/{job_id}"
@@ -67,7 +72,7 @@ def test_puppeteer_form_submission():
     
     try:
         # Submit the form
-        response = requests.post(url, json=data)
+        response = _session.post(url, json=data)
         
         if response.status_code == 200:
             result = response.json()
@@ -82,7 +87,7 @@ def test_puppeteer_form_submission():
             
             # Get final job status
             time.sleep(2)
-            status_response = requests.get(f"http://localhost:8002/api/v1/jobs/{job_id}")
+            status_response = _session.get(f"http://localhost:8002/api/v1/jobs/{job_id}")
             if status_response.status_code == 200:
                 final_status = status_response.json()
                 print(f"\n📋 Final Job Status:")
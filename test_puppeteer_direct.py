@@ -6,8 +6,13 @@ Test Puppeteer server directly to see console output
 import subprocess
 import time
 import requests
+from requests.adapters import HTTPAdapter
 import os
 
+# One pooled session, so submit and status calls reuse a keep-alive connection
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
 def test_server_direct():
     """Test server with direct subprocess to see output"""
     print("🧪 Testing Puppeteer Server Directly")
@@ -43,7 +48,7 @@ def test_server_direct():
             
             # Check status
             try:
-                response = requests.get("http://localhost:3000/status")
+                response = _session.get("http://localhost:3000/status")
                 print(f"\n📊 Server status: {response.json()}")
             except Exception as e:
                 print(f"❌ Error checking status: {e}")
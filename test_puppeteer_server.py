@@ -23,30 +23,30 @@ async def test_server():
     print(f"   Server URL: {manager.server_url}")
     print(f"   CDP URL: {manager.cdp_url}")
     
-    # Check if server path exists
-    if not os.path.exists(manager.server_path):
+    # List the server directory once and check everything against that
+    try:
+        with os.scandir(manager.server_path) as entries:
+            names = {entry.name for entry in entries}
+    except FileNotFoundError:
         print(f"❌ Server path does not exist: {manager.server_path}")
         return
     
     # Check if package.json exists
-    package_json = os.path.join(manager.server_path, "package.json")
-    if not os.path.exists(package_json):
-        print(f"❌ package.json not found at: {package_json}")
+    if "package.json" not in names:
+        print(f"❌ package.json not found at: {os.path.join(manager.server_path, 'package.json')}")
         return
     else:
         print(f"✅ Found package.json")
     
     # Check if node_modules exists
-    node_modules = os.path.join(manager.server_path, "node_modules")
-    if not os.path.exists(node_modules):
+    if "node_modules" not in names:
         print(f"⚠️  node_modules not found, will need to install dependencies")
     else:
         print(f"✅ Found node_modules")
     
     # Check if server.js exists
-    server_js = os.path.join(manager.server_path, "server.js")
-    if not os.path.exists(server_js):
-        print(f"❌ server.js not found at: {server_js}")
+    if "server.js" not in names:
+        print(f"❌ server.js not found at: {os.path.join(manager.server_path, 'server.js')}")
         return
     else:
         print(f"✅ Found server.js")
@@ -61,30 +61,23 @@ async def test_server():
         return
     
     print(f"\n3. Starting Puppeteer server...")
-    result = await manager.start_server(headless=False)
-    
-    print(f"\n4. Start result:")
-    print(f"   Success: {result['success']}")
-    print(f"   Message: {result.get('message', 'N/A')}")
-    if result.get('error'):
-        print(f"   Error: {result['error']}")
-    if result.get('cdp_url'):
-        print(f"   CDP URL: {result['cdp_url']}")
-    if result.get('ws_endpoint'):
-        print(f"   WebSocket: {result['ws_endpoint']}")
-    
-    if result['success']:
-        print(f"\n5. Checking server status...")
-        status = await manager.get_server_status()
-        print(f"   Status: {status}")
-        
-        print(f"\n6. Waiting 5 seconds...")
-        await asyncio.sleep(5)
-        
-        print(f"\n7. Stopping server...")
-        stop_result = await manager.stop_server()
-        print(f"   Stop result: {stop_result}")
-
+    try:
+        # Started on entry, stopped when the block exits
+        async with manager:
+            print(f"\n4. Checking server status...")
+            status = await manager.get_server_status()
+            print(f"   Status: {status}")
+            if status.get('wsEndpoint'):
+                print(f"   WebSocket: {status['wsEndpoint']}")
+            
+            print(f"\n5. Waiting 5 seconds...")
+            await asyncio.sleep(5)
+            
+            print(f"\n6. Stopping server...")
+    except RuntimeError as e:
+        print(f"❌ Start failed: {e}")
+        return
+    print(f"   Server stopped")
 
 if __name__ == "__main__":
     asyncio.run(test_server())
\ No newline at end of file
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for BrowserPool checkout, replacement and launch-failure cleanup
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("aiohttp")  # src.utils imports the Puppeteer server manager
+
+from src.utils.browser_pool import BrowserPool
+
+
+class FakeBrowser:
+    """Stands in for a browser-use Browser"""
+    
+    def __init__(self, fail_navigate: bool = False):
+        self.fail_navigate = fail_navigate
+        self.closed = False
+    
+    async def navigate(self, url):
+        if self.fail_navigate:
+            raise RuntimeError("launch failed")
+    
+    async def close(self):
+        self.closed = True
+
+
+def test_released_browser_is_closed_and_replaced():
+    """A browser serves one job - the next checkout gets a fresh one"""
+    async def run():
+        launched = []
+        pool = BrowserPool(lambda: launched.append(FakeBrowser()) or launched[-1], size=1)
+        await pool.prewarm()
+        first = await pool.acquire()
+        await pool.release(first)
+        second = await pool.acquire()
+        assert first.closed
+        assert second is not first
+        assert len(launched) == 2
+        await pool.release(second)
+        await pool.close()
+        assert all(browser.closed for browser in launched)
+    asyncio.run(run())
+
+
+def test_failed_launch_closes_browser():
+    """A browser whose warm-up fails is closed, not leaked"""
+    async def run():
+        launched = []
+        pool = BrowserPool(lambda: launched.append(FakeBrowser(fail_navigate=True)) or launched[-1], size=1)
+        with pytest.raises(RuntimeError):
+            await pool.acquire()
+        assert launched[0].closed
+        assert pool._created == 0
+    asyncio.run(run())
+
+
+def test_pool_never_exceeds_size():
+    """A replacement is skipped when an acquire already refilled the pool"""
+    async def run():
+        launched = []
+        pool = BrowserPool(lambda: launched.append(FakeBrowser()) or launched[-1], size=1)
+        browser = await pool.acquire()
+        await pool.release(browser)
+        await pool.acquire()  # launches before the replacement task runs
+        await pool.close()
+        assert len(launched) == 2
+        assert pool._idle.empty()
+    asyncio.run(run())
+
+
+def test_scoped_checkout_returns_browser():
+    """pool.browser() hands the browser back when the block exits, even on error"""
+    async def run():
+        launched = []
+        pool = BrowserPool(lambda: launched.append(FakeBrowser()) or launched[-1], size=1)
+        with pytest.raises(ValueError):
+            async with pool.browser() as browser:
+                raise ValueError("job failed")
+        assert browser.closed
+        await pool.close()
+        assert pool._created == 0
+    asyncio.run(run())
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the live browser server's pure-logic pieces (no browser, no sockets)
+"""
+
+import asyncio
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+for module_name in ("fastapi", "PIL", "aiofiles", "browser_use", "dotenv"):
+    pytest.importorskip(module_name)
+
+from fastapi import HTTPException
+
+from src.server import live_browser_server as server
+
+
+class FakeUpload:
+    """Stands in for a Starlette UploadFile"""
+    
+    def __init__(self, filename: str, content: bytes, content_type: str = "text/plain",
+                 fail_after: int = None):
+        self.filename = filename
+        self.content_type = content_type
+        self._stream = io.BytesIO(content)
+        self._fail_after = fail_after  # raise once this many bytes were read (client gone)
+    
+    async def read(self, size: int = -1) -> bytes:
+        if self._fail_after is not None and self._stream.tell() >= self._fail_after:
+            raise ConnectionResetError("client disconnected")
+        return self._stream.read(size)
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "UPLOAD_DIR", tmp_path)
+    monkeypatch.setattr(server, "UPLOAD_CHUNK_BYTES", 4)
+    server.upload_info_cache.clear()
+    return tmp_path
+
+
+def test_upload_over_limit_is_rejected(upload_dir, monkeypatch):
+    """Streaming stops at the size limit and leaves nothing on disk"""
+    monkeypatch.setattr(server, "MAX_UPLOAD_BYTES", 8)
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(server.store_upload(FakeUpload("big.txt", b"x" * 20)))
+    assert excinfo.value.status_code == 400
+    assert list(upload_dir.iterdir()) == []
+
+
+def test_interrupted_upload_leaves_no_part_file(upload_dir):
+    """A client that disconnects mid-stream leaves no .part file behind"""
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(server.store_upload(FakeUpload("cut.txt", b"y" * 20, fail_after=8)))
+    assert excinfo.value.status_code == 500
+    assert list(upload_dir.iterdir()) == []
+
+
+def test_identical_uploads_share_one_file(upload_dir):
+    """Uploads are content-addressed - the same bytes are stored once"""
+    first = asyncio.run(server.store_upload(FakeUpload("a.txt", b"same content")))
+    second = asyncio.run(server.store_upload(FakeUpload("b.txt", b"same content")))
+    assert first["filename"] == second["filename"]
+    assert first["file_id"] != second["file_id"]
+    assert second["text_content"] == "same content"
+    assert [path.name for path in upload_dir.iterdir()] == [first["filename"]]
+
+
+def test_event_stream_registers_only_while_streaming():
+    """A stream that never starts never subscribes; a closed one unsubscribes"""
+    async def run():
+        manager = server.ConnectionManager()
+        stream = server.event_stream(manager.open_global_stream, manager.disconnect_global)
+        assert not manager.global_connections
+        await stream.aclose()  # client gone before the first chunk
+        assert not manager.global_connections
+        
+        stream = server.event_stream(manager.open_global_stream, manager.disconnect_global)
+        assert (await anext(stream)).startswith(b"retry:")
+        assert len(manager.global_connections) == 1
+        await stream.aclose()
+        assert not manager.global_connections
+    asyncio.run(run())
+
+
+def test_job_stream_of_unknown_job_is_404():
+    """Only existing jobs have an event stream"""
+    from fastapi.testclient import TestClient
+    
+    response = TestClient(server.app).get("/sse/job/no-such-job")
+    assert response.status_code == 404
+    assert "no-such-job" not in server.manager.job_connections
+
+
+def test_outbox_keeps_only_latest_screenshot():
+    """A pending screenshot is replaced in place; other frames keep their order"""
+    async def run():
+        outbox = server.Outbox(maxsize=10)
+        outbox.put("a")
+        outbox.put("shot-1", latest=True)
+        outbox.put("b")
+        outbox.put("shot-2", latest=True)
+        assert [await outbox.get() for _ in range(3)] == ["a", "shot-2", "b"]
+        outbox.put("shot-3", latest=True)  # the slot was consumed, so this queues anew
+        assert await outbox.get() == "shot-3"
+    asyncio.run(run())
+
+
+def test_full_outbox_drops_oldest_frame():
+    """When full, the oldest frame goes - including a pending screenshot slot"""
+    async def run():
+        outbox = server.Outbox(maxsize=2)
+        outbox.put("shot-1", latest=True)
+        outbox.put("a")
+        outbox.put("b")  # evicts the screenshot slot
+        outbox.put("shot-2", latest=True)  # evicts "a", queues a fresh slot
+        assert [await outbox.get() for _ in range(2)] == ["b", "shot-2"]
+    asyncio.run(run())
+
+
+def make_request(**overrides) -> "server.FormFillingRequest":
+    fields = {"target_url": "https://example.com", "platform": "test", "description": "d"}
+    fields.update(overrides)
+    return server.FormFillingRequest(**fields)
+
+
+def test_status_counts_follow_transitions_and_eviction(monkeypatch):
+    """status_counts track every transition, and evicted jobs leave them"""
+    monkeypatch.setattr(server, "MAX_FINISHED_JOBS", 2)
+    
+    async def run():
+        jobs = server.LiveJobManager()
+        job_ids = [jobs.create_job(make_request()) for _ in range(3)]
+        assert jobs.status_counts[server.JobStatus.QUEUED.value] == 3
+        
+        for job_id in job_ids:
+            jobs._apply_delta(jobs.jobs[job_id], status=server.JobStatus.RUNNING)
+        assert jobs.status_counts[server.JobStatus.QUEUED.value] == 0
+        assert jobs.status_counts[server.JobStatus.RUNNING.value] == 3
+        
+        for job_id in job_ids:
+            jobs._apply_delta(jobs.jobs[job_id], status=server.JobStatus.COMPLETED)
+            jobs._finish_job(job_id)
+        assert list(jobs.jobs) == job_ids[1:]
+        assert job_ids[0] not in jobs.job_versions
+        assert jobs.status_counts[server.JobStatus.COMPLETED.value] == 2
+        assert jobs.status_counts[server.JobStatus.RUNNING.value] == 0
+    asyncio.run(run())
+
+
+def test_job_status_revalidates_with_etag():
+    """An unchanged job answers If-None-Match with 304; a changed one with a new body"""
+    from fastapi.testclient import TestClient
+    
+    client = TestClient(server.app)
+    job_id = server.job_manager.create_job(make_request())
+    try:
+        url = f"/api/v1/jobs/{job_id}"
+        first = client.get(url)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        
+        cached = client.get(url, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        
+        server.job_manager._apply_delta(server.job_manager.jobs[job_id], progress=50)
+        changed = client.get(url, headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+        assert changed.json()["progress_percentage"] == 50
+    finally:
+        job = server.job_manager.jobs.pop(job_id)
+        server.job_manager.status_counts[job["status"]] -= 1
+        server.job_manager.job_versions.pop(job_id, None)
+        server.job_manager._job_bodies.pop(job_id, None)
+
+
+def test_pending_approvals_revalidate_with_etag(monkeypatch):
+    """The pending list is a 304 until pending_version moves"""
+    from fastapi.testclient import TestClient
+    
+    client = TestClient(server.app)
+    monkeypatch.setattr(server.job_manager, "pending_version", 0)
+    first = client.get("/api/v1/approval/pending")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert client.get("/api/v1/approval/pending", headers={"If-None-Match": etag}).status_code == 304
+    
+    server.job_manager.pending_version += 1
+    changed = client.get("/api/v1/approval/pending", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
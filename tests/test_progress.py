@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared ProgressReporter mixin
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.progress import ProgressReporter
+
+
+class Reporter(ProgressReporter):
+    def __init__(self, throttle: float = 0.0):
+        self._init_progress(throttle)
+        self.delivered = []
+        self.progress_callback = self._record
+    
+    async def _record(self, update):
+        self.delivered.append((update["progress_percentage"], update["message"]))
+
+
+def test_updates_are_delivered_in_order():
+    """Without a throttle every update reaches the callback, in order"""
+    async def run():
+        reporter = Reporter()
+        for step in range(5):
+            await reporter.send_progress(f"step {step}", 50)
+        await reporter._stop_progress_drain()
+        return reporter.delivered
+    assert asyncio.run(run()) == [(50, f"step {step}") for step in range(5)]
+
+
+def test_stop_flushes_pending_update():
+    """A throttled update still pending at shutdown is delivered, not lost"""
+    async def run():
+        reporter = Reporter(throttle=10)
+        await reporter.send_progress("first", 20)
+        await reporter.send_progress("first", 20)  # a repeat - held back
+        await reporter._stop_progress_drain()
+        return reporter.delivered
+    assert asyncio.run(run()) == [(20, "first"), (20, "first")]
+
+
+def test_terminal_updates_bypass_throttle():
+    """0% and 100% updates go out immediately"""
+    async def run():
+        reporter = Reporter(throttle=10)
+        await reporter.send_progress("working", 40)
+        await reporter.send_progress("done", 100)
+        await reporter.flush_progress()
+        delivered = list(reporter.delivered)
+        await reporter._stop_progress_drain()
+        return delivered
+    assert asyncio.run(run()) == [(40, "working"), (100, "done")]
+
+
+def test_throttle_keeps_every_milestone():
+    """Back-to-back steps that move the percentage or label are all delivered, in order"""
+    milestones = [(80, "Form filling completed"), (90, "Form ready for human approval"),
+                  (85, "Started continuous monitoring for approval period")]
+    
+    async def run():
+        reporter = Reporter(throttle=10)
+        for percentage, message in milestones:
+            await reporter.send_progress(message, percentage)
+        await reporter._stop_progress_drain()
+        return reporter.delivered
+    assert asyncio.run(run()) == milestones
+
+
+def test_throttle_coalesces_repeats():
+    """Repeats of the current percentage and step collapse to the latest one"""
+    async def run():
+        reporter = Reporter(throttle=10)
+        for _ in range(5):
+            await reporter.send_progress("Waiting for approval", 85)
+        await reporter._stop_progress_drain()
+        return reporter.delivered
+    assert asyncio.run(run()) == [(85, "Waiting for approval")] * 2
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Construction tests for PuppeteerBrowserAgent (catches __slots__ drifting from __init__)
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("browser_use")
+
+from src.agents.puppeteer_browser_agent import PuppeteerBrowserAgent
+
+
+def test_construct_unmanaged():
+    """An agent without a managed server can be constructed"""
+    agent = PuppeteerBrowserAgent(manage_server=False)
+    assert agent.server_manager is None
+    assert agent.last_screenshot is None
+
+
+def test_construct_managed():
+    """An agent with a managed server shares the process-wide server manager"""
+    pytest.importorskip("aiohttp")
+    agent = PuppeteerBrowserAgent()
+    other = PuppeteerBrowserAgent()
+    assert agent.server_manager is other.server_manager
+
+
+class FakeCDPSession:
+    """Records CDP calls and answers them like a page scrolled to (0, 900)"""
+    
+    def __init__(self):
+        self.calls = []
+    
+    async def send(self, method, params=None):
+        self.calls.append((method, params))
+        if method == "Page.getLayoutMetrics":
+            return {"cssVisualViewport": {"pageX": 0, "pageY": 900, "clientWidth": 1280, "clientHeight": 720}}
+        if method == "Page.captureScreenshot":
+            return {"data": "AAAA"}
+        return {}
+
+
+def test_viewport_clip_follows_scroll():
+    """The clip covers what is visible, not the top of the document"""
+    from src.agents.puppeteer_browser_agent import viewport_clip
+    
+    metrics = {"cssVisualViewport": {"pageX": 10, "pageY": 900, "clientWidth": 1280, "clientHeight": 720}}
+    assert viewport_clip(metrics, 0.5) == {"x": 10, "y": 900, "width": 1280, "height": 720, "scale": 0.5}
+
+
+def test_capture_viewport_after_scroll():
+    """A capture of a scrolled page clips at the current scroll offset"""
+    import asyncio
+    
+    agent = PuppeteerBrowserAgent(manage_server=False)
+    session = FakeCDPSession()
+    page = object()
+    agent._cdp_session = session
+    agent._cdp_page = page
+    
+    assert asyncio.run(agent._capture_viewport(page)) == b"\x00\x00\x00"
+    method, params = session.calls[-1]
+    assert method == "Page.captureScreenshot"
+    assert params["clip"]["y"] == 900
+    assert params["clip"]["scale"] == agent.monitor_scale
+
+
+def test_agent_step_wakes_monitoring():
+    """Each agent step marks the page as changed so the monitor captures it"""
+    import asyncio
+    
+    agent = PuppeteerBrowserAgent(manage_server=False)
+    assert not agent._page_changed.is_set()
+    asyncio.run(agent._on_agent_step(None, None, 1))
+    assert agent._page_changed.is_set()
+
+
+def test_stop_monitoring_propagates_caller_cancellation():
+    """Cancelling the job that stops monitoring is not swallowed"""
+    import asyncio
+    
+    async def run():
+        agent = PuppeteerBrowserAgent(manage_server=False)
+        agent.monitoring_task = asyncio.create_task(asyncio.sleep(3600))
+        await agent.stop_continuous_monitoring()  # the loop's own cancellation is fine
+        assert agent.monitoring_task is None
+        
+        async def slow_to_stop():
+            try:
+                await asyncio.sleep(3600)
+            finally:
+                await asyncio.sleep(0.5)  # a loop that takes a while to clean up
+        
+        agent.monitoring_task = asyncio.create_task(slow_to_stop())
+        await asyncio.sleep(0)
+        stopper = asyncio.create_task(agent.stop_continuous_monitoring())
+        await asyncio.sleep(0.05)  # stopper is now waiting on the loop
+        stopper.cancel()
+        try:
+            await stopper
+        except asyncio.CancelledError:
+            return True
+        return False
+    
+    assert asyncio.run(run())
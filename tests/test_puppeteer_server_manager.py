@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Unit tests for PuppeteerServerManager's lease and reap bookkeeping (no Node.js needed)
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("aiohttp")
+
+from src.utils.puppeteer_server_manager import PuppeteerServerManager
+
+
+class FakeProcess:
+    """Stands in for an asyncio subprocess that exits when told to"""
+    
+    def __init__(self):
+        self.returncode = None
+        self._exited = asyncio.Event()
+    
+    def exit(self, code: int):
+        self.returncode = code
+        self._exited.set()
+    
+    async def wait(self) -> int:
+        await self._exited.wait()
+        return self.returncode
+
+
+def make_manager(monkeypatch, success: bool = True) -> PuppeteerServerManager:
+    manager = PuppeteerServerManager(server_path="/nonexistent", auto_install=False)
+    
+    async def start_server(headless: bool = False):
+        return {"success": success, "cdp_url": manager.cdp_url}
+    monkeypatch.setattr(manager, "start_server", start_server)
+    return manager
+
+
+def test_leases_are_unique_and_released(monkeypatch):
+    """Each acquire gets its own lease; release gives back only that one"""
+    async def run():
+        manager = make_manager(monkeypatch)
+        first = await manager.acquire()
+        second = await manager.acquire()
+        assert first["lease"] != second["lease"]
+        assert manager._leases == {first["lease"], second["lease"]}
+        
+        manager.release(first["lease"])
+        manager.release(first["lease"])  # releasing twice is harmless
+        assert manager._leases == {second["lease"]}
+    asyncio.run(run())
+
+
+def test_failed_start_grants_no_lease(monkeypatch):
+    async def run():
+        manager = make_manager(monkeypatch, success=False)
+        result = await manager.acquire()
+        assert "lease" not in result
+        assert not manager._leases
+    asyncio.run(run())
+
+
+def test_reap_clears_state_of_exited_server():
+    """A server that dies on its own leaves no stale process, caches or endpoint"""
+    async def run():
+        manager = PuppeteerServerManager(server_path="/nonexistent", auto_install=False)
+        process = FakeProcess()
+        manager.process = process
+        manager._status_cache = (0.0, True)
+        manager._cdp_ws = "ws://localhost:9222/devtools/browser/x"
+        manager._reaper = asyncio.create_task(manager._reap(process))
+        
+        process.exit(1)
+        await manager._reaper
+        assert manager.process is None
+        assert manager._reaper is None
+        assert manager._status_cache is None
+        assert manager._cdp_ws is None
+    asyncio.run(run())
+
+
+def test_reap_ignores_replaced_process():
+    """The reaper of an old process leaves its successor alone"""
+    async def run():
+        manager = PuppeteerServerManager(server_path="/nonexistent", auto_install=False)
+        old, new = FakeProcess(), FakeProcess()
+        manager.process = new
+        manager._cdp_ws = "ws://localhost:9222/devtools/browser/new"
+        reaper = asyncio.create_task(manager._reap(old))
+        
+        old.exit(0)
+        await reaper
+        assert manager.process is new
+        assert manager._cdp_ws is not None
+    asyncio.run(run())
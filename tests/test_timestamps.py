@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared ISO timestamp helper
+"""
+
+import os
+import sys
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.timestamps import iso_now
+
+
+def test_iso_now_matches_datetime_format():
+    """Same shape as datetime.now().isoformat(), and close to it"""
+    stamp = iso_now()
+    parsed = datetime.fromisoformat(stamp)
+    assert len(stamp.rsplit(".", 1)[1]) == 6
+    assert abs((datetime.now() - parsed).total_seconds()) < 1
+
+
+def test_iso_now_advances():
+    """Timestamps within the same second still differ (microseconds are live)"""
+    assert iso_now() <= iso_now()